@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Benchmark: appending a mostly duplicate file, plain insert vs incremental import
+
+Loads a table, then appends a file in which most rows are already in the
+table: once as a plain append and once through
+DatabaseManager.incremental_insert, which skips rows whose hash exists.
+
+Usage:
+    python benchmarks/bench_incremental.py [--rows 500000] [--cols 30] [--new 0.05]
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pandas as pd  # noqa: E402
+
+from benchmarks.bench_insert import make_frame  # noqa: E402
+from core.db_manager import DatabaseManager  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--cols", type=int, default=30)
+    parser.add_argument("--new", type=float, default=0.05)
+    args = parser.parse_args()
+
+    new_rows = int(args.rows * args.new)
+    print(f"Building {args.rows:,} x {args.cols} DataFrame ({new_rows:,} new rows)...")
+    everything = make_frame(args.rows + new_rows, args.cols)
+    loaded = everything.iloc[:args.rows]
+    upload = everything.iloc[new_rows:]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "incremental.db"
+        db_path.touch()
+        db = DatabaseManager(db_path)
+
+        db.dataframe_to_table(loaded, "plain", if_exists="replace")
+        start = time.perf_counter()
+        db.dataframe_to_table(upload, "plain", if_exists="append")
+        append_time = time.perf_counter() - start
+        print(f"     plain append: {append_time:7.2f} s  ({len(upload):,} rows written)")
+
+        db.incremental_insert(loaded, "hashed")
+        start = time.perf_counter()
+        counts = db.incremental_insert(upload, "hashed")
+        incremental_time = time.perf_counter() - start
+        print(f"incremental import: {incremental_time:7.2f} s  {counts}")
+        print(f"           speedup: {append_time / incremental_time:.2f}x")
+
+        # make_frame draws from small value pools, so a few "new" rows can
+        # coincide with loaded ones; every distinct new row must be inserted
+        assert counts["inserted"] + counts["skipped"] == len(upload)
+        assert db.get_row_count("hashed") == len(pd.concat([loaded, upload]).drop_duplicates())
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark: bulk insert throughput, DataFrame.to_sql vs DatabaseManager
+
+Builds a mixed-type DataFrame and loads it into a fresh SQLite file twice:
+once with the previous approach (to_sql per 5000-row slice) and once with
+DatabaseManager.dataframe_to_table (prepared INSERT + executemany in one
+transaction). Reports rows/sec for each.
+
+Usage:
+    python benchmarks/bench_insert.py [--rows 1000000] [--cols 30]
+"""
+import argparse
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from core.db_manager import DatabaseManager  # noqa: E402
+
+
+def make_frame(rows: int, cols: int) -> pd.DataFrame:
+    """Mixed int/float/text/date/category columns"""
+    rng = np.random.default_rng(0)
+    data = {}
+    for c in range(cols):
+        kind = c % 5
+        if kind == 0:
+            data[f"int_{c}"] = rng.integers(0, 1_000_000, rows, dtype=np.int32)
+        elif kind == 1:
+            values = rng.random(rows) * 1000
+            values[rng.random(rows) < 0.05] = np.nan
+            data[f"float_{c}"] = values
+        elif kind == 2:
+            data[f"text_{c}"] = pd.Series(rng.integers(0, 50_000, rows)).map("emp-{:06d}".format)
+        elif kind == 3:
+            data[f"date_{c}"] = pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 365, rows), unit="D")
+        else:
+            data[f"dept_{c}"] = pd.Categorical(rng.choice(["HR", "IT", "Sales", "Ops"], rows))
+    return pd.DataFrame(data)
+
+
+def legacy_insert(db_path: Path, df: pd.DataFrame, chunk_size: int = 5000):
+    """The previous dataframe_to_table body: to_sql per slice"""
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode = DELETE")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA cache_size = -64000")
+    for i in range(0, len(df), chunk_size):
+        df.iloc[i:i + chunk_size].to_sql("bench", conn, if_exists="replace" if i == 0 else "append", index=False)
+    conn.commit()
+    conn.close()
+
+
+def fast_insert(db_path: Path, df: pd.DataFrame):
+    db = DatabaseManager(db_path)
+    db.dataframe_to_table(df, "bench", if_exists="replace")
+    db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--cols", type=int, default=30)
+    args = parser.parse_args()
+
+    print(f"Building {args.rows:,} x {args.cols} DataFrame...")
+    df = make_frame(args.rows, args.cols)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {}
+        for label, insert in (("to_sql", legacy_insert), ("executemany", fast_insert)):
+            db_path = Path(tmp) / f"{label}.db"
+            db_path.touch()
+            start = time.perf_counter()
+            insert(db_path, df)
+            elapsed = time.perf_counter() - start
+            results[label] = elapsed
+            print(f"{label:>12}: {elapsed:7.2f} s  {args.rows / elapsed:12,.0f} rows/sec")
+
+            with sqlite3.connect(db_path) as conn:
+                assert conn.execute("SELECT COUNT(*) FROM bench").fetchone()[0] == args.rows
+
+        print(f"     speedup: {results['to_sql'] / results['executemany']:.2f}x")
+
+        tables = []
+        for label in results:
+            with sqlite3.connect(Path(tmp) / f"{label}.db") as conn:
+                tables.append(conn.execute("SELECT * FROM bench ORDER BY rowid").fetchall())
+        assert tables[0] == tables[1]
+        print("Tables identical: yes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark: refreshing changed rows, full reload vs keyed merge
+
+Loads a table, then applies a new version of the same data in which a
+small fraction of rows changed: once as a full replace (the previous
+workflow) and once through DatabaseManager.merge_dataframe. Also checks
+the merge's inserted/updated/unchanged counts.
+
+Usage:
+    python benchmarks/bench_merge.py [--rows 2000000] [--cols 10] [--change 0.01]
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from core.db_manager import DatabaseManager  # noqa: E402
+
+
+def make_frame(rows: int, cols: int) -> pd.DataFrame:
+    """Integer key plus mixed value columns"""
+    rng = np.random.default_rng(0)
+    data = {"emp_id": np.arange(rows, dtype=np.int64)}
+    for c in range(cols - 1):
+        kind = c % 3
+        if kind == 0:
+            data[f"int_{c}"] = rng.integers(0, 1_000_000, rows)
+        elif kind == 1:
+            data[f"float_{c}"] = rng.random(rows) * 1000
+        else:
+            data[f"text_{c}"] = pd.Series(rng.integers(0, 50_000, rows)).map("emp-{:06d}".format)
+    return pd.DataFrame(data)
+
+
+def change_rows(df: pd.DataFrame, fraction: float):
+    """Copy with a random fraction of rows modified in one column, plus those rows' positions"""
+    rng = np.random.default_rng(1)
+    changed = df.copy()
+    rows = np.sort(rng.choice(len(df), int(len(df) * fraction), replace=False))
+    column = changed.columns[1]
+    changed.loc[rows, column] = changed.loc[rows, column] + 1
+    return changed, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--cols", type=int, default=10)
+    parser.add_argument("--change", type=float, default=0.01)
+    args = parser.parse_args()
+
+    print(f"Building {args.rows:,} x {args.cols} DataFrame ({args.change:.0%} changed)...")
+    original = make_frame(args.rows, args.cols)
+    updated, changed_rows = change_rows(original, args.change)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "merge.db"
+        db_path.touch()
+        db = DatabaseManager(db_path)
+
+        # A reload has to rebuild the key index to end in the same state
+        db.dataframe_to_table(original, "bench", if_exists="replace")
+        start = time.perf_counter()
+        db.dataframe_to_table(updated, "bench", if_exists="replace")
+        db.ensure_unique_key("bench", ["emp_id"])
+        reload_time = time.perf_counter() - start
+        print(f"       full reload: {reload_time:7.2f} s")
+
+        db.dataframe_to_table(original, "bench", if_exists="replace")
+        db.ensure_unique_key("bench", ["emp_id"])
+        start = time.perf_counter()
+        counts = db.merge_dataframe(updated, "bench", ["emp_id"])
+        merge_time = time.perf_counter() - start
+        print(f"  merge (all rows): {merge_time:7.2f} s  {counts}")
+
+        expected_updates = len(changed_rows)
+        assert counts == {
+            "inserted": 0,
+            "updated": expected_updates,
+            "unchanged": args.rows - expected_updates,
+        }
+
+        # A delta export: only the changed rows are sent
+        db.dataframe_to_table(original, "bench", if_exists="replace")
+        db.ensure_unique_key("bench", ["emp_id"])
+        start = time.perf_counter()
+        counts = db.merge_dataframe(updated.iloc[changed_rows], "bench", ["emp_id"])
+        delta_time = time.perf_counter() - start
+        print(f"merge (delta only): {delta_time:7.2f} s  {counts}")
+        assert counts == {"inserted": 0, "updated": expected_updates, "unchanged": 0}
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark: sheet parsing throughput, openpyxl engine vs streaming XML engine
+
+Generates a workbook with mixed column types, parses it with both
+ExcelLoader engines and reports rows/sec. Also checks that both engines
+return identical DataFrames.
+
+Usage:
+    python benchmarks/bench_xlsx_engine.py [--rows 200000] [--cols 12]
+"""
+import argparse
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pandas as pd  # noqa: E402
+
+from core.excel_loader import _parse_sheet  # noqa: E402
+
+
+def make_workbook(path: Path, rows: int, cols: int):
+    """Write a test workbook with int, float, text, date and boolean columns"""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("data")
+    kinds = ["int", "float", "text", "date", "bool", "dept"]
+    sheet.append([f"{kinds[i % len(kinds)]}_{i}" for i in range(cols)])
+
+    base = datetime(2024, 1, 1)
+    depts = ["HR", "IT", "Sales", "Ops", "Finance"]
+    for r in range(rows):
+        row = []
+        for c in range(cols):
+            kind = kinds[c % len(kinds)]
+            if kind == "int":
+                row.append(r * 7 + c)
+            elif kind == "float":
+                row.append(r * 0.25 + c)
+            elif kind == "text":
+                row.append(f"name-{r % 5000}-{c}")
+            elif kind == "date":
+                row.append(base + timedelta(days=r % 365))
+            elif kind == "bool":
+                row.append(r % 3 == 0)
+            else:
+                row.append(depts[r % len(depts)])
+        sheet.append(row)
+    workbook.save(path)
+
+
+def time_engine(path: Path, engine: str, repeat: int):
+    """Best-of-N wall time for a full sheet parse"""
+    best = None
+    df = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        df = _parse_sheet(path, "data", optimize=False, engine=engine)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, df
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--cols", type=int, default=12)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.xlsx"
+        print(f"Generating {args.rows:,} x {args.cols} workbook...")
+        make_workbook(path, args.rows, args.cols)
+        print(f"File size: {path.stat().st_size / (1024 * 1024):.1f} MB")
+
+        results = {}
+        frames = {}
+        for engine in ("openpyxl", "sax"):
+            elapsed, frames[engine] = time_engine(path, engine, args.repeat)
+            results[engine] = elapsed
+            print(f"{engine:>9}: {elapsed:7.2f} s  {args.rows / elapsed:12,.0f} rows/sec")
+
+        print(f"  speedup: {results['openpyxl'] / results['sax']:.2f}x")
+
+        pd.testing.assert_frame_equal(frames["openpyxl"], frames["sax"])
+        print("DataFrames identical: yes")
+
+
+if __name__ == "__main__":
+    main()
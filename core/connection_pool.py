@@ -0,0 +1,367 @@
+"""
+Per-database SQLite connection pools
+Reuses reader connections and a single writer connection across UI actions
+instead of opening a new handle for every query
+"""
+import atexit
+import sqlite3
+import threading
+import logging
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# PRAGMAs applied once when a connection is opened
+CONNECTION_PRAGMAS = {
+    "synchronous": "NORMAL",
+    "cache_size": "-64000",
+}
+
+# Journal mode used when WAL is not enabled
+DEFAULT_JOURNAL_MODE = "DELETE"
+
+# Seconds a connection waits on a lock before raising "database is locked"
+BUSY_TIMEOUT = 5.0
+
+# Idle reader connections kept open per database
+DEFAULT_MAX_IDLE_READERS = 4
+
+# WAL file size that triggers a checkpoint after a load
+DEFAULT_CHECKPOINT_THRESHOLD_MB = 64
+
+# Versions after the app's own bookkeeping writes remembered by versions()
+MAX_BOOKKEEPING_WRITES = 32
+
+
+class ConnectionPool:
+    """
+    Reader connections plus one shared writer connection for a database file
+
+    In WAL mode readers never block on (or block) the writer, so the UI can
+    keep browsing while an upload is running; each reader transaction sees
+    the last committed snapshot. WAL is opt-in: wal=None keeps whatever
+    journal mode the file already uses (WAL persists in the file).
+    """
+
+    def __init__(
+        self,
+        db_path: Union[str, Path],
+        max_idle_readers: int = DEFAULT_MAX_IDLE_READERS,
+        wal: Optional[bool] = None,
+        checkpoint_threshold_mb: float = DEFAULT_CHECKPOINT_THRESHOLD_MB
+    ):
+        self.db_path = Path(db_path)
+        self.max_idle_readers = max_idle_readers
+        self.wal = wal
+        self.checkpoint_threshold_mb = checkpoint_threshold_mb
+        self._lock = threading.Lock()
+        self._idle_readers = []
+        self._busy_readers = 0
+        self._writer = None
+        self._watcher = None
+        self._watcher_lock = threading.Lock()
+        self._bookkeeping = OrderedDict()
+        self._closed = False
+        self.counters = {"opens": 0, "reuses": 0, "closes": 0}
+
+    def _open(self, readonly: bool) -> sqlite3.Connection:
+        """Open and configure a new connection"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=BUSY_TIMEOUT)
+        for name, value in CONNECTION_PRAGMAS.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        if readonly:
+            conn.execute("PRAGMA query_only = ON")
+        else:
+            # journal_mode is a database-level setting owned by the writer
+            self._apply_journal_mode(conn)
+        self.counters["opens"] += 1
+        logger.debug(f"Opened {'reader' if readonly else 'writer'} connection to {self.db_path.name}")
+        return conn
+
+    def _close(self, conn: sqlite3.Connection):
+        conn.close()
+        self.counters["closes"] += 1
+
+    def _apply_journal_mode(self, conn: sqlite3.Connection) -> str:
+        """Switch the database to WAL or the default journal mode per self.wal"""
+        current = conn.execute("PRAGMA journal_mode").fetchone()[0].lower()
+        if self.wal is None:
+            self.wal = current == "wal"
+        wanted = "wal" if self.wal else DEFAULT_JOURNAL_MODE.lower()
+        if current != wanted:
+            current = conn.execute(f"PRAGMA journal_mode = {wanted}").fetchone()[0].lower()
+            logger.info(f"{self.db_path.name}: journal_mode = {current}")
+        return current
+
+    def set_wal(self, enabled: bool) -> str:
+        """
+        Turn WAL mode on or off for this database
+
+        Leaving WAL needs exclusive access, so idle readers (and the version
+        watcher) are closed first.
+
+        Args:
+            enabled: True for WAL, False for the default rollback journal
+
+        Returns:
+            The journal mode now in effect
+        """
+        conn = self.writer()
+        if conn.in_transaction:
+            raise RuntimeError("Cannot change journal mode inside a transaction")
+
+        with self._lock:
+            idle, self._idle_readers = self._idle_readers, []
+        with self._watcher_lock:
+            if self._watcher is not None:
+                idle.append(self._watcher)
+                self._watcher = None
+        for reader in idle:
+            self._close(reader)
+
+        self.wal = enabled
+        mode = self._apply_journal_mode(conn)
+        if (mode == "wal") != enabled:
+            raise sqlite3.OperationalError(f"Could not switch {self.db_path.name} to journal_mode {mode}")
+        return mode
+
+    def maybe_checkpoint(
+        self,
+        force: bool = False,
+        conn: Optional[sqlite3.Connection] = None
+    ) -> Optional[Dict[str, int]]:
+        """
+        Checkpoint the WAL file once it grows past the configured threshold
+
+        Uses TRUNCATE (which also shrinks the -wal file) when no readers are
+        active, otherwise PASSIVE so readers are never blocked.
+
+        Args:
+            force: Checkpoint regardless of the WAL file size
+            conn: Connection to checkpoint with (default: the shared writer)
+
+        Returns:
+            Checkpoint result, or None if no checkpoint was run
+        """
+        conn = conn or self._writer
+        if not self.wal or conn is None or conn.in_transaction:
+            return None
+
+        wal_file = Path(f"{self.db_path}-wal")
+        size = wal_file.stat().st_size if wal_file.exists() else 0
+        if not force and size < self.checkpoint_threshold_mb * 1024 * 1024:
+            return None
+
+        mode = "TRUNCATE" if self._busy_readers == 0 else "PASSIVE"
+        busy, wal_pages, checkpointed = conn.execute(f"PRAGMA wal_checkpoint({mode})").fetchone()
+        logger.info(
+            f"{self.db_path.name}: {mode} checkpoint of {size / 1024 / 1024:.1f} MB WAL "
+            f"({checkpointed}/{wal_pages} pages{', busy' if busy else ''})"
+        )
+        return {"busy": busy, "wal_pages": wal_pages, "checkpointed": checkpointed}
+
+    def writer(self) -> sqlite3.Connection:
+        """
+        Get the shared writer connection, opening it on first use
+
+        Returns:
+            The pool's single read-write connection
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(f"Connection pool for {self.db_path} is closed")
+            if self._writer is None:
+                self._writer = self._open(readonly=False)
+            else:
+                self.counters["reuses"] += 1
+            return self._writer
+
+    def open_writer(self) -> sqlite3.Connection:
+        """
+        Open a private read-write connection that is not shared
+
+        For a long write transaction on another thread (e.g. an upload),
+        whose statements must not interleave with the shared writer's:
+        SQLite's file locking serializes the two instead. The caller closes
+        it; close() does not.
+
+        Returns:
+            A new read-write connection
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(f"Connection pool for {self.db_path} is closed")
+        return self._open(readonly=False)
+
+    @contextmanager
+    def reader(self, snapshot: bool = False) -> Iterator[sqlite3.Connection]:
+        """
+        Check out a read-only connection for the duration of a with block
+
+        Args:
+            snapshot: Hold one read transaction for the whole block so every
+                query sees the same committed state (e.g. a count and the
+                page it describes) even while an upload is committing
+
+        Example:
+            with pool.reader() as conn:
+                rows = conn.execute("SELECT ...").fetchall()
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(f"Connection pool for {self.db_path} is closed")
+            if self._idle_readers:
+                conn = self._idle_readers.pop()
+                self.counters["reuses"] += 1
+            else:
+                conn = None
+            self._busy_readers += 1
+
+        try:
+            if conn is None:
+                conn = self._open(readonly=True)
+            if snapshot:
+                conn.execute("BEGIN")
+            yield conn
+        finally:
+            with self._lock:
+                self._busy_readers -= 1
+                keep = (
+                    conn is not None and not self._closed
+                    and len(self._idle_readers) < self.max_idle_readers
+                )
+                if keep:
+                    if conn.in_transaction:
+                        conn.rollback()
+                    self._idle_readers.append(conn)
+            if conn is not None and not keep:
+                self._close(conn)
+
+    def versions(self) -> Tuple[int, int]:
+        """
+        Get the database's schema_version and data_version
+
+        Both are read on a dedicated connection that never writes: its
+        data_version changes whenever any other connection (the pool's
+        writer or another process) commits, so comparing two results is a
+        cheap "did anything change" check. Commits made inside
+        bookkeeping_write don't count: until something else changes the
+        database, the versions from before them are returned.
+
+        Returns:
+            (schema_version, data_version)
+        """
+        with self._watcher_lock:
+            versions = self._read_versions()
+            return self._bookkeeping.get(versions, versions)
+
+    def _read_versions(self) -> Tuple[int, int]:
+        """Read the watcher's versions (caller holds _watcher_lock)"""
+        if self._closed:
+            raise RuntimeError(f"Connection pool for {self.db_path} is closed")
+        if self._watcher is None:
+            self._watcher = self._open(readonly=True)
+        schema_version = self._watcher.execute("PRAGMA schema_version").fetchone()[0]
+        data_version = self._watcher.execute("PRAGMA data_version").fetchone()[0]
+        return schema_version, data_version
+
+    @contextmanager
+    def bookkeeping_write(self) -> Iterator[None]:
+        """
+        Context manager around the app's own bookkeeping commits
+
+        Writes to metadata such as the statistics catalog still bump the
+        database's versions, which would make change watchers reload and,
+        e.g., recount tables, which writes the catalog again. The versions
+        right after the block are remembered as equal to the ones before it,
+        so versions() hides the change. A commit by another connection in
+        the same instant is hidden with it.
+        """
+        before = self.versions()
+        yield
+        with self._watcher_lock:
+            after = self._read_versions()
+            if after != before:
+                self._bookkeeping[after] = before
+                while len(self._bookkeeping) > MAX_BOOKKEEPING_WRITES:
+                    self._bookkeeping.popitem(last=False)
+
+    def close(self):
+        """Close the writer and idle readers; busy readers close when returned"""
+        with self._lock:
+            self._closed = True
+            idle, self._idle_readers = self._idle_readers, []
+            writer, self._writer = self._writer, None
+        with self._watcher_lock:
+            watcher, self._watcher = self._watcher, None
+        for conn in idle:
+            self._close(conn)
+        for conn in (writer, watcher):
+            if conn is not None:
+                self._close(conn)
+        logger.info(f"Closed connection pool for {self.db_path.name}: {self.stats()}")
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get connection counters
+
+        Returns:
+            Dictionary with opens, reuses, closes and live handle count
+        """
+        live = (
+            len(self._idle_readers) + self._busy_readers
+            + (self._writer is not None) + (self._watcher is not None)
+        )
+        return {**self.counters, "live": live}
+
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def _pool_key(db_path: Union[str, Path]) -> str:
+    return str(Path(db_path).resolve())
+
+
+def get_pool(db_path: Union[str, Path]) -> ConnectionPool:
+    """Get (or create) the process-wide pool for a database file"""
+    key = _pool_key(db_path)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(key)
+        return pool
+
+
+def close_pool(db_path: Union[str, Path]):
+    """Close and forget the pool for a database file, if any"""
+    with _pools_lock:
+        pool = _pools.pop(_pool_key(db_path), None)
+    if pool is not None:
+        pool.close()
+
+
+def close_all_pools():
+    """Close every open pool (e.g. on exit)"""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+def pool_stats() -> Dict[str, Dict[str, int]]:
+    """
+    Get connection counters for every open pool
+
+    Returns:
+        Dictionary mapping database path to its pool counters
+    """
+    with _pools_lock:
+        return {key: pool.stats() for key, pool in _pools.items()}
+
+
+atexit.register(close_all_pools)
@@ -1,44 +1,958 @@
 """
 Database manager for sambio_human.db operations
 """
+import re
 import sqlite3
+import threading
+import numpy as np
+from contextlib import contextmanager
 import pandas as pd
+from pandas.util import hash_array
 from pathlib import Path
-from typing import Dict, Any, Optional
-from datetime import datetime
+from typing import Callable, Dict, Any, Iterable, Iterator, List, Optional, Tuple, Union
+from datetime import date, datetime, time, timedelta
 import logging
 
+from core.connection_pool import BUSY_TIMEOUT, ConnectionPool, get_pool
+from core.pipeline import DEFAULT_QUEUE_SIZE, run_pipelined
+
 logger = logging.getLogger(__name__)
 
+# Connection settings applied while DatabaseManager.bulk_load is active.
+# The journal is left alone, so a crash mid-load still rolls back cleanly.
+BULK_LOAD_PRAGMAS = {
+    "synchronous": "NORMAL",
+    "temp_store": "MEMORY",
+    "cache_size": "-524288",  # 512 MB
+}
+
+# Added by bulk_load(unsafe=True). A crash or power loss during the load can
+# corrupt the whole file, so this is only for databases that can be rebuilt
+# (e.g. one created for this import). journal_mode stays MEMORY rather than
+# OFF so a failed load still rolls back, and is skipped on WAL databases so
+# readers keep working during the load.
+UNSAFE_BULK_LOAD_PRAGMAS = {
+    "journal_mode": "MEMORY",
+    "synchronous": "OFF",
+}
+
+def quote_identifier(name) -> str:
+    """Quote a table or column name for SQLite"""
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def sqlite_type(values: pd.Series) -> str:
+    """Map a column's dtype to the declared SQLite type DataFrame.to_sql would use"""
+    dtype = values.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        return sqlite_type(pd.Series(dtype.categories))
+    if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+        return "INTEGER"
+    if pd.api.types.is_float_dtype(dtype):
+        return "REAL"
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return "TIMESTAMP"
+    if pd.api.types.is_timedelta64_dtype(dtype):
+        return "INTEGER"
+
+    inferred = pd.api.types.infer_dtype(values, skipna=True)
+    return {
+        "integer": "INTEGER",
+        "boolean": "INTEGER",
+        "floating": "REAL",
+        "mixed-integer-float": "REAL",
+        "decimal": "REAL",
+        "datetime": "TIMESTAMP",
+        "datetime64": "TIMESTAMP",
+        "date": "DATE",
+        "time": "TIME",
+        "timedelta": "INTEGER",
+        "timedelta64": "INTEGER",
+    }.get(inferred, "TEXT")
+
+
+def column_affinity(declared_type: Optional[str]) -> str:
+    """SQLite's type affinity for a declared column type: INTEGER, TEXT, BLOB, REAL or NUMERIC"""
+    declared = (declared_type or "").upper()
+    if "INT" in declared:
+        return "INTEGER"
+    if any(name in declared for name in ("CHAR", "CLOB", "TEXT")):
+        return "TEXT"
+    if not declared or "BLOB" in declared:
+        return "BLOB"
+    if any(name in declared for name in ("REAL", "FLOA", "DOUB")):
+        return "REAL"
+    return "NUMERIC"
+
+
+def create_table_sql(table_name: str, df: pd.DataFrame) -> str:
+    """Build a CREATE TABLE statement matching a DataFrame's columns"""
+    columns = ",\n  ".join(
+        f"{quote_identifier(col)} {sqlite_type(df.iloc[:, i])}"
+        for i, col in enumerate(df.columns)
+    )
+    return f"CREATE TABLE {quote_identifier(table_name)} (\n{columns}\n)"
+
+
+def date_key_sql(column: str) -> str:
+    """
+    SQL expression normalizing a date column to an integer YYYYMMDD key
+
+    Handles integer (20250101), real and text ('2025-01-01',
+    '2025-01-01 00:00:00', '20250101') values. DatabaseManager.ensure_date_key
+    indexes this exact expression, so queries must use it verbatim for
+    SQLite to pick the index.
+    """
+    col = quote_identifier(column)
+    return (
+        f"(CASE typeof({col}) "
+        f"WHEN 'integer' THEN {col} "
+        f"WHEN 'real' THEN CAST({col} AS INTEGER) "
+        f"WHEN 'text' THEN CAST(substr(replace({col}, '-', ''), 1, 8) AS INTEGER) "
+        f"END)"
+    )
+
+
+def date_key_index_name(table_name: str, date_column: str) -> str:
+    """Name of the index DatabaseManager.ensure_date_key builds on date_key_sql"""
+    return f"ix_{table_name}_{date_column}_date_key"
+
+
+def to_date_key(value) -> int:
+    """Convert a date, datetime, YYYYMMDD or YYYY-MM-DD value to a YYYYMMDD integer"""
+    if isinstance(value, (date, datetime, pd.Timestamp)):
+        return value.year * 10000 + value.month * 100 + value.day
+    return int(str(value).replace('-', '')[:8])
+
+
+def format_date_key(key) -> str:
+    """Format a YYYYMMDD integer as YYYY-MM-DD"""
+    text = str(key)
+    if len(text) == 8 and text.isdigit():
+        return f"{text[:4]}-{text[4:6]}-{text[6:8]}"
+    return text
+
+
+def date_key_range(values: pd.Series) -> Optional[Tuple[int, int]]:
+    """
+    Smallest and largest YYYYMMDD date key in a column
+
+    Uses the same normalization as date_key_sql, so the range matches what
+    the date key index sees once the values are stored.
+
+    Returns:
+        (min, max), or None if the column has no date values
+    """
+    values = values.dropna()
+    if pd.api.types.is_datetime64_any_dtype(values.dtype):
+        keys = values.dt.year * 10000 + values.dt.month * 100 + values.dt.day
+    else:
+        text = values.astype(str).str.replace('-', '', regex=False).str[:8]
+        keys = pd.to_numeric(text, errors="coerce").dropna()
+        keys = keys[keys > 0]
+    if keys.empty:
+        return None
+    return int(keys.min()), int(keys.max())
+
+
+def upsert_sql(table_name: str, columns: Iterable[str], key_columns: Iterable[str]) -> str:
+    """
+    INSERT ... ON CONFLICT DO UPDATE statement for a merge
+
+    Only rows where some non-key column differs are rewritten; unchanged
+    rows are skipped by the DO UPDATE WHERE clause.
+    """
+    table = quote_identifier(table_name)
+    columns = [quote_identifier(col) for col in columns]
+    keys = [quote_identifier(col) for col in key_columns]
+    values = [col for col in columns if col not in keys]
+
+    sql = (
+        f"INSERT INTO {table} ({', '.join(columns)}) "
+        f"VALUES ({', '.join('?' * len(columns))}) "
+        f"ON CONFLICT ({', '.join(keys)}) "
+    )
+    if not values:
+        return sql + "DO NOTHING"
+    return sql + (
+        f"DO UPDATE SET {', '.join(f'{col} = excluded.{col}' for col in values)} "
+        f"WHERE {' OR '.join(f'{table}.{col} IS NOT excluded.{col}' for col in values)}"
+    )
+
+
+def _adapt_object(value):
+    """Convert values sqlite3 cannot bind (or binds via deprecated adapters)"""
+    if isinstance(value, datetime):
+        return value.isoformat(" ")
+    if isinstance(value, time):
+        return value.strftime("%H:%M:%S.%f")
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+_NATIVE_TYPES = (str, int, float, bool, bytes, type(None))
+
+
+def _datetimes_to_text(array: np.ndarray) -> list:
+    """Format naive datetime64 values like datetime.isoformat(" "), NaT as None"""
+    seconds = array.astype("datetime64[s]")
+    text = np.datetime_as_string(seconds, unit="s")
+    # 'YYYY-MM-DDTHH:MM:SS' -> 'YYYY-MM-DD HH:MM:SS' in place
+    width = text.dtype.itemsize // 4
+    if len(text) and width > 10:
+        separator = text.view("U1").reshape(len(text), width)[:, 10]
+        separator[separator == "T"] = " "
+    result = text.astype(object)
+
+    # Sub-second values keep their microseconds, as isoformat does
+    fractional = np.flatnonzero(array != seconds)
+    if len(fractional):
+        precise = np.datetime_as_string(array[fractional].astype("datetime64[us]"), unit="us")
+        result[fractional] = np.char.replace(precise, "T", " ")
+
+    result[np.isnat(array)] = None
+    return result.tolist()
+
+
+def column_to_python(values: pd.Series) -> list:
+    """
+    Convert a column to a list of values sqlite3 can bind directly
+
+    Nulls become None, numpy scalars become Python scalars and datetimes
+    become the same text DataFrame.to_sql writes. Typed columns are
+    converted with vectorized numpy/pandas operations.
+    """
+    dtype = values.dtype
+
+    if isinstance(dtype, pd.CategoricalDtype):
+        categories = column_to_python(pd.Series(dtype.categories))
+        lookup = np.array(categories + [None], dtype=object)
+        return lookup[values.cat.codes.to_numpy()].tolist()
+
+    if pd.api.types.is_datetime64_dtype(dtype):
+        return _datetimes_to_text(values.to_numpy())
+
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        # Timezone-aware: rare enough for the slower strftime path
+        text = values.dt.strftime("%Y-%m-%d %H:%M:%S")
+        micros = values.dt.microsecond.fillna(0).astype("int64")
+        fraction = np.where(micros.to_numpy() != 0, "." + micros.astype(str).str.zfill(6), "")
+        text = text + fraction
+        if values.dt.tz is not None:
+            text = text + values.dt.strftime("%z").str.replace(r"(\d\d)(\d\d)$", r"\1:\2", regex=True)
+        return text.astype(object).where(values.notna(), None).tolist()
+
+    if pd.api.types.is_timedelta64_dtype(dtype):
+        ints = values.to_numpy().view("i8").astype(object)
+        ints[values.isna().to_numpy()] = None
+        return ints.tolist()
+
+    if pd.api.types.is_extension_array_dtype(dtype):
+        return values.to_numpy(dtype=object, na_value=None).tolist()
+
+    if pd.api.types.is_float_dtype(dtype):
+        array = values.to_numpy()
+        nulls = np.isnan(array)
+        if nulls.any():
+            array = array.astype(object)
+            array[nulls] = None
+        return array.tolist()
+
+    if dtype.kind in "biu":
+        return values.to_numpy().tolist()
+
+    # Object columns: map nulls to None, adapt anything sqlite3 cannot bind
+    array = values.to_numpy(dtype=object, copy=True)
+    array[pd.isna(array)] = None
+    result = array.tolist()
+    if not all(type(v) in _NATIVE_TYPES for v in result):
+        result = [v if type(v) in _NATIVE_TYPES else _adapt_object(v) for v in result]
+    return result
+
+
+def iter_rows(df: pd.DataFrame) -> Iterator[tuple]:
+    """Yield a DataFrame's rows as tuples of native Python values"""
+    return zip(*(column_to_python(df.iloc[:, i]) for i in range(df.shape[1])))
+
+
+# Bookkeeping column holding each row's content hash (incremental imports)
+ROW_HASH_COLUMN = "_row_hash"
+
+# Columns the UI leaves out of browsing and exports
+HIDDEN_COLUMNS = (ROW_HASH_COLUMN,)
+
+_NAN_HASH = hash_array(np.array([np.nan]))[0]
+_OBJECT_NULL_HASH = hash_array(np.array([None], dtype=object))[0]
+_is_number = np.frompyfunc(lambda v: isinstance(v, (int, float)), 1, 1)
+
+
+# Text SQLite converts to a number when storing it in a numeric-affinity column
+_NUMERIC_TEXT = re.compile(r"\s*[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?\s*")
+
+
+def _real_text(value: float) -> str:
+    """Format a float the way SQLite stores it in a TEXT column (printf '%!.15g')"""
+    text = f"{value + 0.0:.15g}"
+    mantissa, e, exponent = text.partition("e")
+    if "." not in mantissa and mantissa.lstrip("-").isdigit():
+        mantissa += ".0"
+    return mantissa + e + exponent
+
+
+def _number_text(value) -> Any:
+    """A number as the text a TEXT column stores; other values unchanged"""
+    if isinstance(value, (bool, np.bool_)):
+        return str(int(value))
+    if isinstance(value, (int, np.integer)):
+        return str(value)
+    if isinstance(value, (float, np.floating)) and np.isfinite(value):
+        return _real_text(float(value))
+    return value
+
+
+def _with_affinity(values: pd.Series, affinity: str) -> pd.Series:
+    """
+    Convert a column's values the way SQLite does when storing them under
+    a column affinity, so hashes of incoming and stored rows agree (text
+    '00123' in an INTEGER column is stored, and hashed, as 123)
+    """
+    dtype = values.dtype
+    if affinity in ("INTEGER", "REAL", "NUMERIC"):
+        if dtype != object and not pd.api.types.is_string_dtype(dtype):
+            return values
+        array = values.to_numpy(dtype=object, copy=True)
+        is_text = np.fromiter((type(value) is str for value in array), dtype=bool, count=len(array))
+        if not is_text.any():
+            return values
+        text = pd.Series(array[is_text], dtype=object)
+        numeric = text.str.fullmatch(_NUMERIC_TEXT.pattern).to_numpy(dtype=bool)
+        if not numeric.any():
+            return values
+        array[np.flatnonzero(is_text)[numeric]] = text[numeric].astype("float64").to_numpy()
+        return pd.Series(array, index=values.index, dtype=object)
+
+    if affinity == "TEXT":
+        if pd.api.types.is_datetime64_any_dtype(dtype) or isinstance(dtype, pd.CategoricalDtype):
+            return values  # stored as text already
+        if dtype == object and pd.api.types.infer_dtype(values, skipna=True) in ("string", "empty"):
+            return values
+        if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_numeric_dtype(dtype) or dtype == object:
+            array = np.array(column_to_python(values), dtype=object)
+            return pd.Series([_number_text(value) for value in array], index=values.index, dtype=object)
+    return values
+
+
+def _hash_column(values: pd.Series) -> np.ndarray:
+    """
+    Hash a column's values as they will be stored
+
+    Numbers hash as float64 and everything else as the text SQLite will
+    hold, so a row hashes the same whether it comes from a DataFrame or is
+    read back from the table (ints vs floats, datetimes vs their text).
+    """
+    dtype = values.dtype
+    if pd.api.types.is_bool_dtype(dtype) or (
+        pd.api.types.is_numeric_dtype(dtype) and not isinstance(dtype, pd.CategoricalDtype)
+    ):
+        return hash_array(values.to_numpy(dtype="float64", na_value=np.nan))
+
+    # Hash each distinct value once; code -1 (null) picks the trailing NaN hash
+    if isinstance(dtype, pd.CategoricalDtype):
+        lookup = np.append(_hash_column(pd.Series(dtype.categories)), np.uint64(_NAN_HASH))
+        return lookup[values.cat.codes.to_numpy()]
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        codes, uniques = pd.factorize(values)
+        text = pd.Series(column_to_python(pd.Series(uniques)), dtype=object)
+        lookup = np.append(_hash_column(text), np.uint64(_NAN_HASH))
+        return lookup[codes]
+
+    array = values.to_numpy(dtype=object)
+
+    if pd.api.types.infer_dtype(array, skipna=True) in ("string", "empty"):
+        hashes = hash_array(array)
+        hashes[hashes == _OBJECT_NULL_HASH] = _NAN_HASH
+        return hashes
+
+    # Mixed values: numbers hash as floats, the rest as their stored text
+    array = np.array(column_to_python(values), dtype=object)
+    present = ~pd.isna(array)
+    hashes = np.full(len(array), _NAN_HASH, dtype=np.uint64)
+    numbers = _is_number(array).astype(bool) & present
+    if numbers.any():
+        hashes[numbers] = hash_array(array[numbers].astype("float64"))
+    text = present & ~numbers
+    if text.any():
+        hashes[text] = hash_array(array[text].astype(str).astype(object))
+    return hashes
+
+
+def row_hashes(df: pd.DataFrame, types: Optional[Dict[str, str]] = None) -> np.ndarray:
+    """
+    Stable 64-bit content hash per row, vectorized per column
+
+    Columns are combined in name order, so reordered workbook columns hash
+    the same; HIDDEN_COLUMNS are ignored.
+
+    Args:
+        df: Rows to hash
+        types: Declared type by column of the table the rows go to; values
+            are hashed after the conversion that column's affinity applies
+
+    Returns:
+        int64 array (SQLite INTEGER range) with one hash per row
+    """
+    result = np.zeros(len(df), dtype=np.uint64)
+    names = sorted((str(col), position) for position, col in enumerate(df.columns) if col not in HIDDEN_COLUMNS)
+    for name, position in names:
+        values = df.iloc[:, position]
+        if types is not None:
+            values = _with_affinity(values, column_affinity(types.get(df.columns[position])))
+        salt = hash_array(np.array([name], dtype=object))[0]
+        result = (result * np.uint64(1000003)) ^ _hash_column(values) ^ salt
+    return result.view(np.int64)
+
+
+def visible_columns(conn: sqlite3.Connection, table_name: str) -> list:
+    """Column names of a table without HIDDEN_COLUMNS"""
+    return [
+        row[1] for row in conn.execute(f"PRAGMA table_info({quote_identifier(table_name)})")
+        if row[1] not in HIDDEN_COLUMNS
+    ]
+
+
+# Per-table statistics kept current by DatabaseManager's write paths, so the
+# table list doesn't run a COUNT(*) scan over every table each time it loads
+STATS_TABLE = "_table_stats"
+
+# Indexes bulk_load has dropped and not yet recreated, so a load cut short
+# by a crash has them recreated the next time the database is opened
+DEFERRED_INDEXES_TABLE = "_deferred_indexes"
+
+# Bookkeeping tables hidden from the table list
+INTERNAL_TABLES = (STATS_TABLE, DEFERRED_INDEXES_TABLE)
+
+# Optional full-text search index of a table: an external-content FTS5 table
+# named with this prefix (FTS5 adds its own _data, _idx, ... tables after it)
+SEARCH_INDEX_PREFIX = "_fts_"
+
+# Trigram tokens are 3 characters, so shorter search terms can't use the index
+SEARCH_INDEX_MIN_TERM = 3
+
+STATS_TABLE_SQL = f"""
+    CREATE TABLE IF NOT EXISTS {quote_identifier(STATS_TABLE)} (
+        table_name TEXT PRIMARY KEY,
+        row_count INTEGER,
+        column_count INTEGER,
+        max_rowid INTEGER,
+        date_column TEXT,
+        min_date TEXT,
+        max_date TEXT,
+        modified_at TEXT,
+        stale INTEGER NOT NULL DEFAULT 0
+    )
+"""
+
+DEFERRED_INDEXES_TABLE_SQL = f"""
+    CREATE TABLE IF NOT EXISTS {quote_identifier(DEFERRED_INDEXES_TABLE)} (
+        name TEXT PRIMARY KEY,
+        table_name TEXT NOT NULL,
+        sql TEXT NOT NULL
+    )
+"""
+
+# Date range and modified time survive a recount only if the table is unchanged
+_STORE_STATS_SQL = f"""
+    INSERT INTO {quote_identifier(STATS_TABLE)}
+        (table_name, row_count, column_count, max_rowid, date_column, min_date, max_date, modified_at, stale)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (table_name) DO UPDATE SET
+        row_count = excluded.row_count,
+        column_count = excluded.column_count,
+        max_rowid = excluded.max_rowid,
+        date_column = CASE WHEN excluded.date_column IS NOT NULL THEN excluded.date_column
+            WHEN stale = 0 AND max_rowid IS excluded.max_rowid THEN date_column END,
+        min_date = CASE WHEN excluded.date_column IS NOT NULL THEN excluded.min_date
+            WHEN stale = 0 AND max_rowid IS excluded.max_rowid THEN min_date END,
+        max_date = CASE WHEN excluded.date_column IS NOT NULL THEN excluded.max_date
+            WHEN stale = 0 AND max_rowid IS excluded.max_rowid THEN max_date END,
+        modified_at = COALESCE(excluded.modified_at, modified_at),
+        stale = excluded.stale
+"""
+
+
+def is_internal_table(name: str) -> bool:
+    """Whether a table is bookkeeping (INTERNAL_TABLES or a search index) rather than user data"""
+    return name in INTERNAL_TABLES or name.startswith(SEARCH_INDEX_PREFIX)
+
+
+def search_index_name(table_name: str) -> str:
+    """Name of a table's FTS5 search index"""
+    return f"{SEARCH_INDEX_PREFIX}{table_name}"
+
+
+def user_tables(conn: sqlite3.Connection) -> list:
+    """Names of the database's tables, without SQLite's and internal ones"""
+    return [
+        row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%' ORDER BY name"
+        )
+        if not is_internal_table(row[0])
+    ]
+
+
+def table_overview(conn: sqlite3.Connection) -> list:
+    """
+    (name, visible column count) for every user table, in one query
+
+    Reads only the schema, so it is instant regardless of table sizes.
+    """
+    hidden = ", ".join("?" * len(HIDDEN_COLUMNS))
+    rows = conn.execute(
+        f"SELECT m.name, COUNT(p.cid) FROM sqlite_master AS m "
+        f"JOIN pragma_table_info(m.name) AS p "
+        f"WHERE m.type='table' AND m.name NOT LIKE 'sqlite_%' AND p.name NOT IN ({hidden}) "
+        f"GROUP BY m.name ORDER BY m.name",
+        HIDDEN_COLUMNS
+    ).fetchall()
+    return [(name, column_count) for name, column_count in rows if not is_internal_table(name)]
+
+
+def estimate_row_counts(conn: sqlite3.Connection, table_names: Iterable[str]) -> Dict[str, int]:
+    """
+    Approximate row counts without scanning
+
+    Uses the row counts ANALYZE stored in sqlite_stat1 where available,
+    otherwise MAX(rowid), which is exact for append-only tables and an
+    upper bound after deletes.
+
+    Args:
+        conn: Connection to read with
+        table_names: Tables to estimate
+
+    Returns:
+        Dictionary mapping table name to its estimated row count
+    """
+    analyzed = {}
+    try:
+        for table_name, stat in conn.execute("SELECT tbl, stat FROM sqlite_stat1"):
+            rows = int(str(stat).split()[0])
+            analyzed[table_name] = max(analyzed.get(table_name, 0), rows)
+    except (sqlite3.OperationalError, ValueError, IndexError):  # never analyzed
+        pass
+
+    estimates = {}
+    for table_name in table_names:
+        if table_name in analyzed:
+            estimates[table_name] = analyzed[table_name]
+            continue
+        _, max_rowid = table_shape(conn, table_name)
+        if max_rowid is not None and max_rowid >= 0:
+            estimates[table_name] = max_rowid
+        elif max_rowid is None:  # empty table
+            estimates[table_name] = 0
+    return estimates
+
+
+def table_shape(conn: sqlite3.Connection, table_name: str) -> Tuple[int, Optional[int]]:
+    """
+    Visible column count and MAX(rowid) of a table
+
+    Both are cheap (schema lookup plus one b-tree seek). A catalog entry
+    whose recorded shape still matches has seen every append since it was
+    written; rows deleted by other programs are not detected.
+    """
+    column_count = len(visible_columns(conn, table_name))
+    try:
+        max_rowid = conn.execute(f"SELECT MAX(rowid) FROM {quote_identifier(table_name)}").fetchone()[0]
+    except sqlite3.OperationalError:  # WITHOUT ROWID table
+        max_rowid = -1
+    return column_count, max_rowid
+
+
+def read_stats(conn: sqlite3.Connection, table_names: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Catalog entries for tables, each with a 'fresh' flag
+
+    Args:
+        conn: Connection to read with
+        table_names: Tables to look up (default: every user table)
+
+    Returns:
+        Dictionary mapping table name to its stored statistics; tables
+        without an entry are omitted
+    """
+    table_names = user_tables(conn) if table_names is None else list(table_names)
+    try:
+        cursor = conn.execute(f"SELECT * FROM {quote_identifier(STATS_TABLE)}")
+    except sqlite3.OperationalError:  # no catalog yet
+        return {}
+    fields = [col[0] for col in cursor.description]
+    stored = {row[0]: dict(zip(fields, row)) for row in cursor.fetchall()}
+
+    entries = {}
+    for name in table_names:
+        entry = stored.get(name)
+        if entry is None:
+            continue
+        try:
+            shape = table_shape(conn, name)
+        except sqlite3.Error:
+            continue
+        entry["fresh"] = (
+            not entry["stale"] and entry["row_count"] is not None
+            and shape == (entry["column_count"], entry["max_rowid"])
+        )
+        entries[name] = entry
+    return entries
+
+
+# Names SQLite accepts for a table's rowid, unless a column uses them
+ROWID_ALIASES = ("rowid", "oid", "_rowid_")
+
+
+def table_schema(conn: sqlite3.Connection, table_name: str) -> Optional[Dict[str, Any]]:
+    """
+    Read a table's columns, declared types and indexes
+
+    Returns:
+        Dictionary with columns (visible column names in table order),
+        types (declared type by column name), indexes (name, columns and
+        unique for each index) and rowid (a name that refers to the rowid,
+        or None for WITHOUT ROWID tables and tables shadowing every alias),
+        or None if the table doesn't exist
+    """
+    table = quote_identifier(table_name)
+    info = conn.execute(f"PRAGMA table_info({table})").fetchall()
+    if not info:
+        return None
+
+    taken = {str(row[1]).lower() for row in info}
+    rowid = next((alias for alias in ROWID_ALIASES if alias not in taken), None)
+    if rowid is not None:
+        try:
+            conn.execute(f"SELECT {rowid} FROM {table} LIMIT 0")
+        except sqlite3.OperationalError:  # WITHOUT ROWID
+            rowid = None
+
+    indexes = []
+    for _, name, unique, *_ in conn.execute(f"PRAGMA index_list({table})").fetchall():
+        # Expression columns (e.g. the date key) have no name
+        columns = [row[2] for row in conn.execute(f"PRAGMA index_info({quote_identifier(name)})")]
+        indexes.append({"name": name, "columns": columns, "unique": bool(unique)})
+
+    return {
+        "columns": [row[1] for row in info if row[1] not in HIDDEN_COLUMNS],
+        "types": {row[1]: row[2] for row in info},
+        "indexes": indexes,
+        "rowid": rowid,
+    }
+
+
+class SchemaCache:
+    """
+    Per-table schema (table_schema) for one database file
+
+    Shared by every DatabaseManager on the file, so opening a table or
+    changing a search doesn't re-read the schema. Entries are dropped as
+    soon as PRAGMA schema_version changes, whoever changed it.
+    """
+
+    def __init__(self, pool: ConnectionPool):
+        self.pool = pool
+        self._lock = threading.Lock()
+        self._schema_version = None
+        self._tables = {}
+
+    def table(self, table_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a table's cached schema, reading it on first use
+
+        Args:
+            table_name: Table to describe
+
+        Returns:
+            The table_schema dictionary, or None if the table doesn't exist
+        """
+        schema_version, _ = self.pool.versions()
+        with self._lock:
+            if schema_version != self._schema_version:
+                self._tables.clear()
+                self._schema_version = schema_version
+            entry = self._tables.get(table_name)
+        if entry is not None:
+            return entry
+
+        with self.pool.reader() as conn:
+            entry = table_schema(conn, table_name)
+        if entry is not None:
+            with self._lock:
+                self._tables[table_name] = entry
+        return entry
+
+
+_schema_caches: Dict[str, SchemaCache] = {}
+_schema_caches_lock = threading.Lock()
+
+# Pool per database whose deferred indexes were checked, and the
+# (database, table) pairs a bulk_load in this process is loading
+_deferred_index_checks: Dict[str, ConnectionPool] = {}
+_active_bulk_loads = set()
+_bulk_loads_lock = threading.Lock()
+
+
+def get_schema_cache(pool: ConnectionPool) -> SchemaCache:
+    """Get (or create) the schema cache for a pool's database"""
+    key = str(pool.db_path)
+    with _schema_caches_lock:
+        cache = _schema_caches.get(key)
+        if cache is None or cache.pool is not pool:
+            cache = _schema_caches[key] = SchemaCache(pool)
+        return cache
+
 
 class DatabaseManager:
     """SQLite database manager"""
 
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, private_writer: bool = False):
+        """
+        Args:
+            db_path: Path to an existing database file
+            private_writer: Write through a connection of this manager's own
+                (ConnectionPool.open_writer) instead of the pool's shared
+                writer, e.g. for an upload on a worker thread. Call close()
+                when done.
+        """
         self.db_path = Path(db_path)
         if not self.db_path.exists():
             raise FileNotFoundError(f"Database not found: {db_path}")
 
+        self.pool = get_pool(self.db_path)
+        self.schema = get_schema_cache(self.pool)
         self.conn = None
-        logger.info(f"Database manager initialized: {db_path}")
+        self.private_writer = private_writer
+        self._bulk_depth = 0
+        self._recount_conn = None
+        logger.debug(f"Database manager initialized: {db_path}")
 
     def get_connection(self) -> sqlite3.Connection:
-        """Get or create database connection"""
+        """Get the writer connection for this database (pooled unless private_writer)"""
         if self.conn is None:
-            self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
-            self.conn.execute("PRAGMA journal_mode = DELETE")
-            self.conn.execute("PRAGMA synchronous = NORMAL")
-            self.conn.execute("PRAGMA cache_size = -64000")
+            self.conn = self.pool.open_writer() if self.private_writer else self.pool.writer()
+            key = str(self.pool.db_path)
+            with _bulk_loads_lock:
+                check = _deferred_index_checks.get(key) is not self.pool
+                _deferred_index_checks[key] = self.pool
+            if check:
+                self.restore_deferred_indexes()
         return self.conn
 
+    def reader(self, snapshot: bool = False):
+        """
+        Check out a pooled read-only connection
+
+        Args:
+            snapshot: Run the whole with block in one read transaction
+
+        Example:
+            with db.reader() as conn:
+                rows = conn.execute("SELECT ...").fetchall()
+        """
+        return self.pool.reader(snapshot=snapshot)
+
     def close(self):
-        """Close database connection"""
-        if self.conn:
+        """Release this manager's connection (the pool keeps a shared one open for reuse)"""
+        if self.conn is not None and self.conn.in_transaction:
+            self.conn.rollback()
+        if self.conn is not None and self.private_writer:
             self.conn.close()
-            self.conn = None
+        self.conn = None
+
+    @contextmanager
+    def bulk_load(self, table_name: Optional[str] = None, unsafe: bool = False):
+        """
+        Context manager for large imports
+
+        Switches the connection to BULK_LOAD_PRAGMAS and, if table_name is
+        given, drops that table's explicit indexes so the load doesn't
+        maintain them row by row. On exit (including after an error) the
+        indexes are recreated in one transaction and the previous PRAGMA
+        values are restored. Nested calls are no-ops. The dropped indexes'
+        SQL is kept in DEFERRED_INDEXES_TABLE until they are recreated, so
+        after a crash restore_deferred_indexes recreates them.
+
+        Args:
+            table_name: Table being loaded, whose indexes are rebuilt afterwards
+            unsafe: Also apply UNSAFE_BULK_LOAD_PRAGMAS (no durable journal,
+                no fsync). Only for databases that can be recreated if the
+                load is interrupted by a crash.
+
+        Example:
+            with db.bulk_load("employees"):
+                db.dataframe_to_table(chunks, "employees")
+        """
+        if self._bulk_depth:
+            self._bulk_depth += 1
+            try:
+                yield
+            finally:
+                self._bulk_depth -= 1
+            return
+
+        conn = self.get_connection()
+        if conn.in_transaction:
+            raise RuntimeError("bulk_load cannot start inside an open transaction")
+
+        pragmas = dict(BULK_LOAD_PRAGMAS)
+        if unsafe:
+            pragmas.update(UNSAFE_BULK_LOAD_PRAGMAS)
+            if conn.execute("PRAGMA journal_mode").fetchone()[0].lower() == "wal":
+                del pragmas["journal_mode"]
+        saved = {name: conn.execute(f"PRAGMA {name}").fetchone()[0] for name in pragmas}
+        self._bulk_depth = 1
+        indexes = []
+        loading = (str(self.pool.db_path), table_name)
+        try:
+            for name, value in pragmas.items():
+                conn.execute(f"PRAGMA {name} = {value}")
+            if table_name:
+                with _bulk_loads_lock:
+                    _active_bulk_loads.add(loading)
+                indexes = self._drop_indexes(table_name)
+            logger.info(
+                f"Bulk load started for {table_name or 'database'} "
+                f"({len(indexes)} index(es) deferred)"
+            )
+            yield
+        finally:
+            self._bulk_depth = 0
+            try:
+                if indexes:
+                    self._rebuild_indexes(indexes)
+            finally:
+                with _bulk_loads_lock:
+                    _active_bulk_loads.discard(loading)
+                if conn.in_transaction:
+                    conn.rollback()
+                for name, value in saved.items():
+                    conn.execute(f"PRAGMA {name} = {value}")
+                logger.info(f"Bulk load finished for {table_name or 'database'}")
+
+    def _drop_indexes(self, table_name: str) -> list:
+        """Drop a table's explicit non-unique indexes and return (name, sql) pairs for rebuilding"""
+        conn = self.get_connection()
+        # Automatic indexes (PRIMARY KEY / UNIQUE constraints) have no SQL and can't be dropped;
+        # explicit UNIQUE indexes are kept because they enforce constraints during the load
+        unique = {
+            row[1] for row in conn.execute(f"PRAGMA index_list({quote_identifier(table_name)})")
+            if row[2]
+        }
+        indexes = [
+            (name, sql) for name, sql in conn.execute(
+                "SELECT name, sql FROM sqlite_master "
+                "WHERE type='index' AND tbl_name=? AND sql IS NOT NULL",
+                (table_name,)
+            )
+            if name not in unique
+        ]
+        if indexes:
+            with conn:
+                conn.execute(DEFERRED_INDEXES_TABLE_SQL)
+                conn.executemany(
+                    f"INSERT OR REPLACE INTO {quote_identifier(DEFERRED_INDEXES_TABLE)} "
+                    f"(name, table_name, sql) VALUES (?, ?, ?)",
+                    [(name, table_name, sql) for name, sql in indexes]
+                )
+                for name, _ in indexes:
+                    conn.execute(f"DROP INDEX IF EXISTS {quote_identifier(name)}")
+        return indexes
+
+    def _rebuild_indexes(self, indexes: list):
+        """Recreate dropped indexes in a single transaction"""
+        conn = self.get_connection()
+        rebuilt = 0
+        with conn:
+            for name, sql in indexes:
+                try:
+                    conn.execute(sql)
+                    rebuilt += 1
+                except sqlite3.Error as e:
+                    # e.g. the table was replaced and no longer has the indexed column
+                    logger.warning(f"Could not recreate index {name}: {e}")
+            conn.executemany(
+                f"DELETE FROM {quote_identifier(DEFERRED_INDEXES_TABLE)} WHERE name = ?",
+                [(name,) for name, _ in indexes]
+            )
+        logger.info(f"Rebuilt {rebuilt}/{len(indexes)} index(es)")
+
+    def restore_deferred_indexes(self) -> int:
+        """
+        Recreate indexes a bulk load dropped but never recreated (it was
+        cut short by a crash or a killed process)
+
+        Runs once per pool when its writer is first used. Tables this
+        process is bulk loading right now are left alone.
+
+        Returns:
+            Number of indexes recreated
+        """
+        conn = self.get_connection()
+        if conn.in_transaction:
+            return 0
+        deferred = quote_identifier(DEFERRED_INDEXES_TABLE)
+        try:
+            if not conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (DEFERRED_INDEXES_TABLE,)
+            ).fetchone():
+                return 0
+            with _bulk_loads_lock:
+                loading = {table for path, table in _active_bulk_loads if path == str(self.pool.db_path)}
+            rows = [
+                row for row in conn.execute(f"SELECT name, table_name, sql FROM {deferred}")
+                if row[1] not in loading
+            ]
+            if not rows:
+                return 0
+
+            restored = 0
+            with conn:
+                for name, table_name, sql in rows:
+                    exists = conn.execute(
+                        "SELECT 1 FROM sqlite_master WHERE name=?", (name,)
+                    ).fetchone()
+                    table_exists = conn.execute(
+                        "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (table_name,)
+                    ).fetchone()
+                    if table_exists and not exists:
+                        try:
+                            conn.execute(sql)
+                            restored += 1
+                        except sqlite3.Error as e:
+                            logger.warning(f"Could not recreate index {name}: {e}")
+                    conn.execute(f"DELETE FROM {deferred} WHERE name = ?", (name,))
+        except sqlite3.Error as e:
+            # e.g. locked by another program's load; checked again when the database is reopened
+            logger.warning(f"Could not check for indexes left dropped by a bulk load: {e}")
+            return 0
+
+        if restored:
+            logger.warning(f"Recreated {restored} index(es) left dropped by an interrupted bulk load")
+        return restored
 
     def get_table_stats(self, table_name: str, date_column: Optional[str] = None) -> Dict[str, Any]:
-        """Get statistics for a table"""
+        """
+        Get statistics for a table
+
+        Row count and date range come from the statistics catalog when its
+        entry is fresh; otherwise they are computed and written back to it.
+        The date range uses the date key index if it exists (see
+        ensure_date_key) and a single table scan otherwise; this read path
+        never builds the index itself.
+        """
         conn = self.get_connection()
         cursor = conn.cursor()
 
@@ -55,41 +969,47 @@ class DatabaseManager:
                     "date_range": None
                 }
 
+            entry = read_stats(conn, [table_name]).get(table_name)
+            fresh = entry is not None and entry["fresh"]
+
             # Get row count
-            cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-            row_count = cursor.fetchone()[0]
+            if fresh:
+                row_count = entry["row_count"]
+            else:
+                cursor.execute(f"SELECT COUNT(*) FROM {quote_identifier(table_name)}")
+                row_count = cursor.fetchone()[0]
 
             # Get date range if date column exists
             date_range = None
-            if date_column:
+            cached_range = fresh and entry["date_column"] == date_column and entry["min_date"] is not None
+            if date_column and cached_range:
+                date_range = {"min": entry["min_date"], "max": entry["max_date"]}
+            elif date_column:
                 try:
-                    cursor.execute(
-                        f"SELECT MIN({date_column}), MAX({date_column}) FROM {table_name}"
-                    )
+                    key = date_key_sql(date_column)
+                    table = quote_identifier(table_name)
+                    if self._has_date_key(table_name, date_column):
+                        # Two index lookups on the date key
+                        cursor.execute(
+                            f"SELECT (SELECT MIN({key}) FROM {table} WHERE {key} > 0), "
+                            f"(SELECT MAX({key}) FROM {table})"
+                        )
+                    else:
+                        cursor.execute(
+                            f"SELECT MIN(CASE WHEN {key} > 0 THEN {key} END), MAX({key}) FROM {table}"
+                        )
                     min_date, max_date = cursor.fetchone()
                     if min_date and max_date:
-                        # Format date string: 20250101 -> 2025-01-01 or 2025-01-01 00:00:00 -> 2025-01-01
-                        def format_date(date_str):
-                            date_str = str(date_str)
-
-                            # If already in YYYY-MM-DD format (with optional time), extract date part
-                            if '-' in date_str:
-                                return date_str[:10]  # 2025-01-01 00:00:00 -> 2025-01-01
-
-                            # If in YYYYMMDD format, convert to YYYY-MM-DD
-                            date_str = date_str[:8]  # Take first 8 characters
-                            if len(date_str) == 8 and date_str.isdigit():
-                                return f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:8]}"
-
-                            return date_str
-
                         date_range = {
-                            "min": format_date(min_date),
-                            "max": format_date(max_date)
+                            "min": format_date_key(min_date),
+                            "max": format_date_key(max_date)
                         }
                 except Exception as e:
                     logger.warning(f"Could not get date range for {table_name}: {e}")
 
+            if not fresh or (date_range and not cached_range):
+                self._store_stats(conn, [(table_name, row_count, table_shape(conn, table_name), date_column, date_range)])
+
             return {
                 "exists": True,
                 "row_count": row_count,
@@ -105,9 +1025,158 @@ class DatabaseManager:
                 "error": str(e)
             }
 
+    def get_catalog(self, table_names: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Get catalog statistics for tables without scanning them
+
+        Args:
+            table_names: Tables to look up (default: every user table)
+
+        Returns:
+            Dictionary mapping table name to row_count, column_count,
+            date_column, min_date, max_date, modified_at and fresh. Tables
+            with no entry yet are omitted; entries that are not fresh hold
+            the last known row count and need recount_tables.
+        """
+        with self.reader(snapshot=True) as conn:
+            return read_stats(conn, table_names)
+
+    def recount_tables(
+        self,
+        table_names: Iterable[str],
+        should_stop: Optional[Callable[[], bool]] = None
+    ) -> Dict[str, int]:
+        """
+        Count rows exactly and store the counts in the statistics catalog
+
+        Counts run on a pooled reader, so this is safe to call from a
+        background thread while the UI keeps using the database.
+
+        Args:
+            table_names: Tables to count
+            should_stop: Checked before each table; when it returns True
+                the remaining tables are skipped (pair with interrupt_recount
+                to also abandon the count in progress)
+
+        Returns:
+            Dictionary mapping table name to its row count, for the tables
+            counted before stopping
+        """
+        counts = {}
+        entries = []
+        for table_name in table_names:
+            if should_stop and should_stop():
+                break
+            # One snapshot per table so the count and the shape stored with it agree
+            with self.reader(snapshot=True) as conn:
+                self._recount_conn = conn
+                try:
+                    count = conn.execute(f"SELECT COUNT(*) FROM {quote_identifier(table_name)}").fetchone()[0]
+                    entries.append((table_name, count, table_shape(conn, table_name), None, None))
+                except sqlite3.OperationalError:
+                    if should_stop and should_stop():
+                        break
+                    raise
+                finally:
+                    self._recount_conn = None
+            counts[table_name] = count
+
+        if entries:
+            # A private connection, so this never interleaves with the writer's transactions
+            conn = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT)
+            try:
+                self._store_stats(conn, entries)
+            finally:
+                conn.close()
+        return counts
+
+    def interrupt_recount(self):
+        """Abort the count recount_tables is running (safe to call from any thread)"""
+        conn = self._recount_conn
+        if conn is not None:
+            conn.interrupt()
+
+    def _store_stats(self, conn: sqlite3.Connection, entries: list):
+        """
+        Write exact counts (and date ranges) to the catalog, best effort
+
+        Skipped when conn has an open transaction, whose uncommitted rows
+        the counts may include.
+
+        Args:
+            conn: Connection to write with
+            entries: (table_name, row_count, (column_count, max_rowid),
+                date_column, date_range) tuples
+        """
+        if conn.in_transaction:
+            return
+        params = []
+        for table_name, row_count, (column_count, max_rowid), date_column, date_range in entries:
+            if not date_range:
+                date_column = None
+            params.append((
+                table_name, row_count, column_count, max_rowid, date_column,
+                date_range["min"] if date_column else None,
+                date_range["max"] if date_column else None,
+                None, 0
+            ))
+        try:
+            # Not a data change: watchers shouldn't reload (and recount) over it
+            with self.pool.bookkeeping_write(), conn:
+                conn.execute(STATS_TABLE_SQL)
+                conn.executemany(_STORE_STATS_SQL, params)
+        except sqlite3.Error as e:
+            # e.g. a read-only file or a long-running write elsewhere
+            logger.debug(f"Could not update table statistics: {e}")
+
+    def _stats_base(self, cursor: sqlite3.Cursor, table_name: str) -> Optional[int]:
+        """Row count before a write: 0 for a new table, the fresh catalog count, or None if unknown"""
+        if not self.table_exists(table_name):
+            return 0
+        entry = read_stats(cursor.connection, [table_name]).get(table_name)
+        return entry["row_count"] if entry and entry["fresh"] else None
+
+    def _record_write(self, cursor: sqlite3.Cursor, table_name: str, base: Optional[int], rows_delta: int):
+        """
+        Update a table's catalog entry inside the transaction that changed it
+
+        With an unknown base the last known count is adjusted by rows_delta
+        and kept as an estimate marked stale. The stored date range is
+        cleared since the write may have moved it.
+
+        Args:
+            cursor: Cursor of the write transaction
+            table_name: Table that was written
+            base: Row count before the write (from _stats_base)
+            rows_delta: Rows added minus rows deleted
+        """
+        if not self.table_exists(table_name):
+            return
+        cursor.execute(STATS_TABLE_SQL)
+        if base is None:
+            cursor.execute(
+                f"SELECT row_count FROM {quote_identifier(STATS_TABLE)} WHERE table_name = ?",
+                (table_name,)
+            )
+            row = cursor.fetchone()
+            row_count = max(row[0] + rows_delta, 0) if row and row[0] is not None else None
+        else:
+            row_count = base + rows_delta
+
+        column_count, max_rowid = table_shape(cursor.connection, table_name)
+        cursor.execute(
+            f"INSERT OR REPLACE INTO {quote_identifier(STATS_TABLE)} "
+            f"(table_name, row_count, column_count, max_rowid, modified_at, stale) "
+            f"VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                table_name, row_count, column_count, max_rowid,
+                datetime.now().strftime('%Y-%m-%d %H:%M:%S'), int(base is None)
+            )
+        )
+
     def dataframe_to_table(
         self,
-        df: pd.DataFrame,
+        df: Union[pd.DataFrame, Iterable[pd.DataFrame]],
         table_name: str,
         if_exists: str = "append",
         chunk_size: int = 5000
@@ -115,8 +1184,14 @@ class DatabaseManager:
         """
         Insert DataFrame into SQLite table with chunking
 
+        The table is created (or replaced) from the first frame's dtypes,
+        then rows are bulk-inserted with a single prepared INSERT fed to
+        executemany. Columns are converted to native Python values per batch
+        with numpy, and the whole load runs in one transaction.
+
         Args:
-            df: DataFrame to insert
+            df: DataFrame to insert, or an iterable of DataFrame chunks
+                (e.g. ExcelLoader.iter_chunks) consumed one at a time
             table_name: Target table name
             if_exists: 'append', 'replace', or 'fail'
             chunk_size: Number of rows per batch
@@ -124,30 +1199,27 @@ class DatabaseManager:
         Returns:
             Number of rows inserted
         """
+        if if_exists not in ("append", "replace", "fail"):
+            raise ValueError(f"'{if_exists}' is not valid for if_exists")
+
         conn = self.get_connection()
 
         try:
-            # Get total rows
-            total_rows = len(df)
-            logger.info(f"Inserting {total_rows:,} rows into {table_name} (mode: {if_exists})")
-
-            # Insert in chunks
-            rows_inserted = 0
-            for i in range(0, total_rows, chunk_size):
-                chunk = df.iloc[i:i + chunk_size]
-                chunk.to_sql(
-                    table_name,
-                    conn,
-                    if_exists=if_exists if i == 0 else 'append',
-                    index=False
-                )
-                rows_inserted += len(chunk)
+            if isinstance(df, pd.DataFrame):
+                logger.info(f"Inserting {len(df):,} rows into {table_name} (mode: {if_exists})")
+            else:
+                logger.info(f"Inserting chunked data into {table_name} (mode: {if_exists})")
 
-                if (i + chunk_size) % (chunk_size * 4) == 0:  # Log every 4 chunks
-                    logger.info(f"Progress: {rows_inserted:,}/{total_rows:,} rows ({rows_inserted/total_rows*100:.1f}%)")
+            if not conn.in_transaction:
+                conn.execute("BEGIN")
+            cursor = conn.cursor()
+            base = 0 if if_exists == "replace" else self._stats_base(cursor, table_name)
+            rows_inserted = self._insert_frames(cursor, df, table_name, if_exists, chunk_size)
+            self._record_write(cursor, table_name, base, rows_inserted)
 
             conn.commit()
             logger.info(f"Insert complete: {rows_inserted:,} rows into {table_name}")
+            self.pool.maybe_checkpoint(conn=self.get_connection())
             return rows_inserted
 
         except Exception as e:
@@ -155,6 +1227,435 @@ class DatabaseManager:
             logger.error(f"Error inserting data into {table_name}: {e}")
             raise
 
+    def _insert_frames(
+        self,
+        cursor: sqlite3.Cursor,
+        df: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+        table_name: str,
+        if_exists: str,
+        chunk_size: int
+    ) -> int:
+        """Insert frames inside the caller's transaction; returns rows inserted"""
+        if isinstance(df, pd.DataFrame):
+            total_rows = len(df)
+            frames = [df]
+        else:
+            total_rows = None
+            frames = df
+
+        # Insert in chunks
+        rows_inserted = 0
+        batches = 0
+        table_ready = False
+        hashed_columns = None
+        statements = {}
+        for frame in frames:
+            if not table_ready:
+                self._prepare_table(cursor, table_name, frame, if_exists)
+                hashed_columns = self._hashed_columns(cursor, table_name)
+                table_ready = True
+            if hashed_columns is not None and ROW_HASH_COLUMN not in frame.columns:
+                frame = self._with_row_hash(frame, hashed_columns)
+
+            columns = tuple(frame.columns)
+            sql = statements.get(columns)
+            if sql is None:
+                sql = statements[columns] = (
+                    f"INSERT INTO {quote_identifier(table_name)} "
+                    f"({', '.join(quote_identifier(col) for col in columns)}) "
+                    f"VALUES ({', '.join('?' * len(columns))})"
+                )
+
+            for i in range(0, len(frame), chunk_size):
+                chunk = frame.iloc[i:i + chunk_size]
+                cursor.executemany(sql, iter_rows(chunk))
+                rows_inserted += len(chunk)
+                batches += 1
+
+                if batches % 4 == 0:  # Log every 4 chunks
+                    if total_rows:
+                        logger.info(f"Progress: {rows_inserted:,}/{total_rows:,} rows ({rows_inserted/total_rows*100:.1f}%)")
+                    else:
+                        logger.info(f"Progress: {rows_inserted:,} rows")
+
+        return rows_inserted
+
+    def merge_dataframe(
+        self,
+        df: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+        table_name: str,
+        key_columns: Iterable[str],
+        chunk_size: int = 5000
+    ) -> Dict[str, int]:
+        """
+        Upsert rows keyed on one or more columns
+
+        Creates the table if needed and a unique index on the key columns if
+        none exists, then applies batched INSERT ... ON CONFLICT DO UPDATE.
+        The update only fires for rows where some column actually differs,
+        so unchanged rows cost an index lookup and no write.
+
+        Args:
+            df: DataFrame to merge, or an iterable of DataFrame chunks
+            table_name: Target table name
+            key_columns: Columns identifying a row
+            chunk_size: Number of rows per batch
+
+        Returns:
+            Dictionary with inserted, updated and unchanged row counts
+        """
+        key_columns = list(key_columns)
+        if not key_columns:
+            raise ValueError("merge requires at least one key column")
+
+        conn = self.get_connection()
+        frames = [df] if isinstance(df, pd.DataFrame) else df
+        logger.info(f"Merging data into {table_name} on ({', '.join(key_columns)})")
+
+        try:
+            if not conn.in_transaction:
+                conn.execute("BEGIN")
+            cursor = conn.cursor()
+            base = self._stats_base(cursor, table_name)
+
+            statements = {}
+            start_rowid = None
+            rows_seen = 0
+            rows_changed = 0
+            for frame in frames:
+                missing = [col for col in key_columns if col not in frame.columns]
+                if missing:
+                    raise KeyError(f"Key column(s) not in data: {', '.join(missing)}")
+
+                if start_rowid is None:
+                    self._prepare_table(cursor, table_name, frame, "append")
+                    self.ensure_unique_key(table_name, key_columns, cursor)
+                    hashed_columns = self._hashed_columns(cursor, table_name)
+                    # New rows get rowids above the current maximum
+                    cursor.execute(f"SELECT COALESCE(MAX(rowid), 0) FROM {quote_identifier(table_name)}")
+                    start_rowid = cursor.fetchone()[0]
+
+                # Updated rows get their new content's hash too
+                if hashed_columns is not None and ROW_HASH_COLUMN not in frame.columns:
+                    frame = self._with_row_hash(frame, hashed_columns)
+
+                columns = tuple(frame.columns)
+                sql = statements.get(columns)
+                if sql is None:
+                    sql = statements[columns] = upsert_sql(table_name, columns, key_columns)
+
+                for i in range(0, len(frame), chunk_size):
+                    chunk = frame.iloc[i:i + chunk_size]
+                    cursor.executemany(sql, iter_rows(chunk))
+                    rows_changed += cursor.rowcount
+                    rows_seen += len(chunk)
+
+            inserted = 0
+            if start_rowid is not None:
+                cursor.execute(
+                    f"SELECT COUNT(*) FROM {quote_identifier(table_name)} WHERE rowid > ?",
+                    (start_rowid,)
+                )
+                inserted = cursor.fetchone()[0]
+
+            self._record_write(cursor, table_name, base, inserted)
+            conn.commit()
+
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Error merging data into {table_name}: {e}")
+            raise
+
+        self.pool.maybe_checkpoint(conn=self.get_connection())
+        counts = {
+            "inserted": inserted,
+            "updated": rows_changed - inserted,
+            "unchanged": rows_seen - rows_changed,
+        }
+        logger.info(
+            f"Merge complete for {table_name}: {counts['inserted']:,} inserted, "
+            f"{counts['updated']:,} updated, {counts['unchanged']:,} unchanged"
+        )
+        return counts
+
+    def incremental_insert(
+        self,
+        df: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+        table_name: str,
+        chunk_size: int = 5000
+    ) -> Dict[str, int]:
+        """
+        Append only rows whose content is not already in the table
+
+        Each chunk's rows are hashed (row_hashes) and looked up in the
+        indexed ROW_HASH_COLUMN with one batched IN query per chunk; rows
+        already present are skipped and the rest inserted with their hash.
+        Lookups only see rows that existed before this import, so identical
+        rows within one upload are all kept, as a plain append would.
+        Tables created before incremental imports are migrated on first use,
+        and rows stored without a hash (e.g. by another program) are hashed
+        before the lookups.
+
+        Args:
+            df: DataFrame to import, or an iterable of DataFrame chunks
+            table_name: Target table name
+            chunk_size: Number of rows per batch
+
+        Returns:
+            Dictionary with inserted and skipped row counts
+        """
+        conn = self.get_connection()
+        frames = [df] if isinstance(df, pd.DataFrame) else df
+        counts = {"inserted": 0, "skipped": 0}
+        logger.info(f"Incremental import into {table_name}")
+
+        def new_rows(cursor):
+            start_rowid = None
+            table_hashes = None
+            rows_seen = 0
+            for frame in frames:
+                if start_rowid is None:
+                    self._prepare_table(cursor, table_name, frame.assign(**{ROW_HASH_COLUMN: 0}), "append")
+                    self.ensure_row_hash(table_name, cursor)
+                    hashed_columns = self._hashed_columns(cursor, table_name)
+                    cursor.execute(f"SELECT COALESCE(MAX(rowid), 0) FROM {quote_identifier(table_name)}")
+                    start_rowid = cursor.fetchone()[0]
+
+                frame = self._with_row_hash(frame, hashed_columns)
+                hashes = frame[ROW_HASH_COLUMN].to_numpy()
+
+                # Index probes cost ~3x a sequential hash scan per row, so once
+                # the upload is large relative to the table, read every
+                # pre-import hash in one pass and reuse it for later chunks
+                rows_seen += len(frame)
+                if table_hashes is None and rows_seen * 3 >= start_rowid:
+                    table_hashes = self._stored_hashes(cursor, table_name, start_rowid)
+                if table_hashes is not None:
+                    existing = table_hashes
+                else:
+                    existing = self._existing_hashes(cursor, table_name, hashes, start_rowid)
+                keep = ~pd.Series(hashes).isin(existing).to_numpy()
+                counts["skipped"] += int((~keep).sum())
+                if keep.any():
+                    yield frame[keep] if not keep.all() else frame
+
+        try:
+            if not conn.in_transaction:
+                conn.execute("BEGIN")
+            cursor = conn.cursor()
+            base = self._stats_base(cursor, table_name)
+            counts["inserted"] = self._insert_frames(cursor, new_rows(cursor), table_name, "append", chunk_size)
+            self._record_write(cursor, table_name, base, counts["inserted"])
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Error importing data into {table_name}: {e}")
+            raise
+
+        self.pool.maybe_checkpoint(conn=self.get_connection())
+        logger.info(
+            f"Incremental import complete for {table_name}: "
+            f"{counts['inserted']:,} inserted, {counts['skipped']:,} already present"
+        )
+        return counts
+
+    def _existing_hashes(
+        self,
+        cursor: sqlite3.Cursor,
+        table_name: str,
+        hashes: np.ndarray,
+        max_rowid: int
+    ) -> np.ndarray:
+        """Subset of hashes already stored in rows up to max_rowid (batched IN lookups)"""
+        unique = pd.unique(hashes).tolist()
+        try:
+            # Very long IN lists get slower again; ~32k per query is the sweet spot
+            limit = min(cursor.connection.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER), 32766) - 1
+        except AttributeError:  # Python < 3.11
+            limit = 998
+        found = []
+        for i in range(0, len(unique), limit):
+            batch = unique[i:i + limit]
+            cursor.execute(
+                f"SELECT {quote_identifier(ROW_HASH_COLUMN)} FROM {quote_identifier(table_name)} "
+                f"WHERE {quote_identifier(ROW_HASH_COLUMN)} IN ({', '.join('?' * len(batch))}) AND rowid <= ?",
+                batch + [max_rowid]
+            )
+            found.extend(row[0] for row in cursor.fetchall())
+        return np.array(found, dtype=np.int64)
+
+    def _stored_hashes(self, cursor: sqlite3.Cursor, table_name: str, max_rowid: int) -> np.ndarray:
+        """Every stored hash in rows up to max_rowid (one scan of the hash index)"""
+        cursor.execute(
+            f"SELECT {quote_identifier(ROW_HASH_COLUMN)} FROM {quote_identifier(table_name)} "
+            f"INDEXED BY {quote_identifier(f'ix_{table_name}_{ROW_HASH_COLUMN}')} "
+            f"WHERE rowid <= ? AND {quote_identifier(ROW_HASH_COLUMN)} IS NOT NULL",
+            (max_rowid,)
+        )
+        return np.fromiter((row[0] for row in cursor), dtype=np.int64)
+
+    def ensure_row_hash(self, table_name: str, cursor: Optional[sqlite3.Cursor] = None):
+        """
+        Add and index ROW_HASH_COLUMN on a table if it is missing, and hash
+        every row stored without one
+
+        Args:
+            table_name: Target table name
+            cursor: Cursor to use (e.g. inside an open transaction)
+        """
+        cursor = cursor or self.get_connection().cursor()
+        table = quote_identifier(table_name)
+        hash_column = quote_identifier(ROW_HASH_COLUMN)
+
+        if self._hashed_columns(cursor, table_name) is None:
+            logger.info(f"Adding row hashes to existing rows of {table_name}")
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {hash_column} INTEGER")
+        cursor.execute(
+            f"CREATE INDEX IF NOT EXISTS {quote_identifier(f'ix_{table_name}_{ROW_HASH_COLUMN}')} "
+            f"ON {table} ({hash_column})"
+        )
+
+        # Rows from before the column existed, or written by other programs
+        columns = self._hashed_columns(cursor, table_name)
+        select = ", ".join(quote_identifier(col) for col in columns)
+        last_rowid = 0
+        while True:
+            page = pd.read_sql_query(
+                f"SELECT rowid AS __rowid, {select} FROM {table} "
+                f"WHERE {hash_column} IS NULL AND rowid > ? ORDER BY rowid LIMIT 50000",
+                cursor.connection,
+                params=(last_rowid,)
+            )
+            if page.empty:
+                break
+            rowids = page.pop("__rowid").to_numpy()
+            cursor.executemany(
+                f"UPDATE {table} SET {hash_column} = ? WHERE rowid = ?",
+                zip(row_hashes(page, columns).tolist(), rowids.tolist())
+            )
+            last_rowid = int(rowids[-1])
+
+    def _hashed_columns(self, cursor: sqlite3.Cursor, table_name: str) -> Optional[Dict[str, str]]:
+        """
+        Columns a table's row hashes cover, with their declared types, or
+        None if it has no ROW_HASH_COLUMN
+        """
+        info = cursor.execute(f"PRAGMA table_info({quote_identifier(table_name)})").fetchall()
+        if ROW_HASH_COLUMN not in (row[1] for row in info):
+            return None
+        return {row[1]: row[2] for row in info if row[1] not in HIDDEN_COLUMNS}
+
+    def _with_row_hash(self, frame: pd.DataFrame, hashed_columns: Dict[str, str]) -> pd.DataFrame:
+        """Add ROW_HASH_COLUMN to a frame, hashing rows as stored (columns it lacks as NULL)"""
+        hashes = row_hashes(frame.reindex(columns=list(hashed_columns)), hashed_columns)
+        return frame.assign(**{ROW_HASH_COLUMN: hashes})
+
+    def ensure_unique_key(
+        self,
+        table_name: str,
+        key_columns: Iterable[str],
+        cursor: Optional[sqlite3.Cursor] = None
+    ) -> str:
+        """
+        Find or create a unique index on exactly the given columns
+
+        Args:
+            table_name: Target table name
+            key_columns: Columns the index must cover
+            cursor: Cursor to use (e.g. inside an open transaction)
+
+        Returns:
+            Name of the unique index
+        """
+        key_columns = list(key_columns)
+        cursor = cursor or self.get_connection().cursor()
+        table = quote_identifier(table_name)
+
+        for _, name, unique, *_ in cursor.execute(f"PRAGMA index_list({table})").fetchall():
+            if not unique:
+                continue
+            indexed = [row[2] for row in cursor.execute(f"PRAGMA index_info({quote_identifier(name)})")]
+            if sorted(indexed) == sorted(key_columns):
+                return name
+
+        index_name = f"ux_{table_name}_{'_'.join(key_columns)}"
+        logger.info(f"Creating unique index {index_name}")
+        try:
+            cursor.execute(
+                f"CREATE UNIQUE INDEX {quote_identifier(index_name)} ON {table} "
+                f"({', '.join(quote_identifier(col) for col in key_columns)})"
+            )
+        except sqlite3.IntegrityError as e:
+            raise ValueError(
+                f"Key column(s) {', '.join(key_columns)} are not unique in {table_name}"
+            ) from e
+        return index_name
+
+    def _prepare_table(self, cursor: sqlite3.Cursor, table_name: str, df: pd.DataFrame, if_exists: str):
+        """Create, replace or validate the target table for an insert"""
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name=?",
+            (table_name,)
+        )
+        exists = cursor.fetchone() is not None
+
+        if exists and if_exists == "fail":
+            raise ValueError(f"Table '{table_name}' already exists.")
+        if exists and if_exists == "replace":
+            cursor.execute(f"DROP TABLE {quote_identifier(table_name)}")
+            self._drop_search_index(cursor, table_name)
+            exists = False
+        if not exists:
+            cursor.execute(create_table_sql(table_name, df))
+
+    def pipelined_insert(
+        self,
+        chunks: Iterable[pd.DataFrame],
+        table_name: str,
+        if_exists: str = "append",
+        chunk_size: int = 5000,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        key_columns: Optional[Iterable[str]] = None
+    ) -> Union[int, Dict[str, int]]:
+        """
+        Insert DataFrame chunks while they are still being produced
+
+        The chunks iterable (e.g. ExcelLoader.iter_chunks) is consumed on the
+        calling thread, so parsing runs there, while a worker thread inserts
+        finished chunks through dataframe_to_table. The two sides are joined
+        by a bounded queue; a failure on either side cancels the other and
+        the insert transaction is rolled back.
+
+        Args:
+            chunks: Iterable of DataFrame chunks
+            table_name: Target table name
+            if_exists: 'append', 'replace', 'fail', 'merge' (upsert via
+                merge_dataframe, requires key_columns) or 'incremental'
+                (skip rows already loaded, via incremental_insert)
+            chunk_size: Number of rows per batch
+            queue_size: Maximum parsed chunks waiting to be inserted
+            key_columns: Key columns for 'merge'
+
+        Returns:
+            Number of rows inserted, or the counts dictionary for 'merge'
+            and 'incremental'
+        """
+        if if_exists == "merge":
+            if not key_columns:
+                raise ValueError("merge requires at least one key column")
+            consume = lambda frames: self.merge_dataframe(frames, table_name, key_columns, chunk_size)
+        elif if_exists == "incremental":
+            consume = lambda frames: self.incremental_insert(frames, table_name, chunk_size)
+        else:
+            consume = lambda frames: self.dataframe_to_table(frames, table_name, if_exists, chunk_size)
+
+        return run_pipelined(
+            chunks,
+            consume,
+            queue_size=queue_size,
+            name=f"insert:{table_name}"
+        )
+
     def execute_query(self, query: str, params: tuple = ()) -> list:
         """Execute a SELECT query"""
         conn = self.get_connection()
@@ -167,8 +1668,33 @@ class DatabaseManager:
         conn = self.get_connection()
         cursor = conn.cursor()
         cursor.execute(query, params)
+        rowcount = cursor.rowcount
+        if rowcount:
+            # Arbitrary SQL: every catalog entry becomes a recount candidate
+            try:
+                cursor.execute(f"UPDATE {quote_identifier(STATS_TABLE)} SET stale = 1")
+            except sqlite3.OperationalError:  # no catalog yet
+                pass
         conn.commit()
-        return cursor.rowcount
+        return rowcount
+
+    def table_schema(self, table_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a table's columns, declared types and indexes from the schema cache
+
+        Reflects committed schema only; code inside an open write
+        transaction should read PRAGMA table_info directly.
+        """
+        return self.schema.table(table_name)
+
+    def versions(self) -> Tuple[int, int]:
+        """
+        Get (schema_version, data_version) for change detection
+
+        Either value differing from an earlier call means the schema or
+        the data changed in between, through this program or another one.
+        """
+        return self.pool.versions()
 
     def table_exists(self, table_name: str) -> bool:
         """Check if table exists in database"""
@@ -186,17 +1712,131 @@ class DatabaseManager:
             return 0
 
         conn = self.get_connection()
+        entry = read_stats(conn, [table_name]).get(table_name)
+        if entry and entry["fresh"]:
+            return entry["row_count"]
+
         cursor = conn.cursor()
-        cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-        return cursor.fetchone()[0]
+        cursor.execute(f"SELECT COUNT(*) FROM {quote_identifier(table_name)}")
+        row_count = cursor.fetchone()[0]
+        self._store_stats(conn, [(table_name, row_count, table_shape(conn, table_name), None, None)])
+        return row_count
+
+    def drop_table(self, table_name: str):
+        """Drop a table with its search index and statistics catalog entry"""
+        conn = self.get_connection()
+        with conn:
+            conn.execute(f"DROP TABLE {quote_identifier(table_name)}")
+            self._drop_search_index(conn.cursor(), table_name)
+            try:
+                conn.execute(f"DELETE FROM {quote_identifier(STATS_TABLE)} WHERE table_name = ?", (table_name,))
+            except sqlite3.OperationalError:  # no catalog yet
+                pass
+        logger.info(f"Dropped table {table_name}")
+
+    def search_index(self, table_name: str) -> Optional[str]:
+        """
+        Get the table's full-text search index, if it is usable
+
+        Returns:
+            Name of the FTS5 index, or None if there is none or it no longer
+            covers the table's columns (see build_search_index)
+        """
+        schema = self.table_schema(table_name)
+        index_name = search_index_name(table_name)
+        index = self.table_schema(index_name)
+        if schema is None or index is None or schema["rowid"] is None:
+            return None
+        return index_name if index["columns"] == schema["columns"] else None
+
+    def build_search_index(self, table_name: str) -> str:
+        """
+        Create (or recreate) a table's FTS5 search index and fill it
+
+        The index is an external-content trigram FTS5 table over the
+        visible columns, so it stores no second copy of the data and can
+        answer substring searches of SEARCH_INDEX_MIN_TERM or more
+        characters. Triggers on the table keep it in step with every later
+        insert, update and delete, whether it comes from an ingest path
+        here or another program, so the index (which also adds to the
+        file's size) is only built on request and removed with
+        drop_search_index. Everything runs in one transaction on a
+        private connection, so this can run on a background thread and
+        searches simply use LIKE until it commits (readers are only
+        unaffected in WAL mode).
+
+        Args:
+            table_name: Table to index
+
+        Returns:
+            Name of the search index
+        """
+        index_name = search_index_name(table_name)
+        start = datetime.now()
+        conn = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT)
+        try:
+            conn.execute(f"PRAGMA cache_size = {BULK_LOAD_PRAGMAS['cache_size']}")
+            with conn:
+                schema = table_schema(conn, table_name)
+                if schema is None:
+                    raise ValueError(f"Table '{table_name}' does not exist")
+                if schema["rowid"] is None:
+                    raise ValueError(f"Table '{table_name}' has no rowid to index")
+
+                cursor = conn.cursor()
+                self._drop_search_index(cursor, table_name)
+
+                table = quote_identifier(table_name)
+                index = quote_identifier(index_name)
+                rowid = schema["rowid"]
+                columns = ", ".join(quote_identifier(col) for col in schema["columns"])
+                new = ", ".join(f"new.{quote_identifier(col)}" for col in schema["columns"])
+                old = ", ".join(f"old.{quote_identifier(col)}" for col in schema["columns"])
+                insert_new = f"INSERT INTO {index} (rowid, {columns}) VALUES (new.{rowid}, {new});"
+                delete_old = f"INSERT INTO {index} ({index}, rowid, {columns}) VALUES ('delete', old.{rowid}, {old});"
+
+                cursor.execute(
+                    f"CREATE VIRTUAL TABLE {index} USING fts5({columns}, "
+                    f"content={quote_identifier(table_name)}, content_rowid={rowid}, tokenize='trigram')"
+                )
+                cursor.execute(
+                    f"CREATE TRIGGER {quote_identifier(index_name + '_ai')} AFTER INSERT ON {table} "
+                    f"BEGIN {insert_new} END"
+                )
+                cursor.execute(
+                    f"CREATE TRIGGER {quote_identifier(index_name + '_ad')} AFTER DELETE ON {table} "
+                    f"BEGIN {delete_old} END"
+                )
+                # Only visible columns, so row hash backfills don't reindex rows
+                cursor.execute(
+                    f"CREATE TRIGGER {quote_identifier(index_name + '_au')} AFTER UPDATE OF {columns} ON {table} "
+                    f"BEGIN {delete_old} {insert_new} END"
+                )
+                cursor.execute(f"INSERT INTO {index} ({index}) VALUES ('rebuild')")
+        finally:
+            conn.close()
+
+        logger.info(f"Built search index for {table_name} in {(datetime.now() - start).total_seconds():.1f} s")
+        return index_name
+
+    def drop_search_index(self, table_name: str):
+        """Remove a table's search index and its triggers"""
+        conn = self.get_connection()
+        with conn:
+            self._drop_search_index(conn.cursor(), table_name)
+
+    def _drop_search_index(self, cursor: sqlite3.Cursor, table_name: str):
+        """Drop a search index and its triggers inside the caller's transaction"""
+        index_name = search_index_name(table_name)
+        for suffix in ("_ai", "_ad", "_au"):
+            cursor.execute(f"DROP TRIGGER IF EXISTS {quote_identifier(index_name + suffix)}")
+        cursor.execute(f"DROP TABLE IF EXISTS {quote_identifier(index_name)}")
 
     def insert_dataframe(self, table_name: str, df: pd.DataFrame, if_exists: str = "append") -> int:
         """Insert DataFrame into table (alias for dataframe_to_table)"""
         # Add uploaded_at timestamp only if table has that column
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(f"PRAGMA table_info({table_name})")
-        columns = [row[1] for row in cursor.fetchall()]
+        schema = self.table_schema(table_name)
+        columns = schema["columns"] if schema else []
 
         if 'uploaded_at' in columns and 'uploaded_at' not in df.columns:
             df = df.copy()
@@ -204,6 +1844,140 @@ class DatabaseManager:
 
         return self.dataframe_to_table(df, table_name, if_exists)
 
+    def ensure_date_key(self, table_name: str, date_column: str) -> str:
+        """
+        Create the YYYYMMDD date key index for a date column if it is missing
+
+        This is the one-time migration for existing tables: SQLite builds the
+        index in one pass and maintains it on every later insert, so range
+        counts, deletes and MIN/MAX lookups through date_key_sql become index
+        range scans. replace_date_window and delete_by_date_range call it
+        lazily, before their own transaction. The build commits on its own,
+        so it is skipped while the writer is inside a caller's transaction
+        (queries then scan the table); call it up front to avoid that.
+
+        Args:
+            table_name: Target table name
+            date_column: Date column name
+
+        Returns:
+            Name of the date key index
+        """
+        index_name = date_key_index_name(table_name, date_column)
+        conn = self.get_connection()
+        if not self._has_date_key(table_name, date_column):
+            if conn.in_transaction:
+                logger.info(
+                    f"Not building date key index on {table_name}.{date_column} "
+                    f"inside an open transaction; the range is matched by a table scan"
+                )
+                return index_name
+            logger.info(f"Building date key index on {table_name}.{date_column}")
+            with conn:
+                conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS {quote_identifier(index_name)} "
+                    f"ON {quote_identifier(table_name)} ({date_key_sql(date_column)})"
+                )
+        return index_name
+
+    def _has_date_key(self, table_name: str, date_column: str) -> bool:
+        """Whether the date key index for a date column exists"""
+        return self.get_connection().execute(
+            "SELECT 1 FROM sqlite_master WHERE type='index' AND name=?",
+            (date_key_index_name(table_name, date_column),)
+        ).fetchone() is not None
+
+    def replace_date_window(
+        self,
+        table_name: str,
+        date_column: str,
+        data: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+        chunk_size: int = 5000
+    ) -> Dict[str, Any]:
+        """
+        Replace the rows in the date window covered by new data, atomically
+
+        The window is the min..max date key of the incoming data. Existing
+        rows in that window are deleted and the new rows inserted in one
+        transaction, so readers see either the old or the new window, never
+        a mix. With chunked input the window grows as chunks arrive and only
+        the newly covered part is deleted each time, so the data is never
+        buffered and no separate COUNT pass is needed (the deleted count
+        comes from changes()). The first call for a column builds its date
+        key index (ensure_date_key) before the transaction starts.
+
+        Args:
+            table_name: Target table name (created if missing)
+            date_column: Date column used to derive the window
+            data: DataFrame, or an iterable of DataFrame chunks
+            chunk_size: Number of rows per insert batch
+
+        Returns:
+            Dictionary with deleted, inserted, min_date and max_date
+        """
+        conn = self.get_connection()
+        table_exists = self.table_exists(table_name)
+        if table_exists:
+            self.ensure_date_key(table_name, date_column)
+
+        key = date_key_sql(date_column)
+        delete_sql = f"DELETE FROM {quote_identifier(table_name)} WHERE {key} BETWEEN ? AND ?"
+        frames = [data] if isinstance(data, pd.DataFrame) else data
+        window = {"min": None, "max": None, "deleted": 0}
+
+        def delete_range(cursor, low, high):
+            if table_exists and low <= high:
+                cursor.execute(delete_sql, (low, high))
+                window["deleted"] += cursor.rowcount
+
+        def widen_window(cursor):
+            # Delete only the part of each chunk's range not already covered;
+            # rows inserted so far all lie inside the covered window
+            for frame in frames:
+                if date_column not in frame.columns:
+                    raise KeyError(f"Date column '{date_column}' not in uploaded data")
+                span = date_key_range(frame[date_column])
+                if span is not None:
+                    low, high = span
+                    if window["min"] is None:
+                        delete_range(cursor, low, high)
+                        window["min"], window["max"] = low, high
+                    else:
+                        delete_range(cursor, low, window["min"] - 1)
+                        delete_range(cursor, window["max"] + 1, high)
+                        window["min"] = min(window["min"], low)
+                        window["max"] = max(window["max"], high)
+                yield frame
+
+        try:
+            if not conn.in_transaction:
+                conn.execute("BEGIN")
+            cursor = conn.cursor()
+            base = self._stats_base(cursor, table_name)
+            inserted = self._insert_frames(cursor, widen_window(cursor), table_name, "append", chunk_size)
+            self._record_write(cursor, table_name, base, inserted - window["deleted"])
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Error replacing date window in {table_name}: {e}")
+            raise
+
+        if not table_exists:
+            self.ensure_date_key(table_name, date_column)
+        self.pool.maybe_checkpoint(conn=self.get_connection())
+
+        result = {
+            "deleted": window["deleted"],
+            "inserted": inserted,
+            "min_date": format_date_key(window["min"]) if window["min"] else None,
+            "max_date": format_date_key(window["max"]) if window["max"] else None,
+        }
+        logger.info(
+            f"Replaced {table_name} window {result['min_date']} ~ {result['max_date']}: "
+            f"{result['deleted']:,} deleted, {result['inserted']:,} inserted"
+        )
+        return result
+
     def delete_by_date_range(
         self,
         table_name: str,
@@ -215,54 +1989,33 @@ class DatabaseManager:
         """
         Delete rows within a date range
 
+        Rows are matched through the indexed YYYYMMDD date key, which covers
+        integer (20250101) and text ('2025-01-01 ...') values alike. The
+        first call for a column builds the index (ensure_date_key) before
+        the delete's transaction starts.
+
         Args:
             table_name: Target table name
             date_column: Date column name
             min_date: Minimum date (YYYYMMDD or YYYY-MM-DD format)
             max_date: Maximum date (YYYYMMDD or YYYY-MM-DD format)
-            date_format: "number" (20250101) or "datetime" (2025-01-01)
+            date_format: "number" (20250101) or "datetime" (2025-01-01); both
+                are matched through the date key
 
         Returns:
             Number of rows deleted
         """
         conn = self.get_connection()
         cursor = conn.cursor()
+        self.ensure_date_key(table_name, date_column)
 
         try:
-            # Convert dates to appropriate format for comparison
-            if date_format == "number":
-                # Remove dashes for number format (2025-01-01 -> 20250101)
-                min_date_val = int(min_date.replace('-', '')[:8])
-                max_date_val = int(max_date.replace('-', '')[:8])
-            else:
-                # Keep datetime format as string
-                min_date_val = min_date[:10] if len(min_date) > 10 else min_date
-                max_date_val = max_date[:10] if len(max_date) > 10 else max_date
-
-            # Count rows to delete (handle mixed type formats)
-            if date_format == "number":
-                # Handle both integer (20250701) and text ('2025-07-01') formats
-                cursor.execute(
-                    f"""SELECT COUNT(*) FROM {table_name}
-                    WHERE CAST(
-                        CASE
-                            WHEN typeof({date_column}) = 'integer' THEN {date_column}
-                            WHEN typeof({date_column}) = 'text' THEN CAST(substr(replace({date_column}, '-', ''), 1, 8) AS INTEGER)
-                        END AS INTEGER
-                    ) >= ? AND CAST(
-                        CASE
-                            WHEN typeof({date_column}) = 'integer' THEN {date_column}
-                            WHEN typeof({date_column}) = 'text' THEN CAST(substr(replace({date_column}, '-', ''), 1, 8) AS INTEGER)
-                        END AS INTEGER
-                    ) <= ?""",
-                    (min_date_val, max_date_val)
-                )
-            else:
-                cursor.execute(
-                    f"SELECT COUNT(*) FROM {table_name} WHERE date({date_column}) >= ? AND date({date_column}) <= ?",
-                    (min_date_val, max_date_val)
-                )
+            where = f"{date_key_sql(date_column)} BETWEEN ? AND ?"
+            params = (to_date_key(min_date), to_date_key(max_date))
+            table = quote_identifier(table_name)
 
+            # Count rows to delete (index range scan)
+            cursor.execute(f"SELECT COUNT(*) FROM {table} WHERE {where}", params)
             rows_to_delete = cursor.fetchone()[0]
 
             if rows_to_delete == 0:
@@ -271,29 +2024,9 @@ class DatabaseManager:
 
             logger.info(f"Deleting {rows_to_delete:,} rows from {table_name} for date range {min_date} ~ {max_date}")
 
-            # Delete rows (handle mixed type formats)
-            if date_format == "number":
-                # Handle both integer (20250701) and text ('2025-07-01') formats
-                cursor.execute(
-                    f"""DELETE FROM {table_name}
-                    WHERE CAST(
-                        CASE
-                            WHEN typeof({date_column}) = 'integer' THEN {date_column}
-                            WHEN typeof({date_column}) = 'text' THEN CAST(substr(replace({date_column}, '-', ''), 1, 8) AS INTEGER)
-                        END AS INTEGER
-                    ) >= ? AND CAST(
-                        CASE
-                            WHEN typeof({date_column}) = 'integer' THEN {date_column}
-                            WHEN typeof({date_column}) = 'text' THEN CAST(substr(replace({date_column}, '-', ''), 1, 8) AS INTEGER)
-                        END AS INTEGER
-                    ) <= ?""",
-                    (min_date_val, max_date_val)
-                )
-            else:
-                cursor.execute(
-                    f"DELETE FROM {table_name} WHERE date({date_column}) >= ? AND date({date_column}) <= ?",
-                    (min_date_val, max_date_val)
-                )
+            base = self._stats_base(cursor, table_name)
+            cursor.execute(f"DELETE FROM {table} WHERE {where}", params)
+            self._record_write(cursor, table_name, base, -rows_to_delete)
 
             conn.commit()
             logger.info(f"Deleted {rows_to_delete:,} rows from {table_name}")
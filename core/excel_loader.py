@@ -3,18 +3,352 @@ Excel file loader with multi-sheet support
 Based on SambioHR5/Data_Uploader/core/data_loader.py
 """
 import pandas as pd
+import hashlib
+import json
 import logging
+import os
+import pickle
+import shutil
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from core.type_inference import apply_dtype_plan, infer_dtypes, plan_dtypes, summarize_report
+from core.xlsx_reader import normalize_header
 
 logger = logging.getLogger(__name__)
 
+# Default number of rows per chunk yielded by ExcelLoader.iter_chunks
+DEFAULT_CHUNK_ROWS = 50000
+
+# Extensions openpyxl can stream in read-only mode
+STREAMABLE_EXTENSIONS = {".xlsx", ".xlsm"}
+
+# Sheet parsing engines: openpyxl via pandas, or the streaming XML parser in core.xlsx_reader
+ENGINES = ("openpyxl", "sax")
+
+# Parsed-sheet cache location (per user, outside the install dir) and size bound
+DEFAULT_CACHE_DIR = Path(
+    os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+) / "Excel-Uploader" / "sheets"
+DEFAULT_CACHE_MAX_BYTES = 2 * 1024 * 1024 * 1024
+
+# Bumped whenever parsed chunks change shape or dtypes, so older entries miss
+CACHE_FORMAT_VERSION = 2
+
+
+class ParseCache:
+    """
+    Content-addressed on-disk cache of parsed sheets
+
+    Workbooks are identified by a SHA-256 of their content plus their size;
+    the (path, size, mtime) of files already hashed is remembered so an
+    unchanged file is not re-hashed. Each sheet is stored as a sequence of
+    pickled DataFrame chunks (numpy blocks serialized as raw buffers), so
+    hits can be replayed chunk by chunk. Entries are evicted least recently
+    used first once the cache exceeds max_bytes.
+
+    Each sheet can be cached in several variants (see ExcelLoader's
+    _cache_variant: engine, whole or chunked reading and chunk size), since
+    each produces different frames. Caching is best effort: the first
+    OSError while writing the cache disables it and loading carries on.
+    """
+
+    INDEX_FILE = "index.json"
+
+    def __init__(self, cache_dir: Path = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_CACHE_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.enabled = True
+        self._lock = threading.RLock()
+        self._index = {"files": {}, "entries": {}}
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            self._disable(e)
+            return
+        self._index = self._load_index()
+
+    def _disable(self, error: OSError):
+        """Stop using the cache after a filesystem error"""
+        if self.enabled:
+            logger.warning(f"Parse cache disabled ({self.cache_dir}): {error}")
+        self.enabled = False
+
+    def _load_index(self) -> dict:
+        """Load the cache index, starting fresh if it is missing or corrupt"""
+        try:
+            with open(self.cache_dir / self.INDEX_FILE, "r") as f:
+                index = json.load(f)
+            if "files" in index and "entries" in index:
+                return index
+        except (OSError, ValueError):
+            pass
+        return {"files": {}, "entries": {}}
+
+    def _save_index(self):
+        """Write the index atomically"""
+        if not self.enabled:
+            return
+        tmp_path = self.cache_dir / (self.INDEX_FILE + ".tmp")
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(self._index, f)
+            os.replace(tmp_path, self.cache_dir / self.INDEX_FILE)
+        except OSError as e:
+            self._disable(e)
+
+    def file_digest(self, file_path: Path, compute: bool = True) -> Optional[str]:
+        """
+        Get the content digest of a workbook
+
+        Args:
+            file_path: Path to the workbook
+            compute: Hash the file if its (size, mtime) is not already known
+
+        Returns:
+            Digest string, or None if unknown and compute is False
+        """
+        file_path = Path(file_path)
+        stat = file_path.stat()
+        key = str(file_path.resolve())
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            known = self._index["files"].get(key)
+            if known and known["size"] == stat.st_size and known["mtime_ns"] == stat.st_mtime_ns:
+                return known["digest"]
+        if not compute:
+            return None
+
+        sha = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                sha.update(block)
+        digest = f"{sha.hexdigest()}-{stat.st_size}"
+
+        with self._lock:
+            self._index["files"][key] = {
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "digest": digest,
+            }
+            self._save_index()
+        return digest
+
+    @staticmethod
+    def _entry_id(digest: str, sheet_name: str, variant: str) -> str:
+        sheet_key = hashlib.sha1(str(sheet_name).encode("utf-8")).hexdigest()[:16]
+        return f"{digest[:32]}-{sheet_key}-{variant}"
+
+    def get_entry(self, digest: str, sheet_name: str, variant: str) -> Optional[dict]:
+        """Get metadata (rows, columns, bytes) of a cached sheet variant, or None"""
+        with self._lock:
+            return self._index["entries"].get(self._entry_id(digest, sheet_name, variant))
+
+    def find_entry(self, digest: str, sheet_name: str) -> Optional[dict]:
+        """Get metadata of any cached variant of a sheet, or None"""
+        with self._lock:
+            return next((
+                entry for entry in self._index["entries"].values()
+                if entry["digest"] == digest and entry["sheet"] == str(sheet_name)
+            ), None)
+
+    def iter_cached(self, digest: str, sheet_name: str, variant: str) -> Optional[Iterator[pd.DataFrame]]:
+        """
+        Replay a cached sheet chunk by chunk
+
+        Returns:
+            Iterator of DataFrame chunks, or None on a cache miss
+        """
+        entry_id = self._entry_id(digest, sheet_name, variant)
+        with self._lock:
+            entry = self._index["entries"].get(entry_id)
+            if entry is None:
+                return None
+            if not (self.cache_dir / entry_id).is_dir():
+                # Removed behind our back
+                del self._index["entries"][entry_id]
+                return None
+            self.hits += 1
+            entry["last_used"] = time.time()
+            self._save_index()
+
+        def replay():
+            for i in range(entry["chunks"]):
+                with open(self.cache_dir / entry_id / f"{i:05d}.pkl", "rb") as f:
+                    yield pickle.load(f)
+
+        return replay()
+
+    def load(self, digest: str, sheet_name: str, variant: str) -> Optional[pd.DataFrame]:
+        """Load a cached sheet as one DataFrame, or None on a cache miss"""
+        chunks = self.iter_cached(digest, sheet_name, variant)
+        if chunks is None:
+            return None
+        frames = list(chunks)
+        if len(frames) == 1:
+            return frames[0]
+        return pd.concat(frames, ignore_index=True)
+
+    def store_chunks(
+        self,
+        digest: str,
+        sheet_name: str,
+        chunks: Iterable[pd.DataFrame],
+        variant: str
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Pass chunks through while writing them to the cache
+
+        The entry is only registered once the input is exhausted; if the
+        consumer stops early or an error occurs, the partial entry is removed.
+        A filesystem error while writing disables the cache, but the chunks
+        are still passed through.
+        """
+        entry_id = self._entry_id(digest, sheet_name, variant)
+        entry_dir = self.cache_dir / entry_id
+        with self._lock:
+            self.misses += 1
+
+        writing = self.enabled
+        if writing:
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            try:
+                entry_dir.mkdir(parents=True)
+            except OSError as e:
+                self._disable(e)
+                writing = False
+
+        count = rows = size = 0
+        columns = None
+        complete = False
+        try:
+            for chunk in chunks:
+                if writing:
+                    chunk_path = entry_dir / f"{count:05d}.pkl"
+                    try:
+                        with open(chunk_path, "wb") as f:
+                            pickle.dump(chunk, f, protocol=pickle.HIGHEST_PROTOCOL)
+                        size += chunk_path.stat().st_size
+                    except OSError as e:
+                        self._disable(e)
+                        writing = False
+                        shutil.rmtree(entry_dir, ignore_errors=True)
+                rows += len(chunk)
+                count += 1
+                if columns is None:
+                    columns = [str(col) for col in chunk.columns]
+                yield chunk
+            complete = True
+        finally:
+            if writing and not complete:
+                shutil.rmtree(entry_dir, ignore_errors=True)
+
+        if not writing:
+            return
+        with self._lock:
+            self._index["entries"][entry_id] = {
+                "digest": digest,
+                "sheet": str(sheet_name),
+                "chunks": count,
+                "rows": rows,
+                "columns": columns or [],
+                "bytes": size,
+                "last_used": time.time(),
+            }
+            self._evict(keep=entry_id)
+            self._save_index()
+
+    def put(self, digest: str, sheet_name: str, df: pd.DataFrame, variant: str):
+        """Store a whole parsed sheet"""
+        for _ in self.store_chunks(digest, sheet_name, [df], variant):
+            pass
+
+    def _evict(self, keep: Optional[str] = None):
+        """Drop least recently used entries until the cache fits max_bytes"""
+        entries = self._index["entries"]
+        total = sum(entry["bytes"] for entry in entries.values())
+        # The entry just written goes last, so it only goes if it alone is too big
+        order = sorted((e for e in entries if e != keep), key=lambda e: entries[e]["last_used"])
+        if keep in entries:
+            order.append(keep)
+
+        for entry_id in order:
+            if total <= self.max_bytes:
+                break
+            total -= entries[entry_id]["bytes"]
+            shutil.rmtree(self.cache_dir / entry_id, ignore_errors=True)
+            del entries[entry_id]
+            logger.info(f"Parse cache: evicted {entry_id}")
+
+        # Forget hashed files that no longer have any cached sheets
+        live_digests = {entry["digest"] for entry in entries.values()}
+        self._index["files"] = {
+            key: known for key, known in self._index["files"].items()
+            if known["digest"] in live_digests
+        }
+
+    def clear(self):
+        """Remove every cached entry"""
+        with self._lock:
+            for entry_id in list(self._index["entries"]):
+                shutil.rmtree(self.cache_dir / entry_id, ignore_errors=True)
+            self._index = {"files": {}, "entries": {}}
+            self._save_index()
+
+    def stats(self) -> Dict[str, int]:
+        """Cache counters and current size"""
+        with self._lock:
+            return {
+                "entries": len(self._index["entries"]),
+                "bytes": sum(entry["bytes"] for entry in self._index["entries"].values()),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_default_cache = None
+
+
+def get_parse_cache() -> ParseCache:
+    """Get the shared parse cache in DEFAULT_CACHE_DIR"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ParseCache()
+    return _default_cache
+
 
 class ExcelLoader:
     """Excel file loader with automatic sheet merging"""
 
-    def __init__(self):
+    def __init__(
+        self,
+        max_workers: Optional[int] = 1,
+        cache: Optional[ParseCache] = None,
+        engine: str = "openpyxl"
+    ):
+        """
+        Args:
+            max_workers: Worker processes used to parse multiple sheets.
+                1 parses sequentially; None uses one process per CPU core.
+            cache: Parse cache for previously seen workbooks (None disables caching)
+            engine: 'openpyxl' or 'sax' (streaming XML parser, .xlsx/.xlsm only;
+                other formats always use pandas)
+        """
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine '{engine}', expected one of {ENGINES}")
+
         self.logger = logger
+        self.engine = engine
+        self.max_workers = max_workers
+        self.cache = cache
+        self.last_type_report = []
 
     def load_excel_file(self, file_path: Path, auto_merge_sheets: bool = True) -> pd.DataFrame:
         """
@@ -33,15 +367,13 @@ class ExcelLoader:
 
         try:
             # Check sheets in file
-            excel_file = pd.ExcelFile(file_path)
-            sheet_names = excel_file.sheet_names
+            sheet_names = self.probe_workbook(file_path)["sheet_names"]
             self.logger.info(f"Sheets found: {sheet_names}")
 
             if len(sheet_names) == 1:
                 # Single sheet mode
                 self.logger.info("Single sheet mode")
-                df = pd.read_excel(file_path, sheet_name=0)
-                return self._optimize_datatypes(df)
+                return self._load_sheet(file_path, sheet_names[0])
 
             elif auto_merge_sheets and len(sheet_names) > 1:
                 # Multi-sheet merge mode
@@ -50,8 +382,7 @@ class ExcelLoader:
 
             else:
                 # Load only first sheet
-                df = pd.read_excel(file_path, sheet_name=0)
-                return self._optimize_datatypes(df)
+                return self._load_sheet(file_path, sheet_names[0])
 
         except Exception as e:
             self.logger.error(f"Failed to load Excel file: {e}")
@@ -73,20 +404,15 @@ class ExcelLoader:
         dfs = []
         original_total = 0
 
-        for i, sheet_name in enumerate(sheet_names):
-            self.logger.info(f"[{i+1}/{len(sheet_names)}] Loading sheet: {sheet_name}")
-
-            try:
-                df = pd.read_excel(file_path, sheet_name=sheet_name)
-                df = self._optimize_datatypes(df)
-                dfs.append(df)
-                original_total += len(df)
-                self.logger.info(f"  {sheet_name}: {len(df):,} rows loaded")
-
-            except Exception as e:
-                self.logger.error(f"Failed to load sheet {sheet_name}: {e}")
+        for sheet_name, df, error in self._read_sheets(file_path, sheet_names):
+            if error is not None:
+                self.logger.error(f"Failed to load sheet {sheet_name}: {error}")
                 continue
 
+            dfs.append(df)
+            original_total += len(df)
+            self.logger.info(f"  {sheet_name}: {len(df):,} rows loaded")
+
         if not dfs:
             raise ValueError("No sheets could be loaded")
 
@@ -97,30 +423,335 @@ class ExcelLoader:
         self.logger.info(f"Merge complete: {len(combined_df):,} rows (original: {original_total:,})")
         return combined_df
 
+    def _load_sheet(self, file_path: Path, sheet_name: str) -> pd.DataFrame:
+        """Load and optimize a single sheet, raising if it cannot be read"""
+        _, df, error = next(self._read_sheets(file_path, [sheet_name]))
+        if error is not None:
+            raise error
+        return df
+
+    def _read_sheets(
+        self,
+        file_path: Path,
+        sheet_names: List[str],
+        optimize: bool = True
+    ) -> Iterator[Tuple[str, Optional[pd.DataFrame], Optional[Exception]]]:
+        """
+        Read sheets from the parse cache, parsing only the ones it misses
+
+        Yields the same (sheet_name, DataFrame or None, exception or None)
+        tuples as _parse_sheets, in the original sheet order.
+        """
+        if self.cache is None or not self.cache.enabled:
+            yield from self._parse_sheets(file_path, sheet_names, optimize)
+            return
+
+        digest = self.cache.file_digest(file_path)
+        variant = self._cache_variant(optimize)
+        cached = {
+            name for name in sheet_names
+            if self.cache.get_entry(digest, name, variant) is not None
+        }
+        parsed = self._parse_sheets(file_path, [n for n in sheet_names if n not in cached], optimize)
+
+        for sheet_name in sheet_names:
+            if sheet_name in cached:
+                df = self.cache.load(digest, sheet_name, variant)
+                if df is not None:
+                    self.logger.info(f"  {sheet_name}: loaded from parse cache")
+                    yield sheet_name, df, None
+                    continue
+                # Evicted since the lookup above
+                df, error = None, None
+                try:
+                    df = _parse_sheet(file_path, sheet_name, optimize, self.engine)
+                except Exception as e:
+                    error = e
+            else:
+                _, df, error = next(parsed)
+
+            if error is None:
+                self.cache.put(digest, sheet_name, df, variant)
+            yield sheet_name, df, error
+
+    def _cache_variant(self, optimize: bool, chunk_rows: Optional[int] = None) -> str:
+        """
+        Name the parse cache variant for how a sheet is read
+
+        Args:
+            optimize: Whether dtypes are optimized
+            chunk_rows: Rows per chunk when streaming, None for whole-sheet reads
+
+        Returns:
+            Variant string covering the engine, mode, chunk size and cache format
+        """
+        mode = "whole" if chunk_rows is None else f"c{chunk_rows}"
+        return f"{'o' if optimize else 'r'}-{self.engine}-{mode}-v{CACHE_FORMAT_VERSION}"
+
+    def _parse_sheets(
+        self,
+        file_path: Path,
+        sheet_names: List[str],
+        optimize: bool = True
+    ) -> Iterator[Tuple[str, Optional[pd.DataFrame], Optional[Exception]]]:
+        """
+        Parse sheets, in parallel when max_workers allows it
+
+        Results are yielded in the original sheet order. A sheet that fails
+        to parse is yielded with its exception instead of a DataFrame, so
+        callers decide whether to skip it or abort.
+
+        Args:
+            file_path: Path to Excel file
+            sheet_names: Sheets to parse
+            optimize: Apply _optimize_datatypes to each sheet
+
+        Yields:
+            (sheet_name, DataFrame or None, exception or None)
+        """
+        workers = self.max_workers or os.cpu_count() or 1
+        workers = min(workers, len(sheet_names))
+
+        if workers <= 1:
+            for i, sheet_name in enumerate(sheet_names):
+                self.logger.info(f"[{i+1}/{len(sheet_names)}] Loading sheet: {sheet_name}")
+                try:
+                    df = _parse_sheet(file_path, sheet_name, False, self.engine)
+                    if optimize:
+                        df = self._optimize_datatypes(df)
+                    yield sheet_name, df, None
+                except Exception as e:
+                    yield sheet_name, None, e
+            return
+
+        self.logger.info(f"Parsing {len(sheet_names)} sheets with {workers} worker processes")
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_parse_sheet, str(file_path), sheet_name, optimize, self.engine)
+                for sheet_name in sheet_names
+            ]
+            for sheet_name, future in zip(sheet_names, futures):
+                try:
+                    # The executor already pickles results for the trip back
+                    yield sheet_name, future.result(), None
+                except Exception as e:
+                    yield sheet_name, None, e
+
     def _optimize_datatypes(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Optimize DataFrame datatypes to reduce memory usage
 
+        Each column is converted to the narrowest safe dtype (downcast
+        ints/floats, nullable integers, datetimes, booleans, categoricals).
+        The per-column choices are kept in self.last_type_report.
+
         Args:
             df: Input DataFrame
 
         Returns:
             Optimized DataFrame
         """
-        for col in df.columns:
-            if df[col].dtype == 'object':
-                try:
-                    # Try to convert to numeric
-                    df[col] = pd.to_numeric(df[col], errors='ignore')
-                except:
-                    pass
-            elif df[col].dtype == 'int64':
-                # Downcast int64 to int32 if possible
-                if df[col].min() >= -2147483648 and df[col].max() <= 2147483647:
-                    df[col] = df[col].astype('int32')
-
+        df, report = infer_dtypes(df)
+        self.last_type_report = report
+        self.logger.debug(f"Type inference: {summarize_report(report)}")
         return df
 
+    def iter_chunks(
+        self,
+        file_path: Path,
+        sheet_name: Union[str, int] = 0,
+        chunk_rows: int = DEFAULT_CHUNK_ROWS
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Stream a sheet as typed DataFrame chunks
+
+        Rows are pulled through openpyxl's read-only row iterator, so peak
+        memory depends on chunk_rows rather than on the size of the sheet.
+        Column dtypes are inferred from the first chunk and applied to all
+        of them; a chunk whose values don't fit gets that column as text.
+
+        Args:
+            file_path: Path to Excel file
+            sheet_name: Sheet name or zero-based sheet index
+            chunk_rows: Maximum number of rows per yielded DataFrame
+
+        Yields:
+            DataFrame chunks with the sheet's header row as columns
+        """
+        file_path = Path(file_path)
+        if chunk_rows <= 0:
+            raise ValueError("chunk_rows must be positive")
+
+        if self.cache is None or not self.cache.enabled:
+            yield from self._stream_chunks(file_path, sheet_name, chunk_rows)
+            return
+
+        if isinstance(sheet_name, int):
+            sheet_name = self.probe_workbook(file_path)["sheet_names"][sheet_name]
+
+        digest = self.cache.file_digest(file_path)
+        variant = self._cache_variant(True, chunk_rows)
+        cached = self.cache.iter_cached(digest, sheet_name, variant)
+        if cached is None:
+            yield from self.cache.store_chunks(
+                digest, sheet_name, self._stream_chunks(file_path, sheet_name, chunk_rows), variant
+            )
+            return
+
+        self.logger.info(f"Streaming {sheet_name} from parse cache")
+        for chunk in cached:
+            for start in range(0, len(chunk), chunk_rows):
+                yield chunk.iloc[start:start + chunk_rows].reset_index(drop=True)
+
+    def _stream_chunks(
+        self,
+        file_path: Path,
+        sheet_name: Union[str, int],
+        chunk_rows: int
+    ) -> Iterator[pd.DataFrame]:
+        """Stream a sheet from the workbook itself (see iter_chunks)"""
+        if file_path.suffix.lower() not in STREAMABLE_EXTENSIONS:
+            # Legacy formats (.xls) have no streaming reader; slice a full read
+            self.logger.info(f"Streaming not supported for {file_path.suffix}, reading whole sheet")
+            df = self._optimize_datatypes(pd.read_excel(file_path, sheet_name=sheet_name))
+            for start in range(0, len(df), chunk_rows):
+                yield df.iloc[start:start + chunk_rows].reset_index(drop=True)
+            return
+
+        if self.engine == "sax":
+            from core.xlsx_reader import iter_sheet_frames
+
+            rows_read = 0
+            frames = iter_sheet_frames(file_path, sheet_name, chunk_rows, skip_blank_rows=True,
+                                       match_read_excel=False)
+            for chunk in self._typed_chunks(frames):
+                rows_read += len(chunk)
+                yield chunk
+            self.logger.info(f"Streaming complete: {sheet_name} ({rows_read:,} rows)")
+            return
+
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            if isinstance(sheet_name, int):
+                worksheet = workbook.worksheets[sheet_name]
+            else:
+                worksheet = workbook[sheet_name]
+
+            rows = worksheet.iter_rows(values_only=True)
+            header_row = next(rows, None)
+            if header_row is None:
+                return
+
+            columns = self._normalize_header(header_row)
+            rows_read = 0
+
+            for chunk in self._typed_chunks(self._row_frames(rows, columns, chunk_rows)):
+                rows_read += len(chunk)
+                yield chunk
+                self.logger.info(f"  {worksheet.title}: {rows_read:,} rows streamed")
+
+            self.logger.info(f"Streaming complete: {worksheet.title} ({rows_read:,} rows)")
+
+        finally:
+            workbook.close()
+
+    @staticmethod
+    def _row_frames(rows: Iterator[tuple], columns: List, chunk_rows: int) -> Iterator[pd.DataFrame]:
+        """Group openpyxl value rows into untyped DataFrames, skipping blank rows"""
+        width = len(columns)
+        buffer = []
+        for row in rows:
+            if all(value is None for value in row):
+                continue
+            if len(row) != width:
+                row = (tuple(row) + (None,) * width)[:width]
+            buffer.append(row)
+
+            if len(buffer) >= chunk_rows:
+                yield pd.DataFrame.from_records(buffer, columns=columns)
+                buffer = []
+
+        if buffer:
+            yield pd.DataFrame.from_records(buffer, columns=columns)
+
+    def _typed_chunks(self, frames: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """
+        Give every chunk of a sheet the same dtypes
+
+        The dtype plan is inferred once from the first chunk (see
+        type_inference.plan_dtypes) and applied to every chunk, so the table
+        created from the first chunk matches the rest. A column whose values
+        don't fit the plan in some chunk is passed as text for that chunk.
+        """
+        plan = None
+        for frame in frames:
+            if plan is None:
+                plan = plan_dtypes(frame)
+                self.logger.debug(f"Chunk dtype plan: {plan}")
+            frame, fallbacks = apply_dtype_plan(frame, plan)
+            if fallbacks:
+                self.logger.warning(f"Values not matching the first chunk's types, kept as text: {fallbacks}")
+            yield frame
+
+    @staticmethod
+    def _normalize_header(header_row: tuple) -> List:
+        """Build column names the same way pd.read_excel does"""
+        return normalize_header(header_row)
+
+    def probe_workbook(self, file_path: Path) -> dict:
+        """
+        Read workbook metadata without materializing any sheet data
+
+        For .xlsx files only the workbook manifest, each sheet's dimension
+        and header row are read, so this returns in milliseconds even for
+        very large workbooks. Row and column counts come from the sheet's
+        recorded dimension and are approximate.
+
+        Args:
+            file_path: Path to Excel file
+
+        Returns:
+            Dictionary with file information and per-sheet metadata
+        """
+        file_path = Path(file_path)
+
+        if file_path.suffix.lower() in STREAMABLE_EXTENSIONS:
+            from core.xlsx_reader import probe_workbook
+
+            sheets = [
+                {
+                    "name": sheet["name"],
+                    "hidden": sheet["state"] != "visible",
+                    "row_count": max(sheet["rows"] - 1, 0) if sheet["rows"] else None,
+                    "column_count": sheet["columns"],
+                    "columns": self._normalize_header(sheet["header"]),
+                }
+                for sheet in probe_workbook(file_path)
+            ]
+        else:
+            # Legacy formats: sheet names come from the workbook, headers need a read
+            excel_file = pd.ExcelFile(file_path)
+            sheets = []
+            for sheet_name in excel_file.sheet_names:
+                header_df = excel_file.parse(sheet_name, nrows=0)
+                sheets.append({
+                    "name": sheet_name,
+                    "hidden": False,
+                    "row_count": None,
+                    "column_count": len(header_df.columns),
+                    "columns": list(header_df.columns),
+                })
+
+        return {
+            "file_name": file_path.name,
+            "file_size_mb": file_path.stat().st_size / (1024 * 1024),
+            "sheet_count": len(sheets),
+            "sheet_names": [sheet["name"] for sheet in sheets],
+            "sheets": sheets,
+        }
+
     def get_excel_info(self, file_path: Path) -> dict:
         """
         Get basic information about an Excel file without loading all data
@@ -132,19 +763,26 @@ class ExcelLoader:
             Dictionary with file information
         """
         try:
-            excel_file = pd.ExcelFile(file_path)
-            sheet_names = excel_file.sheet_names
+            info = self.probe_workbook(file_path)
 
-            # Get first few rows from first sheet for column detection
-            sample_df = pd.read_excel(file_path, sheet_name=0, nrows=5)
+            # Sheets already in the parse cache have exact row counts
+            digest = self.cache.file_digest(file_path, compute=False) if self.cache else None
+            for sheet in info["sheets"]:
+                entry = self.cache.find_entry(digest, sheet["name"]) if digest else None
+                sheet["cached"] = entry is not None
+                if entry is not None:
+                    sheet["row_count"] = entry["rows"]
+
+            first_sheet = info["sheets"][0] if info["sheets"] else {}
 
             return {
-                "file_name": file_path.name,
-                "file_size_mb": file_path.stat().st_size / (1024 * 1024),
-                "sheet_count": len(sheet_names),
-                "sheet_names": sheet_names,
-                "sample_columns": list(sample_df.columns),
-                "sample_row_count": len(sample_df)
+                "file_name": info["file_name"],
+                "file_size_mb": info["file_size_mb"],
+                "sheet_count": info["sheet_count"],
+                "sheet_names": info["sheet_names"],
+                "sample_columns": first_sheet.get("columns", []),
+                "sample_row_count": min(first_sheet.get("row_count") or 0, 5),
+                "sheets": info["sheets"]
             }
 
         except Exception as e:
@@ -154,14 +792,27 @@ class ExcelLoader:
             }
 
 
+def _parse_sheet(file_path, sheet_name, optimize: bool = True, engine: str = "openpyxl") -> pd.DataFrame:
+    """Read one sheet (runs in worker processes, so kept at module level)"""
+    if engine == "sax" and Path(file_path).suffix.lower() in STREAMABLE_EXTENSIONS:
+        from core.xlsx_reader import iter_sheet_frames
+        df = next(iter_sheet_frames(file_path, sheet_name))
+    else:
+        df = pd.read_excel(file_path, sheet_name=sheet_name)
+    if optimize:
+        df = ExcelLoader()._optimize_datatypes(df)
+    return df
+
+
 # Convenience function for simple usage
-def load_excel_file(file_path, auto_merge_sheets=False):
+def load_excel_file(file_path, auto_merge_sheets=False, max_workers=1):
     """
     Load Excel file and return dictionary of DataFrames (one per sheet)
 
     Args:
         file_path: Path to Excel file
         auto_merge_sheets: If True, return single merged DataFrame instead of dict
+        max_workers: Worker processes for parsing sheets (None = one per CPU core)
 
     Returns:
         Dictionary of {sheet_name: DataFrame} or single DataFrame if auto_merge_sheets=True
@@ -170,15 +821,16 @@ def load_excel_file(file_path, auto_merge_sheets=False):
 
     excel_file = pd.ExcelFile(file_path)
     sheet_names = excel_file.sheet_names
+    loader = ExcelLoader(max_workers=max_workers)
 
     if auto_merge_sheets and len(sheet_names) > 1:
         # Merge all sheets
-        loader = ExcelLoader()
         return {"merged": loader.load_excel_file(Path(file_path), auto_merge_sheets=True)}
     else:
         # Return dict of all sheets
         sheets_data = {}
-        for sheet_name in sheet_names:
-            df = pd.read_excel(file_path, sheet_name=sheet_name)
+        for sheet_name, df, error in loader._read_sheets(file_path, sheet_names, optimize=False):
+            if error is not None:
+                raise error
             sheets_data[sheet_name] = df
         return sheets_data
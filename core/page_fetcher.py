@@ -0,0 +1,176 @@
+"""
+Background page fetching for the table browser
+Runs page queries on a worker thread, keeps recently viewed pages in an LRU
+cache and prefetches neighbouring pages while the current one is on screen
+"""
+import queue
+import threading
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Pages kept in the LRU cache
+DEFAULT_MAX_PAGES = 64
+
+
+class PageFetcher:
+    """
+    Worker thread plus LRU cache for page queries
+
+    Pages are identified by a hashable key that must change whenever the
+    page's contents could (e.g. table, search, sort, data version and page
+    number), so cached pages never need explicit invalidation. A request
+    replaces any earlier request still waiting, and only the page most
+    recently requested is delivered; results for pages the user has
+    already left are cached but not delivered. Prefetches run after
+    requests and are never delivered.
+
+    Results are collected with results() rather than through callbacks,
+    so UI code can poll them on its own thread.
+    """
+
+    def __init__(self, max_pages: int = DEFAULT_MAX_PAGES):
+        self.max_pages = max_pages
+        self._cache = OrderedDict()
+        self._jobs = []
+        self._queued = set()
+        self._running = None
+        self._wanted = None
+        self._results = queue.Queue()
+        self._cond = threading.Condition()
+        self._closed = False
+        self.counters = {"hits": 0, "misses": 0, "fetched": 0, "prefetched": 0, "discarded": 0}
+        self._worker = threading.Thread(target=self._run, name="page-fetcher", daemon=True)
+        self._worker.start()
+
+    def get(self, key: Hashable) -> Optional[list]:
+        """
+        Get a cached page, counting a hit or a miss
+
+        Returns:
+            The page's rows, or None if it isn't cached
+        """
+        with self._cond:
+            rows = self._cache.get(key)
+            if rows is None:
+                self.counters["misses"] += 1
+            else:
+                self._cache.move_to_end(key)
+                self.counters["hits"] += 1
+            return rows
+
+    def peek(self, key: Hashable) -> Optional[list]:
+        """Get a cached page without counting it or marking it recently used (safe from any thread)"""
+        with self._cond:
+            return self._cache.get(key)
+
+    def request(self, key: Hashable, job: Callable[[], Any]):
+        """
+        Fetch a page the user is waiting for
+
+        Args:
+            key: Page key
+            job: Called on the worker thread; returns the page's rows
+        """
+        with self._cond:
+            self._wanted = key
+            # Requests for pages the user has since left are dropped unrun
+            kept = []
+            for entry in self._jobs:
+                if entry[2] or entry[0] == key:
+                    kept.append(entry)
+                else:
+                    self._queued.discard(entry[0])
+                    self.counters["discarded"] += 1
+            self._jobs = kept
+
+            if key in self._cache:
+                self._wanted = None
+                self._results.put((key, self._cache[key], None))
+            elif key == self._running:
+                pass  # already being fetched (e.g. by a prefetch); delivered when it finishes
+            elif key in self._queued:
+                # Promote a queued prefetch to the front
+                entry = next(entry for entry in self._jobs if entry[0] == key)
+                self._jobs.remove(entry)
+                self._jobs.insert(0, (key, entry[1], False))
+            else:
+                self._jobs.insert(0, (key, job, False))
+                self._queued.add(key)
+            self._cond.notify()
+
+    def prefetch(self, key: Hashable, job: Callable[[], Any]):
+        """Fetch a page into the cache once requests are done, unless it is cached or queued"""
+        with self._cond:
+            if key in self._cache or key in self._queued or key == self._running:
+                return
+            self._jobs.append((key, job, True))
+            self._queued.add(key)
+            self._cond.notify()
+
+    def results(self) -> List[Tuple[Hashable, Any, Optional[Exception]]]:
+        """
+        Collect delivered pages
+
+        Returns:
+            List of (key, rows, error) for requested pages that finished
+        """
+        delivered = []
+        while True:
+            try:
+                delivered.append(self._results.get_nowait())
+            except queue.Empty:
+                return delivered
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache and fetch counters
+
+        Returns:
+            Dictionary with hits, misses, fetched, prefetched, discarded and
+            the number of cached pages
+        """
+        with self._cond:
+            return {**self.counters, "cached": len(self._cache)}
+
+    def close(self):
+        """Stop the worker; queued jobs are dropped"""
+        with self._cond:
+            self._closed = True
+            self._jobs = []
+            self._queued.clear()
+            self._cond.notify()
+        logger.debug(f"Page fetcher closed: {self.stats()}")
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._jobs and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                key, job, prefetch = self._jobs.pop(0)
+                self._queued.discard(key)
+                self._running = key
+
+            try:
+                rows, error = job(), None
+            except Exception as e:
+                rows, error = None, e
+                logger.warning(f"Page fetch failed: {e}")
+
+            with self._cond:
+                self._running = None
+                self.counters["prefetched" if prefetch else "fetched"] += 1
+                if rows is not None:
+                    self._cache[key] = rows
+                    self._cache.move_to_end(key)
+                    while len(self._cache) > self.max_pages:
+                        self._cache.popitem(last=False)
+                if key == self._wanted:
+                    self._wanted = None
+                    self._results.put((key, rows, error))
+                elif not prefetch:
+                    self.counters["discarded"] += 1
@@ -0,0 +1,127 @@
+"""
+Bounded producer/consumer pipeline
+Overlaps CPU-bound chunk production (parsing) with I/O-bound consumption (inserts)
+"""
+import queue
+import threading
+import logging
+import time
+from typing import Callable, Iterable, Iterator, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Default number of chunks that may wait between producer and consumer
+DEFAULT_QUEUE_SIZE = 4
+
+# How often a blocked side re-checks whether the other side has failed
+_POLL_SECONDS = 0.1
+
+
+class PipelineCancelled(Exception):
+    """Raised on one side of the pipeline when the other side failed"""
+
+
+class _Done:
+    """End-of-stream marker"""
+
+
+class _Failed:
+    """Producer failure marker"""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def run_pipelined(
+    items: Iterable,
+    consume: Callable[[Iterable], T],
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    name: str = "pipeline"
+) -> T:
+    """
+    Produce items on the calling thread while a worker thread consumes them
+
+    The queue bound applies backpressure: the producer blocks once
+    queue_size items are waiting, which also caps memory. If the producer
+    raises, the consumer's iterator raises PipelineCancelled (so e.g. an
+    insert transaction rolls back) and the producer's error is re-raised.
+    If the consumer raises, the producer stops pulling items and the
+    consumer's error is re-raised.
+
+    Args:
+        items: Producer iterable (iterated on the calling thread)
+        consume: Function that consumes an iterable (runs on the worker thread)
+        queue_size: Maximum number of items waiting between the two sides
+        name: Label used for the worker thread and log messages
+
+    Returns:
+        Whatever consume returns
+    """
+    if queue_size <= 0:
+        raise ValueError("queue_size must be positive")
+
+    buffer = queue.Queue(maxsize=queue_size)
+    consumer_stopped = threading.Event()
+    outcome = {}
+    waits = {"producer": 0.0, "consumer": 0.0}
+
+    def drain() -> Iterator:
+        while True:
+            start = time.perf_counter()
+            item = buffer.get()
+            waits["consumer"] += time.perf_counter() - start
+            if isinstance(item, _Done):
+                return
+            if isinstance(item, _Failed):
+                raise PipelineCancelled(f"{name}: producer failed: {item.error}") from item.error
+            yield item
+
+    def worker():
+        try:
+            outcome["value"] = consume(drain())
+        except BaseException as e:
+            outcome["error"] = e
+        finally:
+            consumer_stopped.set()
+
+    def put(item) -> bool:
+        """Queue an item; False if the consumer has stopped"""
+        start = time.perf_counter()
+        try:
+            while not consumer_stopped.is_set():
+                try:
+                    buffer.put(item, timeout=_POLL_SECONDS)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        finally:
+            waits["producer"] += time.perf_counter() - start
+
+    thread = threading.Thread(target=worker, name=f"{name}-consumer", daemon=True)
+    thread.start()
+
+    try:
+        for item in items:
+            if not put(item):
+                break
+        put(_Done())
+    except BaseException as e:
+        put(_Failed(e))
+        thread.join()
+        raise
+    finally:
+        close = getattr(items, "close", None)
+        if close is not None:
+            close()
+
+    thread.join()
+    logger.info(
+        f"{name}: producer waited {waits['producer']:.2f}s, consumer waited {waits['consumer']:.2f}s"
+    )
+
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome.get("value")
@@ -0,0 +1,671 @@
+"""
+Queries behind the table browser
+Keyset (seek) pagination over (sort column, rowid), so the next or previous
+page costs the same however deep the user has paged
+"""
+import csv
+import json
+import sqlite3
+from datetime import date, time, timedelta
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from core.connection_pool import ConnectionPool
+from core.db_manager import SEARCH_INDEX_MIN_TERM, format_date_key, quote_identifier, to_date_key
+
+logger = logging.getLogger(__name__)
+
+# Page fetch directions relative to a key
+DIRECTIONS = ("from", "next", "prev")
+
+# Rowids covered by each step of a progressive count, and the most steps one takes
+COUNT_CHUNK_ROWS = 100000
+MAX_COUNT_CHUNKS = 200
+
+# Column filter operators; each compiles to a predicate an index on the column can answer
+FILTER_OPERATORS = ("=", "<", "<=", ">", ">=", "between", "in", "starts with", "is null")
+
+# Declared types whose values are stored as ISO date/datetime text
+DATE_TYPES = ("DATE", "DATETIME", "TIMESTAMP")
+
+# Declared types whose values are stored as HH:MM:SS[.ffffff] text
+TIME_TYPES = ("TIME",)
+
+# Largest match set SearchCache keeps (scanning the table is about as fast
+# beyond this), and the memory all of its match sets may use (bytes)
+SEARCH_CACHE_MAX_MATCHES = 50000
+SEARCH_CACHE_MAX_BYTES = 16 * 1024 * 1024
+
+
+def search_uses_index(text: str, rowid: Optional[str] = "rowid", search_index: Optional[str] = None) -> bool:
+    """Whether search_clause answers text from the search index rather than with LIKE"""
+    return bool(
+        search_index and rowid and len(text) >= SEARCH_INDEX_MIN_TERM
+        and not set(text) & {"%", "_"} and text.isascii()
+    )
+
+
+def search_clause(
+    columns: Iterable[str],
+    text: str,
+    rowid: Optional[str] = "rowid",
+    search_index: Optional[str] = None
+) -> Tuple[str, list]:
+    """
+    WHERE clause matching text anywhere in any of the columns
+
+    With a search index (DatabaseManager.build_search_index) the matching
+    rowids come from the FTS5 trigram index. Terms shorter than a trigram
+    or containing LIKE wildcards, which the index can't answer, use
+    LIKE over every column instead. So do terms with non-ASCII characters:
+    the trigram tokenizer folds case for all of Unicode but LIKE only for
+    ASCII ('é' finds 'É' through the index but not with LIKE), and the
+    search cache refines earlier matches with LIKE's rules.
+
+    Args:
+        columns: Columns to search
+        text: Text to find
+        rowid: Name referring to the table's rowid
+        search_index: The table's FTS5 search index, if any
+
+    Returns:
+        (clause, params); an empty clause when text is empty
+    """
+    columns = list(columns)
+    if not text or not columns:
+        return "", []
+    if search_uses_index(text, rowid, search_index):
+        index = quote_identifier(search_index)
+        phrase = '"' + text.replace('"', '""') + '"'
+        return f"{rowid} IN (SELECT rowid FROM {index} WHERE {index} MATCH ?)", [phrase]
+    clause = " OR ".join(f"{quote_identifier(col)} LIKE ?" for col in columns)
+    return clause, [f"%{text}%"] * len(columns)
+
+
+def column_kind(declared_type: Optional[str]) -> str:
+    """
+    How filter values for a column are read, from its declared type
+
+    Follows SQLite's type affinity rules, with DATE_TYPES and TIME_TYPES
+    split out of NUMERIC since the importer stores them as ISO text.
+
+    Returns:
+        'integer', 'real', 'date', 'time' or 'text'
+    """
+    declared = (declared_type or "").upper()
+    if "INT" in declared:
+        return "integer"
+    if any(name in declared for name in ("CHAR", "CLOB", "TEXT")) or not declared or "BLOB" in declared:
+        return "text"
+    if declared in DATE_TYPES:
+        return "date"
+    if declared in TIME_TYPES:
+        return "time"
+    return "real"
+
+
+def _filter_value(kind: str, value: str) -> Any:
+    """Convert a filter value typed by the user to the column's kind"""
+    value = value.strip()
+    if kind in ("integer", "real"):
+        try:
+            return int(value) if kind == "integer" else float(value)
+        except ValueError:
+            pass
+        try:
+            return float(value)  # e.g. 2.5 for an integer column, or 1e3
+        except ValueError:
+            raise ValueError(f"'{value}' is not a number")
+    if kind == "date":
+        try:
+            return date.fromisoformat(format_date_key(to_date_key(value)))
+        except ValueError:
+            raise ValueError(f"'{value}' is not a date (use YYYY-MM-DD)")
+    if kind == "time":
+        try:
+            return time.fromisoformat(value).replace(microsecond=0, tzinfo=None)
+        except ValueError:
+            raise ValueError(f"'{value}' is not a time (use HH:MM:SS)")
+    return value
+
+
+def _split_values(value: str) -> List[str]:
+    """Split comma-separated filter values; a value in double quotes may contain commas"""
+    return [part for part in next(csv.reader([value], skipinitialspace=True), []) if part.strip()]
+
+
+def _text_span(kind: str, value: Any) -> Tuple[str, str]:
+    """[start, end) on the stored text covering a whole day or a whole second"""
+    if kind == "date":
+        return value.isoformat(), (value + timedelta(days=1)).isoformat()
+    seconds = value.hour * 3600 + value.minute * 60 + value.second + 1
+    # 23:59:59 ends at '24:00:00', still after every stored time
+    return value.isoformat(), f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+def filter_clause(
+    column: str,
+    declared_type: Optional[str],
+    operator: str,
+    value: str = ""
+) -> Tuple[str, list]:
+    """
+    WHERE clause for one column filter that an index on the column can use
+
+    Only operators SQLite can answer with an index search are offered:
+    'starts with' is a range rather than LIKE (which ignores case, so the
+    usual BINARY index can't answer it) and is therefore case-sensitive.
+    Dates match whole days, so '= 2025-01-01' includes every time that day,
+    and times whole seconds.
+
+    Args:
+        column: Column name
+        declared_type: The column's declared type (table_schema types)
+        operator: One of FILTER_OPERATORS
+        value: Value as typed; 'between' takes two and 'in' any number,
+            separated by commas (a value in double quotes may contain one)
+
+    Returns:
+        (clause, params)
+
+    Raises:
+        ValueError: If the operator is unknown or a value doesn't suit the column
+    """
+    if operator not in FILTER_OPERATORS:
+        raise ValueError(f"'{operator}' is not a filter operator")
+
+    col = quote_identifier(column)
+    if operator == "is null":
+        return f"{col} IS NULL", []
+
+    kind = column_kind(declared_type)
+    if operator in ("between", "in"):
+        values = [_filter_value(kind, part) for part in _split_values(value)]
+        if operator == "between" and len(values) != 2:
+            raise ValueError("between needs two values separated by a comma")
+        if not values:
+            raise ValueError("in needs at least one value")
+    elif not value.strip():
+        raise ValueError(f"{column} {operator} needs a value")
+    else:
+        values = [_filter_value(kind, value)]
+
+    if operator == "starts with":
+        if kind != "text":
+            raise ValueError(f"starts with only applies to text columns, not {column}")
+        prefix = values[0]
+        if ord(prefix[-1]) == 0x10FFFF:
+            return f"{col} >= ?", [prefix]
+        return f"{col} >= ? AND {col} < ?", [prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)]
+
+    if kind in ("date", "time"):
+        # Whole days (or seconds): [day, next day) on the ISO text
+        days = [_text_span(kind, day) for day in values]
+        if operator == "=":
+            return f"{col} >= ? AND {col} < ?", list(days[0])
+        if operator == "in":
+            ranges = " OR ".join(f"({col} >= ? AND {col} < ?)" for _ in days)
+            return ranges, [bound for day in days for bound in day]
+        if operator == "between":
+            return f"{col} >= ? AND {col} < ?", [days[0][0], days[1][1]]
+        op, bound = {"<": ("<", 0), "<=": ("<", 1), ">": (">=", 1), ">=": (">=", 0)}[operator]
+        return f"{col} {op} ?", [days[0][bound]]
+
+    if operator == "in":
+        return f"{col} IN ({', '.join('?' * len(values))})", values
+    if operator == "between":
+        return f"{col} BETWEEN ? AND ?", values
+    return f"{col} {operator} ?", values
+
+
+def filters_clause(filters: Iterable[Sequence[str]], types: Dict[str, Any]) -> Tuple[str, list]:
+    """
+    AND together column filters (see filter_clause)
+
+    Args:
+        filters: (column, operator, value) for each filter
+        types: Declared type by column name
+
+    Returns:
+        (clause, params); an empty clause when there are no filters
+    """
+    clauses, params = [], []
+    for column, operator, value in filters:
+        clause, clause_params = filter_clause(column, types.get(column), operator, value)
+        clauses.append(f"({clause})")
+        params.extend(clause_params)
+    return " AND ".join(clauses), params
+
+
+def query_plan(conn: sqlite3.Connection, sql: str, params: Sequence[Any] = ()) -> List[str]:
+    """
+    EXPLAIN QUERY PLAN for a statement
+
+    Returns:
+        The plan's detail lines, e.g. 'SEARCH t USING INDEX idx_dept (dept=?)'
+    """
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", list(params))]
+
+
+def plan_index(plan: Sequence[str], rowid_subquery: bool = False) -> Optional[str]:
+    """
+    The index a query plan searches, if any
+
+    Args:
+        plan: query_plan lines
+        rowid_subquery: The query picks rows by a rowid list (see
+            TableQuery); the rowid lookups that list drives don't count
+
+    Returns:
+        The plan line searching an index or the rowid, or None if every
+        table in the plan is scanned (or, with rowid_subquery, only looked
+        up by rowid)
+    """
+    for line in plan:
+        if not line.startswith("SEARCH") or not ("INDEX" in line or "PRIMARY KEY" in line):
+            continue
+        if rowid_subquery and line.endswith("USING INTEGER PRIMARY KEY (rowid=?)"):
+            continue
+        return line
+    return None
+
+
+def match_set_clause(rowid: str, match_set: str) -> Tuple[str, list]:
+    """
+    WHERE clause limiting rows to a match set from SearchCache
+
+    Args:
+        rowid: Name referring to the table's rowid
+        match_set: JSON array of rowids
+
+    Returns:
+        (clause, params)
+    """
+    return f"{rowid} IN (SELECT value FROM json_each(?))", [match_set]
+
+
+class SearchCache:
+    """
+    Rowids matching recent searches on one database file
+
+    A search whose text contains an earlier search's text can only match
+    rows that search matched, so it is answered by re-checking those rows
+    instead of scanning the table: typing "kim", "kimj", "kimjh" scans once.
+    Match sets are kept as JSON arrays, the form queries take them in
+    (match_set_clause), and all of them are dropped when the database's
+    schema or data version changes.
+    """
+
+    def __init__(self, pool: ConnectionPool, max_bytes: int = SEARCH_CACHE_MAX_BYTES):
+        self.pool = pool
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._versions = None
+        self._sets = OrderedDict()
+        self._size = 0
+        self.counters = {"hits": 0, "refinements": 0, "misses": 0}
+
+    def _check_versions(self, versions: Tuple[int, int], adopt: bool) -> bool:
+        """
+        Compare versions with the cached sets' (call with the lock held)
+
+        Versions are only compared for equality: the watcher connection
+        behind them is reopened by set_wal and close, and its data_version
+        starts over when it is.
+
+        Args:
+            versions: Database versions of the caller
+            adopt: On a mismatch, drop every match set and take on versions
+                (a lookup does; a put for versions that are no longer
+                current doesn't)
+
+        Returns:
+            True if the cached sets are for versions
+        """
+        if versions == self._versions:
+            return True
+        if not adopt and self._versions is not None:
+            return False
+        self._sets.clear()
+        self._size = 0
+        self._versions = versions
+        return True
+
+    def matches(
+        self,
+        table_name: str,
+        columns: Sequence[str],
+        rowid: str,
+        text: str,
+        versions: Tuple[int, int]
+    ) -> Optional[Tuple[str, int]]:
+        """
+        Get the rowids matching a search, from the cache or by narrowing a
+        cached search whose text the new text contains
+
+        Args:
+            table_name: Table searched
+            columns: Columns searched
+            rowid: Name referring to the table's rowid
+            text: Search text
+            versions: Database versions (DatabaseManager.versions) the
+                search is for
+
+        Returns:
+            (JSON array of rowids, number of rowids), or None if no cached
+            search covers the text
+        """
+        with self._lock:
+            self._check_versions(versions, adopt=True)
+            entry = self._sets.get((table_name, text))
+            if entry is not None:
+                self._sets.move_to_end((table_name, text))
+                self.counters["hits"] += 1
+                return entry
+
+            # Narrow the smallest cached set that contains every match
+            candidates = [
+                entry for (table, term), entry in self._sets.items()
+                if table == table_name and self._contains(text, term)
+            ]
+            if not candidates:
+                self.counters["misses"] += 1
+                return None
+            base = min(candidates, key=lambda entry: entry[1])[0]
+            self.counters["refinements"] += 1
+
+        where, params = search_clause(columns, text)
+        sql = (
+            f"SELECT {rowid} FROM {quote_identifier(table_name)} "
+            f"WHERE {match_set_clause(rowid, base)[0]} AND ({where})"
+        )
+        with self.pool.reader() as conn:
+            rowids = [row[0] for row in conn.execute(sql, [base] + params)]
+        logger.debug(f"Narrowed search '{text}' on {table_name} to {len(rowids):,} rows")
+        return self.put(table_name, text, versions, rowids)
+
+    @staticmethod
+    def _contains(text: str, term: str) -> bool:
+        """Whether every row matching text also matches term (LIKE ignores case for ASCII only)"""
+        return term in text or (term.isascii() and term.lower() in text.lower())
+
+    def put(
+        self,
+        table_name: str,
+        text: str,
+        versions: Tuple[int, int],
+        rowids: Sequence[int]
+    ) -> Optional[Tuple[str, int]]:
+        """
+        Remember the rowids matching a search
+
+        Returns:
+            (JSON array of rowids, number of rowids), or None if there are
+            too many to keep
+        """
+        if len(rowids) > SEARCH_CACHE_MAX_MATCHES:
+            return None
+        entry = (json.dumps(list(rowids), separators=(",", ":")), len(rowids))
+        with self._lock:
+            if not self._check_versions(versions, adopt=False):
+                return entry
+            old = self._sets.pop((table_name, text), None)
+            if old is not None:
+                self._size -= len(old[0])
+            self._sets[(table_name, text)] = entry
+            self._size += len(entry[0])
+            while self._size > self.max_bytes and len(self._sets) > 1:
+                _, evicted = self._sets.popitem(last=False)
+                self._size -= len(evicted[0])
+        return entry
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache counters
+
+        Returns:
+            Dictionary with hits, refinements, misses, the number of cached
+            searches and the bytes they use
+        """
+        with self._lock:
+            return {**self.counters, "searches": len(self._sets), "bytes": self._size}
+
+
+_search_caches: Dict[str, SearchCache] = {}
+_search_caches_lock = threading.Lock()
+
+
+def get_search_cache(pool: ConnectionPool) -> SearchCache:
+    """Get (or create) the search cache for a pool's database"""
+    key = str(pool.db_path)
+    with _search_caches_lock:
+        cache = _search_caches.get(key)
+        if cache is None or cache.pool is not pool:
+            cache = _search_caches[key] = SearchCache(pool)
+        return cache
+
+
+class TableQuery:
+    """
+    A filtered, sorted view of a table that is read one page at a time
+
+    Rows are ordered by (sort column, rowid), rowid breaking ties, and a
+    page is located by the key of the row just before (or after) it rather
+    than by OFFSET, so SQLite seeks straight to it instead of stepping
+    through every earlier row. With an index on the sort column (or no
+    sort) that seek is an index lookup. Tables without a usable rowid fall
+    back to LIMIT/OFFSET.
+
+    rowid_subquery marks a where clause that picks rows by a rowid list
+    (a search index match or a SearchCache match set): counting it walks
+    that list once instead of by rowid ranges.
+
+    Page rows are (rowid, *columns).
+    """
+
+    def __init__(
+        self,
+        table_name: str,
+        columns: Sequence[str],
+        rowid: Optional[str] = "rowid",
+        where: str = "",
+        params: Sequence[Any] = (),
+        sort_column: Optional[str] = None,
+        descending: bool = False,
+        rowid_subquery: bool = False
+    ):
+        self.table_name = table_name
+        self.columns = list(columns)
+        self.rowid = rowid
+        self.where = where
+        self.params = list(params)
+        self.sort_column = sort_column if sort_column in self.columns else None
+        self.descending = descending
+        self.rowid_subquery = rowid_subquery
+
+    def count_sql(self) -> Tuple[str, list]:
+        """COUNT(*) over the filtered rows"""
+        sql = f"SELECT COUNT(*) FROM {quote_identifier(self.table_name)}"
+        if self.where:
+            sql += f" WHERE {self.where}"
+        return sql, list(self.params)
+
+    def count_progressively(
+        self,
+        conn: sqlite3.Connection,
+        rowids: Optional[list] = None
+    ) -> Iterator[Tuple[int, bool]]:
+        """
+        Count the filtered rows one rowid range at a time
+
+        Lets a caller show a running lower bound and stop early. Use a
+        snapshot connection so the ranges add up to a consistent total.
+        Tables without a rowid, and queries whose rows come from a rowid
+        subquery (which would be re-run for every range), are counted in
+        one step.
+
+        Args:
+            conn: Database connection
+            rowids: If given, filled with the matching rowids as they are
+                counted (for SearchCache); emptied, and no longer filled,
+                once there are more than SEARCH_CACHE_MAX_MATCHES
+
+        Yields:
+            (rows counted so far, whether the count is finished)
+        """
+        table = quote_identifier(self.table_name)
+        if self.rowid is not None and self.rowid_subquery and rowids is not None:
+            sql = f"SELECT {self.rowid} FROM {table} WHERE {self.where}"
+            found = conn.execute(sql, self.params).fetchmany(SEARCH_CACHE_MAX_MATCHES + 1)
+            if len(found) <= SEARCH_CACHE_MAX_MATCHES:
+                rowids.extend(row[0] for row in found)
+                yield len(rowids), True
+                return
+        if self.rowid is None or self.rowid_subquery:
+            sql, params = self.count_sql()
+            yield conn.execute(sql, params).fetchone()[0], True
+            return
+
+        low, high = conn.execute(f"SELECT MIN({self.rowid}), MAX({self.rowid}) FROM {table}").fetchone()
+        if low is None:
+            yield 0, True
+            return
+
+        step = max(COUNT_CHUNK_ROWS, (high - low) // MAX_COUNT_CHUNKS + 1)
+        condition = f" FROM {table} WHERE {self.rowid} BETWEEN ? AND ?"
+        if self.where:
+            condition += f" AND ({self.where})"
+        collecting = rowids is not None
+        total = 0
+        for start in range(low, high + 1, step):
+            params = [start, start + step - 1] + self.params
+            if collecting:
+                rowids.extend(row[0] for row in conn.execute(f"SELECT {self.rowid}{condition}", params))
+                total = len(rowids)
+                if total > SEARCH_CACHE_MAX_MATCHES:
+                    rowids.clear()
+                    collecting = False
+            else:
+                total += conn.execute(f"SELECT COUNT(*){condition}", params).fetchone()[0]
+            yield total, start + step > high
+
+    def row_key(self, row: Sequence[Any]) -> tuple:
+        """Position of a page row in the sort order: (sort value, rowid) or (rowid,)"""
+        if self.sort_column is None:
+            return (row[0],)
+        return (row[1 + self.columns.index(self.sort_column)], row[0])
+
+    def _seek(self, key: tuple, ascending: bool, inclusive: bool) -> List[Tuple[str, list]]:
+        """
+        Predicates for the rows at or past key, scanning in the given order
+
+        NULLs sort first in ascending order and never match a row-value
+        comparison, so a key on either side of the NULL run needs two
+        segments, queried in order. Keeping them separate (rather than OR-ed)
+        lets each one be an index range scan.
+        """
+        rowid = self.rowid
+        op = (">" if ascending else "<") + ("=" if inclusive else "")
+        if self.sort_column is None:
+            return [(f"{rowid} {op} ?", [key[0]])]
+
+        column = quote_identifier(self.sort_column)
+        value, row = key
+        if value is None:
+            segments = [(f"{column} IS NULL AND {rowid} {op} ?", [row])]
+            if ascending:
+                segments.append((f"{column} IS NOT NULL", []))
+            return segments
+        segments = [(f"({column}, {rowid}) {op} (?, ?)", [value, row])]
+        if not ascending:
+            segments.append((f"{column} IS NULL", []))
+        return segments
+
+    def page_sql(
+        self,
+        key: Optional[tuple] = None,
+        direction: str = "from",
+        limit: int = 50,
+        offset: int = 0
+    ) -> Tuple[List[Tuple[str, list]], bool]:
+        """
+        Build the queries for one page
+
+        Args:
+            key: row_key of a row in the current page, or None for the start
+            direction: 'from' (rows from key on), 'next' (rows after key) or
+                'prev' (rows before key)
+            limit: Page size
+            offset: Rows to skip: from the start when there is no key
+                (jumping into the middle of the rows) and for tables without
+                a rowid; past key for an unsorted view
+
+        Returns:
+            (queries, reverse): (sql, params) pairs to run in order, each
+            with a trailing LIMIT parameter for the rows still needed, and
+            whether the rows come back in reverse display order
+        """
+        if direction not in DIRECTIONS:
+            raise ValueError(f"'{direction}' is not a valid page direction")
+
+        rowid = self.rowid or "NULL"
+        select = ", ".join([rowid] + [quote_identifier(col) for col in self.columns])
+        base = f"SELECT {select} FROM {quote_identifier(self.table_name)}"
+        conditions = [f"({self.where})"] if self.where else []
+
+        if self.rowid is None:
+            sql = base
+            if conditions:
+                sql += f" WHERE {' AND '.join(conditions)}"
+            if self.sort_column:
+                sql += f" ORDER BY {quote_identifier(self.sort_column)} {'DESC' if self.descending else 'ASC'}"
+            return [(sql + f" LIMIT ? OFFSET {int(offset)}", list(self.params))], False
+
+        # 'prev' scans backwards from the key and is reversed afterwards
+        reverse = direction == "prev"
+        ascending = self.descending == reverse
+        order = "ASC" if ascending else "DESC"
+        keys = [f"{quote_identifier(self.sort_column)} {order}"] if self.sort_column else []
+        order_by = f" ORDER BY {', '.join(keys + [f'{self.rowid} {order}'])} LIMIT ?"
+
+        if key is None:
+            segments = [("", [])]
+            if offset:
+                order_by += f" OFFSET {int(offset)}"
+        else:
+            segments = self._seek(key, ascending, inclusive=direction == "from")
+            # An unsorted seek is one rowid range, so skipping rows in it is exact
+            if offset and self.sort_column is None:
+                order_by += f" OFFSET {int(offset)}"
+        queries = []
+        for seek, seek_params in segments:
+            where = conditions + ([seek] if seek else [])
+            sql = base + (f" WHERE {' AND '.join(where)}" if where else "") + order_by
+            queries.append((sql, list(self.params) + seek_params))
+        return queries, reverse
+
+    def fetch_page(
+        self,
+        conn: sqlite3.Connection,
+        key: Optional[tuple] = None,
+        direction: str = "from",
+        limit: int = 50,
+        offset: int = 0
+    ) -> List[tuple]:
+        """
+        Fetch one page in display order (see page_sql for the arguments)
+
+        Returns:
+            List of (rowid, *columns) rows
+        """
+        queries, reverse = self.page_sql(key, direction, limit, offset)
+        rows = []
+        for sql, params in queries:
+            rows.extend(conn.execute(sql, params + [limit - len(rows)]).fetchall())
+            if len(rows) >= limit:
+                break
+        if reverse:
+            rows.reverse()
+        return rows
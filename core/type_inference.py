@@ -0,0 +1,368 @@
+"""
+Column dtype inference and downcasting
+Picks the narrowest safe dtype per column from a sample, then validates it
+against the full column with vectorized passes
+"""
+import re
+import logging
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Number of non-null values inspected when guessing a column's type
+DEFAULT_SAMPLE_SIZE = 1000
+
+# Strings become categorical when unique values / rows is at most this ratio
+DEFAULT_CATEGORY_RATIO = 0.5
+
+# Leading zeros are excluded so codes such as "00123" stay text
+_NUMERIC_TEXT = re.compile(r"^[-+]?(0|[1-9]\d*)(\.\d+)?([eE][-+]?\d+)?$")
+_ISO_DATE_TEXT = re.compile(r"^\d{4}-\d{2}-\d{2}([ T]\d{2}:\d{2}(:\d{2}(\.\d+)?)?)?$")
+
+_INT_DTYPES = [
+    (np.int8, "Int8"),
+    (np.int16, "Int16"),
+    (np.int32, "Int32"),
+    (np.int64, "Int64"),
+]
+
+
+def _classify_sample(sample: pd.Series) -> str:
+    """Guess a column kind from the Python types of a sample of its values"""
+    kinds = set()
+    all_text = True
+    for value in sample:
+        all_text = all_text and isinstance(value, str)
+        if isinstance(value, (bool, np.bool_)):
+            kinds.add("boolean")
+        elif isinstance(value, (int, float, np.number)):
+            kinds.add("numeric")
+        elif isinstance(value, (datetime, date, pd.Timestamp, np.datetime64)):
+            kinds.add("datetime")
+        elif isinstance(value, str):
+            if _NUMERIC_TEXT.match(value):
+                kinds.add("numeric")
+            elif _ISO_DATE_TEXT.match(value):
+                kinds.add("datetime_text")
+            else:
+                kinds.add("string")
+        else:
+            kinds.add("mixed")
+
+    if len(kinds) == 1:
+        kind = kinds.pop()
+        return "datetime" if kind == "datetime_text" else kind
+    if kinds == {"datetime", "datetime_text"}:
+        return "datetime"
+    return "string" if all_text else "mixed"
+
+
+def _narrow_integer(values: pd.Series, nullable: bool) -> pd.Series:
+    """Cast integral values to the smallest integer dtype that holds them"""
+    lo, hi = values.min(), values.max()
+    for np_dtype, nullable_dtype in _INT_DTYPES:
+        info = np.iinfo(np_dtype)
+        if info.min <= lo and hi <= info.max:
+            return values.astype(nullable_dtype if nullable else np_dtype)
+    return values
+
+
+def _narrow_numeric(values: pd.Series) -> pd.Series:
+    """Downcast a numeric column to the narrowest dtype that loses nothing"""
+    non_null = values.dropna()
+    if non_null.empty:
+        return values
+
+    if pd.api.types.is_integer_dtype(values.dtype):
+        return _narrow_integer(values, nullable=values.hasnans or pd.api.types.is_extension_array_dtype(values.dtype))
+
+    array = non_null.to_numpy(dtype="float64")
+    if np.isfinite(array).all() and (np.mod(array, 1) == 0).all():
+        if np.abs(array).max() < 2 ** 63:
+            has_nulls = len(non_null) != len(values)
+            return _narrow_integer(values if has_nulls else values.astype("int64"), nullable=has_nulls)
+
+    # float32 only when every value survives the round trip
+    full = values.to_numpy(dtype="float64")
+    narrowed = full.astype("float32")
+    if np.array_equal(narrowed.astype("float64"), full, equal_nan=True):
+        return pd.Series(narrowed, index=values.index, name=values.name)
+    return values.astype("float64")
+
+
+def _as_category(values: pd.Series, category_ratio: float) -> pd.Series:
+    """Convert repetitive strings to categorical when that is actually smaller"""
+    non_null = values.count()
+    if non_null == 0 or values.nunique(dropna=True) > non_null * category_ratio:
+        return values
+    categorical = values.astype("category")
+    if categorical.memory_usage(deep=True) < values.memory_usage(deep=True):
+        return categorical
+    return values
+
+
+def _is_text_dtype(dtype) -> bool:
+    """Whether a column holds Python objects or str (datetime64, timedelta64, category, ... don't)"""
+    return pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype)
+
+
+def _convert_numeric(values: pd.Series, non_null: pd.Series) -> Optional[pd.Series]:
+    """Convert an object column to numbers, or None if any value isn't one"""
+    if not _is_text_dtype(values.dtype):
+        return None
+    is_text = non_null.map(type).eq(str)
+    if not non_null[is_text].str.match(_NUMERIC_TEXT).all():
+        return None
+    converted = pd.to_numeric(values, errors="coerce")
+    if converted.count() != len(non_null):
+        return None
+    return converted
+
+
+def _convert_datetime(values: pd.Series, non_null: pd.Series) -> Optional[pd.Series]:
+    """Convert an object column to datetimes, or None if any value isn't one"""
+    if not _is_text_dtype(values.dtype):
+        return None
+    is_text = non_null.map(type).eq(str)
+    if not non_null[is_text].str.match(_ISO_DATE_TEXT).all():
+        return None
+    try:
+        converted = pd.to_datetime(values, errors="coerce", format="ISO8601")
+    except (ValueError, TypeError):
+        return None
+    if converted.count() != len(non_null):
+        return None
+    return converted
+
+
+def infer_series(
+    values: pd.Series,
+    sample_size: int = DEFAULT_SAMPLE_SIZE,
+    category_ratio: float = DEFAULT_CATEGORY_RATIO
+) -> Tuple[pd.Series, str]:
+    """
+    Infer and apply the narrowest safe dtype for a single column
+
+    Args:
+        values: Column to convert
+        sample_size: Non-null values sampled to pick a candidate type
+        category_ratio: Maximum unique/non-null ratio for categoricals
+
+    Returns:
+        (converted column, inferred kind)
+    """
+    dtype = values.dtype
+
+    if pd.api.types.is_bool_dtype(dtype):
+        return values, "boolean"
+    if pd.api.types.is_numeric_dtype(dtype):
+        return _narrow_numeric(values), "numeric"
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return values, "datetime"
+    if isinstance(dtype, pd.CategoricalDtype):
+        return values, "category"
+
+    non_null = values.dropna()
+    if non_null.empty:
+        return values, "empty"
+
+    sample = non_null
+    if len(non_null) > sample_size:
+        sample = non_null.sample(n=sample_size, random_state=0)
+    kind = _classify_sample(sample)
+
+    # Validate the sampled guess against the whole column
+    if kind == "numeric":
+        converted = _convert_numeric(values, non_null)
+        if converted is not None:
+            return _narrow_numeric(converted), kind
+        kind = "mixed"
+
+    elif kind == "boolean":
+        if non_null.map(type).isin([bool, np.bool_]).all():
+            return values.astype("boolean"), kind
+        kind = "mixed"
+
+    elif kind == "datetime":
+        converted = _convert_datetime(values, non_null)
+        if converted is not None:
+            return converted, kind
+        kind = "mixed"
+
+    return _as_category(values, category_ratio), kind
+
+
+def infer_dtypes(
+    df: pd.DataFrame,
+    sample_size: int = DEFAULT_SAMPLE_SIZE,
+    category_ratio: float = DEFAULT_CATEGORY_RATIO
+) -> Tuple[pd.DataFrame, List[Dict]]:
+    """
+    Convert every column of a DataFrame to its narrowest safe dtype
+
+    Args:
+        df: Input DataFrame (modified in place and returned)
+        sample_size: Non-null values sampled per column to pick a candidate type
+        category_ratio: Maximum unique/non-null ratio for categoricals
+
+    Returns:
+        (converted DataFrame, per-column report)
+    """
+    report = []
+    for position, col in enumerate(df.columns):
+        values = df.iloc[:, position]
+        before = values.memory_usage(index=False, deep=True)
+        converted, kind = infer_series(values, sample_size, category_ratio)
+        after = converted.memory_usage(index=False, deep=True)
+
+        if converted is not values:
+            df.isetitem(position, converted)
+
+        report.append({
+            "column": col,
+            "kind": kind,
+            "from_dtype": str(values.dtype),
+            "to_dtype": str(converted.dtype),
+            "bytes_before": int(before),
+            "bytes_after": int(after),
+            "bytes_saved": int(before - after),
+        })
+
+    return df, report
+
+
+def plan_dtypes(
+    df: pd.DataFrame,
+    sample_size: int = DEFAULT_SAMPLE_SIZE
+) -> Dict[str, str]:
+    """
+    Pick one dtype per column for every chunk of a streamed sheet
+
+    The plan is inferred from a single frame (normally the first chunk) and
+    then applied to every chunk with apply_dtype_plan, so all chunks share
+    the same dtypes and the table created from the first chunk fits the
+    rest. Planned dtypes are deliberately wide (Int64, float64, boolean,
+    the sample's datetime64 unit, or object for text and for columns that
+    are empty in the sample), since a later chunk may hold larger values.
+
+    Args:
+        df: Sample frame
+        sample_size: Non-null values sampled per column to pick a candidate type
+
+    Returns:
+        Dictionary of column name to dtype name
+    """
+    plan = {}
+    for position, col in enumerate(df.columns):
+        values = df.iloc[:, position]
+        if not values.notna().any():
+            plan[col] = "object"
+            continue
+        converted, kind = infer_series(values, sample_size, category_ratio=0)
+        dtype = converted.dtype
+        if kind == "boolean":
+            plan[col] = "boolean"
+        elif kind == "numeric":
+            plan[col] = "Int64" if pd.api.types.is_integer_dtype(dtype) else "float64"
+        elif kind == "datetime" and pd.api.types.is_datetime64_any_dtype(dtype):
+            plan[col] = str(dtype)
+        else:
+            plan[col] = "object"
+    return plan
+
+
+def _apply_dtype(values: pd.Series, dtype: str) -> Optional[pd.Series]:
+    """Convert a column to a planned dtype, or None if some value doesn't fit"""
+    if dtype == "object":
+        return values.astype(object).where(values.notna(), None)
+
+    non_null = values.dropna()
+    if dtype == "boolean":
+        if pd.api.types.is_bool_dtype(values.dtype) or non_null.map(type).isin([bool, np.bool_]).all():
+            return values.astype("boolean")
+        return None
+
+    if pd.api.types.is_bool_dtype(values.dtype):
+        return None
+
+    if dtype in ("Int64", "float64"):
+        if not pd.api.types.is_numeric_dtype(values.dtype):
+            if non_null.map(type).isin([bool, np.bool_]).any():
+                return None
+            values = _convert_numeric(values, non_null)
+        if values is None:
+            return None
+        if dtype == "Int64":
+            array = values.dropna().to_numpy(dtype="float64")
+            if not (np.isfinite(array).all() and (np.mod(array, 1) == 0).all()
+                    and (np.abs(array).max(initial=0) < 2 ** 63)):
+                return None
+        return values.astype(dtype)
+
+    # datetime64 of the planned unit
+    if pd.api.types.is_numeric_dtype(values.dtype):
+        return None
+    if not pd.api.types.is_datetime64_any_dtype(values.dtype):
+        values = _convert_datetime(values, non_null)
+    if values is None:
+        return None
+    try:
+        return values.astype(dtype)
+    except (ValueError, TypeError, OverflowError):
+        return None
+
+
+def _as_text(values: pd.Series) -> pd.Series:
+    """Convert a column to str values, with None for missing ones"""
+    text = pd.Series([None] * len(values), index=values.index, dtype=object, name=values.name)
+    present = values.notna()
+    text[present] = values[present].map(str)
+    return text
+
+
+def apply_dtype_plan(df: pd.DataFrame, plan: Dict[str, str]) -> Tuple[pd.DataFrame, List[str]]:
+    """
+    Convert a chunk to the dtypes chosen by plan_dtypes
+
+    A column with any value that doesn't fit its planned dtype (text in a
+    numeric column, a fraction in an integer column, ...) is kept as text
+    for that chunk: non-missing values become str, missing ones None.
+    SQLite's column affinity still stores numeric-looking text as numbers,
+    so nothing is lost, but the column's pandas dtype is object.
+
+    Args:
+        df: Chunk to convert (modified in place and returned)
+        plan: Column name to dtype name
+
+    Returns:
+        (converted DataFrame, columns that fell back to text)
+    """
+    fallbacks = []
+    for position, col in enumerate(df.columns):
+        values = df.iloc[:, position]
+        converted = _apply_dtype(values, plan.get(col, "object"))
+        if converted is None:
+            converted = _as_text(values)
+            fallbacks.append(col)
+        if converted is not values:
+            df.isetitem(position, converted)
+    return df, fallbacks
+
+
+def summarize_report(report: List[Dict]) -> str:
+    """Format a type inference report as a short log line"""
+    before = sum(item["bytes_before"] for item in report)
+    after = sum(item["bytes_after"] for item in report)
+    changed = [
+        f"{item['column']}: {item['from_dtype']}->{item['to_dtype']}"
+        for item in report if item["from_dtype"] != item["to_dtype"]
+    ]
+    saved_pct = (before - after) / before * 100 if before else 0.0
+    return (
+        f"{before / 1024 / 1024:.1f} MB -> {after / 1024 / 1024:.1f} MB "
+        f"({saved_pct:.0f}% saved); {', '.join(changed) or 'no changes'}"
+    )
@@ -0,0 +1,669 @@
+"""
+Low-level XLSX package reader
+Reads workbook metadata and worksheet data straight from the zip container,
+without building openpyxl cell objects
+"""
+import posixpath
+import re
+import zipfile
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union
+from xml.etree.ElementTree import iterparse
+from xml.parsers import expat
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Cell kinds tracked per column while parsing
+_EMPTY, _NUMBER, _DATE, _TIMEDELTA, _BOOL, _TEXT, _OBJECT = range(7)
+
+# Strings pd.read_excel treats as missing by default
+_NA_STRINGS = {
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None",
+    "n/a", "nan", "null",
+}
+
+# Bytes fed to the XML parser per read from the zip stream
+_FEED_BYTES = 1024 * 1024
+
+# Excel serial day 0 for the 1900 and 1904 date systems
+_EPOCH_1900 = np.datetime64("1899-12-30", "ms")
+_EPOCH_1904 = np.datetime64("1904-01-01", "ms")
+
+# dtype pandas uses for datetime columns built from Python datetimes
+_DATETIME_DTYPE = pd.Series([datetime(2000, 1, 1)]).dtype
+
+_CELL_REF = re.compile(r"([A-Z]+)(\d+)")
+
+
+def _local(tag: str) -> str:
+    """Strip the XML namespace from a tag (handles transitional and strict OOXML)"""
+    return tag.rsplit("}", 1)[-1]
+
+
+def column_index(letters: str) -> int:
+    """Convert column letters to a zero-based index (A -> 0, AA -> 26)"""
+    index = 0
+    for char in letters:
+        index = index * 26 + (ord(char) - 64)
+    return index - 1
+
+
+def parse_cell_ref(ref: str) -> Tuple[int, int]:
+    """Convert a cell reference to zero-based (row, column), e.g. 'B3' -> (2, 1)"""
+    match = _CELL_REF.match(ref.upper())
+    if not match:
+        raise ValueError(f"Invalid cell reference: {ref}")
+    return int(match.group(2)) - 1, column_index(match.group(1))
+
+
+def read_sheet_manifest(archive: zipfile.ZipFile) -> List[Dict[str, str]]:
+    """
+    Read sheet names and their worksheet part paths from the workbook manifest
+
+    Args:
+        archive: Open XLSX zip archive
+
+    Returns:
+        List of {"name", "path", "state"} in workbook order
+    """
+    targets = {}
+    with archive.open("xl/_rels/workbook.xml.rels") as rels:
+        for _, elem in iterparse(rels):
+            if _local(elem.tag) == "Relationship":
+                target = elem.get("Target", "")
+                if target.startswith("/"):
+                    target = target.lstrip("/")
+                else:
+                    target = posixpath.normpath(posixpath.join("xl", target))
+                targets[elem.get("Id")] = target
+
+    sheets = []
+    with archive.open("xl/workbook.xml") as workbook:
+        for _, elem in iterparse(workbook):
+            if _local(elem.tag) != "sheet":
+                continue
+            rel_id = next((v for k, v in elem.attrib.items() if _local(k) == "id"), None)
+            sheets.append({
+                "name": elem.get("name"),
+                "path": targets.get(rel_id),
+                "state": elem.get("state", "visible"),
+            })
+    return sheets
+
+
+def read_shared_strings(archive: zipfile.ZipFile, limit: Optional[int] = None) -> List[str]:
+    """
+    Read the shared-strings table
+
+    Args:
+        archive: Open XLSX zip archive
+        limit: Stop after this many entries (None reads the whole table)
+
+    Returns:
+        List of shared strings in index order
+    """
+    strings = []
+    if "xl/sharedStrings.xml" not in archive.namelist():
+        return strings
+
+    with archive.open("xl/sharedStrings.xml") as part:
+        parts = []
+        in_phonetic = False
+        for event, elem in iterparse(part, events=("start", "end")):
+            tag = _local(elem.tag)
+            if tag == "rPh":
+                in_phonetic = event == "start"
+            elif event != "end":
+                continue
+            elif tag == "t" and not in_phonetic:
+                parts.append(elem.text or "")
+            elif tag == "si":
+                strings.append("".join(parts))
+                parts = []
+                elem.clear()
+                if limit is not None and len(strings) >= limit:
+                    break
+    return strings
+
+
+def _decode_header_value(cell_type: Optional[str], raw: Optional[str], shared: List[str]):
+    """Decode a single header cell value"""
+    if raw is None:
+        return None
+    if cell_type == "s":
+        return shared[int(raw)]
+    if cell_type in ("str", "inlineStr", "e"):
+        return raw
+    if cell_type == "b":
+        return raw == "1"
+    number = float(raw)
+    return int(number) if number.is_integer() else number
+
+
+def probe_sheet(archive: zipfile.ZipFile, sheet_path: str) -> Dict:
+    """
+    Read a worksheet's dimension and first row without parsing its data
+
+    Args:
+        archive: Open XLSX zip archive
+        sheet_path: Worksheet part path inside the archive
+
+    Returns:
+        Dictionary with approximate row/column counts and raw header cells
+    """
+    dimension = None
+    header_cells = []  # (column index, cell type, raw value)
+
+    with archive.open(sheet_path) as part:
+        cell_type = None
+        cell_col = 0
+        raw = None
+        in_row = False
+        for event, elem in iterparse(part, events=("start", "end")):
+            tag = _local(elem.tag)
+            if event == "start":
+                if tag == "row":
+                    in_row = True
+                elif tag == "c" and in_row:
+                    cell_type = elem.get("t")
+                    ref = elem.get("r")
+                    cell_col = parse_cell_ref(ref)[1] if ref else len(header_cells)
+                    raw = None
+                continue
+
+            if tag == "dimension":
+                dimension = elem.get("ref")
+            elif in_row and tag == "v":
+                raw = elem.text
+            elif in_row and tag == "t" and cell_type == "inlineStr":
+                raw = (raw or "") + (elem.text or "")
+            elif in_row and tag == "c":
+                header_cells.append((cell_col, cell_type, raw))
+            elif tag == "row":
+                break
+
+    rows = columns = None
+    if dimension:
+        bounds = dimension.split(":")
+        first_row, first_col = parse_cell_ref(bounds[0])
+        last_row, last_col = parse_cell_ref(bounds[-1])
+        rows = last_row - first_row + 1
+        columns = last_col - first_col + 1
+
+    return {
+        "dimension": dimension,
+        "rows": rows,
+        "columns": columns,
+        "header_cells": header_cells,
+    }
+
+
+def probe_workbook(file_path: Path) -> List[Dict]:
+    """
+    Read sheet names, approximate sizes and header rows of an XLSX workbook
+
+    Only the workbook manifest, each sheet's leading XML and the part of the
+    shared-strings table referenced by the headers are read.
+
+    Args:
+        file_path: Path to .xlsx/.xlsm file
+
+    Returns:
+        List of {"name", "state", "dimension", "rows", "columns", "header"}
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        sheets = read_sheet_manifest(archive)
+        for sheet in sheets:
+            sheet.update(probe_sheet(archive, sheet["path"]))
+
+        # Only resolve the shared strings the header rows actually use
+        needed = [
+            int(raw) for sheet in sheets
+            for _, cell_type, raw in sheet["header_cells"]
+            if cell_type == "s" and raw is not None
+        ]
+        shared = read_shared_strings(archive, limit=max(needed) + 1) if needed else []
+
+    for sheet in sheets:
+        cells = sheet.pop("header_cells")
+        header = [None] * (max(col for col, _, _ in cells) + 1 if cells else 0)
+        for col, cell_type, raw in cells:
+            header[col] = _decode_header_value(cell_type, raw, shared)
+        sheet["header"] = header
+
+    return sheets
+
+
+def normalize_header(header_row) -> List:
+    """
+    Build column names the same way pd.read_excel does
+
+    Blank headers become 'Unnamed: N' and duplicates get a '.N' suffix.
+    """
+    columns = []
+    seen = {}
+    for i, name in enumerate(header_row):
+        if name is None:
+            name = f"Unnamed: {i}"
+        base = name
+        if base in seen:
+            seen[base] += 1
+            name = f"{base}.{seen[base]}"
+            while name in seen:
+                seen[base] += 1
+                name = f"{base}.{seen[base]}"
+        seen[name] = 0
+        columns.append(name)
+    return columns
+
+
+def read_date_styles(archive: zipfile.ZipFile) -> Tuple[Set[int], Set[int]]:
+    """
+    Find cell style indexes whose number format displays a date or a duration
+
+    Returns:
+        (date style indexes, timedelta style indexes)
+    """
+    from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format, is_timedelta_format
+
+    date_styles, timedelta_styles = set(), set()
+    if "xl/styles.xml" not in archive.namelist():
+        return date_styles, timedelta_styles
+
+    custom_formats = {}
+    xf_formats = []
+    in_cell_xfs = False
+    with archive.open("xl/styles.xml") as part:
+        for event, elem in iterparse(part, events=("start", "end")):
+            tag = _local(elem.tag)
+            if tag == "cellXfs":
+                in_cell_xfs = event == "start"
+            elif event == "end" and tag == "numFmt":
+                custom_formats[int(elem.get("numFmtId"))] = elem.get("formatCode", "")
+            elif event == "end" and tag == "xf" and in_cell_xfs:
+                xf_formats.append(int(elem.get("numFmtId", 0)))
+
+    for style_id, fmt_id in enumerate(xf_formats):
+        fmt = custom_formats.get(fmt_id, BUILTIN_FORMATS.get(fmt_id))
+        if fmt and is_date_format(fmt):
+            date_styles.add(style_id)
+            if is_timedelta_format(fmt):
+                timedelta_styles.add(style_id)
+    return date_styles, timedelta_styles
+
+
+def read_date_epoch(archive: zipfile.ZipFile) -> np.datetime64:
+    """Get the workbook's date system epoch (1900 or 1904)"""
+    with archive.open("xl/workbook.xml") as workbook:
+        for _, elem in iterparse(workbook):
+            if _local(elem.tag) == "workbookPr":
+                if elem.get("date1904") in ("1", "true"):
+                    return _EPOCH_1904
+                break
+    return _EPOCH_1900
+
+
+def _serials_to_datetime(serials: np.ndarray, epoch: np.datetime64) -> np.ndarray:
+    """Convert Excel serial numbers to datetime64, rounding to milliseconds like openpyxl"""
+    days = np.floor(serials)
+    millis = np.round((serials - days) * 86400000).astype("int64")
+    if epoch == _EPOCH_1900:
+        # Excel's fictitious 1900-02-29 shifts serials below 60 by a day
+        days = np.where((serials > 0) & (serials < 60), days + 1, days)
+    return epoch + days.astype("int64").astype("timedelta64[D]") + millis.astype("timedelta64[ms]")
+
+
+class _SheetParser:
+    """
+    Incremental worksheet parser built on expat
+
+    Cell values are decoded into preallocated per-column arrays: a kind code,
+    a float64 value (numbers, dates, booleans) and, only for columns that
+    contain text, an object array. Rows are handed out in chunks.
+    """
+
+    def __init__(self, shared: List[str], date_styles: Set[int], timedelta_styles: Set[int],
+                 epoch: np.datetime64, chunk_rows: Optional[int], skip_blank_rows: bool,
+                 match_read_excel: bool = True):
+        self.shared = shared
+        self.date_styles = date_styles
+        self.timedelta_styles = timedelta_styles
+        self.epoch = epoch
+        self.chunk_rows = chunk_rows
+        self.skip_blank_rows = skip_blank_rows
+        self.match_read_excel = match_read_excel
+
+        self.header = None
+        self.header_cells = {}
+        self.capacity = chunk_rows or 1024
+        self.kinds = []
+        self.nums = []
+        self.objs = []
+        self.n_rows = 0
+        self.rows_flushed = 0
+        self.header_row_num = 0
+        self.ready = []
+
+        self._col_cache = {}
+        self._tag_cache = {}
+        self._row_slot = None
+        self._row_num = 0
+        self._in_row = False
+        self._cell_col = -1
+        self._cell_type = None
+        self._cell_style = None
+        self._text = None
+        self._collect = False
+
+        self.parser = expat.ParserCreate()
+        self.parser.buffer_text = True
+        self.parser.StartElementHandler = self._start
+        self.parser.EndElementHandler = self._end
+        self.parser.CharacterDataHandler = self._chars
+
+    def feed(self, data: bytes, final: bool = False):
+        self.parser.Parse(data, final)
+        if final and self.n_rows:
+            self.ready.append(self.flush())
+
+    # -- expat callbacks -------------------------------------------------
+
+    def _local_name(self, name: str) -> str:
+        tag = self._tag_cache[name] = name.rsplit(":", 1)[-1]
+        return tag
+
+    def _start(self, name, attrs):
+        tag = self._tag_cache.get(name) or self._local_name(name)
+        if tag == "c":
+            ref = attrs.get("r")
+            if ref:
+                letters = ref.rstrip("0123456789")
+                col = self._col_cache.get(letters)
+                if col is None:
+                    col = self._col_cache[letters] = column_index(letters)
+                self._cell_col = col
+            else:
+                self._cell_col += 1
+            self._cell_type = attrs.get("t")
+            self._cell_style = attrs.get("s")
+            self._text = None
+        elif tag == "v" or (tag == "t" and self._cell_type == "inlineStr"):
+            self._collect = True
+            if self._text is None:
+                self._text = ""
+        elif tag == "row":
+            self._in_row = True
+            self._row_slot = None
+            self._cell_col = -1
+            row_ref = attrs.get("r")
+            self._row_num = int(row_ref) if row_ref else self._row_num + 1
+        elif tag == "dimension" and not self.chunk_rows:
+            # Preallocate for the whole sheet when reading it in one piece
+            bounds = attrs.get("ref", "").split(":")
+            try:
+                rows = parse_cell_ref(bounds[-1])[0] - parse_cell_ref(bounds[0])[0]
+                self.capacity = max(self.capacity, rows)
+            except ValueError:
+                pass
+
+    def _chars(self, data):
+        if self._collect:
+            self._text += data
+
+    def _end(self, name):
+        tag = self._tag_cache.get(name) or self._local_name(name)
+        if tag == "c":
+            if self._text is not None and self._in_row:
+                self._store_cell(self._text)
+        elif tag == "v" or tag == "t":
+            self._collect = False
+        elif tag == "row":
+            self._in_row = False
+            if self.header is None:
+                if self.header_cells:
+                    width = max(self.header_cells) + 1
+                    self.header = [self.header_cells.get(i) for i in range(width)]
+                    self.header_row_num = self._row_num
+            elif self.chunk_rows and self.n_rows >= self.chunk_rows:
+                self.ready.append(self.flush())
+
+    # -- value storage ---------------------------------------------------
+
+    def _store_cell(self, text: str):
+        cell_type = self._cell_type
+        style = int(self._cell_style) if self._cell_style else 0
+
+        if cell_type is None or cell_type == "n":
+            value = float(text)
+            if style in self.date_styles:
+                kind = _TIMEDELTA if style in self.timedelta_styles else _DATE
+            else:
+                kind = _NUMBER
+        elif cell_type == "s":
+            value, kind = self.shared[int(text)], _TEXT
+        elif cell_type in ("str", "inlineStr"):
+            value, kind = text, _TEXT
+        elif cell_type == "b":
+            value, kind = float(text == "1"), _BOOL
+        elif cell_type == "d":
+            value, kind = datetime.fromisoformat(text.rstrip("Z")), _OBJECT
+        elif not self.match_read_excel:
+            # Error cells keep their code (#DIV/0! etc.), as openpyxl returns them
+            value, kind = text, _OBJECT
+        else:
+            # Error cells (#DIV/0! etc.) are read as missing, as pd.read_excel does
+            return
+
+        if self.header is None:
+            self.header_cells[self._cell_col] = self._header_value(value, kind)
+            return
+
+        slot = self._row_slot
+        if slot is None:
+            if self.skip_blank_rows:
+                slot = self.n_rows
+            else:
+                # Keep blank rows between data rows, as pd.read_excel does
+                slot = self._row_num - self.header_row_num - 1 - self.rows_flushed
+            self._row_slot = slot
+            self.n_rows = slot + 1
+            if slot >= self.capacity:
+                self._grow()
+
+        col = self._cell_col
+        if col >= len(self.kinds):
+            self._add_columns(col + 1)
+        self.kinds[col][slot] = kind
+        if kind == _TEXT or kind == _OBJECT:
+            objs = self.objs[col]
+            if objs is None:
+                objs = self.objs[col] = np.empty(self.capacity, dtype=object)
+            objs[slot] = value
+        else:
+            self.nums[col][slot] = value
+
+    def _header_value(self, value, kind):
+        if kind in (_NUMBER, _DATE, _TIMEDELTA):
+            if kind != _NUMBER:
+                from openpyxl.utils.datetime import from_excel
+                return from_excel(value, timedelta=kind == _TIMEDELTA)
+            return int(value) if value.is_integer() else value
+        if kind == _BOOL:
+            return bool(value)
+        return value
+
+    def _add_columns(self, count: int):
+        while len(self.kinds) < count:
+            self.kinds.append(np.zeros(self.capacity, dtype=np.uint8))
+            self.nums.append(np.full(self.capacity, np.nan))
+            self.objs.append(None)
+
+    def _grow(self):
+        old = self.capacity
+        self.capacity = max(old * 2, self.n_rows)
+        for i in range(len(self.kinds)):
+            kinds = np.zeros(self.capacity, dtype=np.uint8)
+            kinds[:old] = self.kinds[i]
+            self.kinds[i] = kinds
+            nums = np.full(self.capacity, np.nan)
+            nums[:old] = self.nums[i]
+            self.nums[i] = nums
+            if self.objs[i] is not None:
+                objs = np.empty(self.capacity, dtype=object)
+                objs[:old] = self.objs[i]
+                self.objs[i] = objs
+
+    # -- column assembly -------------------------------------------------
+
+    def flush(self) -> pd.DataFrame:
+        """Turn the buffered rows into a DataFrame and reset the buffers"""
+        n = self.n_rows
+        header = list(self.header or [])
+        width = max(len(header), len(self.kinds))
+        header += [None] * (width - len(header))
+
+        data = {}
+        for col in range(width):
+            if col < len(self.kinds):
+                data[col] = self._build_column(self.kinds[col][:n], self.nums[col][:n],
+                                               None if self.objs[col] is None else self.objs[col][:n])
+            else:
+                data[col] = np.full(n, np.nan)
+
+        frame = pd.DataFrame(data)
+        frame.columns = normalize_header(header)
+
+        self.capacity = self.chunk_rows or 1024
+        self.kinds, self.nums, self.objs = [], [], []
+        self.rows_flushed += n
+        self.n_rows = 0
+        return frame
+
+    def _build_column(self, kinds: np.ndarray, nums: np.ndarray, objs: Optional[np.ndarray]):
+        present = kinds != _EMPTY
+        found = set(np.unique(kinds[present]).tolist())
+
+        if not found:
+            return np.full(len(kinds), np.nan)
+
+        if found == {_BOOL} and present.all():
+            return nums.astype(bool)
+
+        # Booleans mixed with blanks or numbers are read as 1.0/0.0 by pd.read_excel
+        if found <= {_NUMBER, _BOOL} and (self.match_read_excel or _BOOL not in found):
+            if present.all() and np.array_equal(nums, np.trunc(nums)) and np.abs(nums).max() < 2 ** 63:
+                return nums.astype("int64")
+            return nums.copy()
+
+        if found == {_DATE} and not ((nums[present] >= 0) & (nums[present] < 1)).any():
+            dates = np.full(len(kinds), np.datetime64("NaT"), dtype="datetime64[ms]")
+            dates[present] = _serials_to_datetime(nums[present], self.epoch)
+            return pd.Series(dates).astype(_DATETIME_DTYPE)
+
+        # Mixed or text columns become object arrays of Python values
+        values = np.full(len(kinds), np.nan, dtype=object)
+        for kind in found:
+            mask = kinds == kind
+            if kind == _NUMBER:
+                values[mask] = [int(v) if v.is_integer() else v for v in nums[mask].tolist()]
+            elif kind == _BOOL:
+                values[mask] = [bool(v) for v in nums[mask].tolist()]
+            elif kind in (_DATE, _TIMEDELTA):
+                from openpyxl.utils.datetime import from_excel
+                epoch = datetime(1904, 1, 1) if self.epoch == _EPOCH_1904 else datetime(1899, 12, 30)
+                values[mask] = [from_excel(v, epoch, timedelta=kind == _TIMEDELTA) for v in nums[mask].tolist()]
+            else:
+                values[mask] = objs[mask]
+
+        if _TEXT in found and self.match_read_excel:
+            text = kinds == _TEXT
+            missing = np.fromiter((v in _NA_STRINGS for v in values[text]), dtype=bool, count=text.sum())
+            text_idx = np.flatnonzero(text)
+            values[text_idx[missing]] = np.nan
+
+            # Numeric-looking text is converted like pd.read_excel's parser does
+            if found <= {_TEXT, _NUMBER}:
+                series = pd.Series(values)
+                converted = pd.to_numeric(series, errors="coerce")
+                if converted.count() == series.count():
+                    if converted.notna().all() and (converted == converted.round()).all():
+                        return converted.astype("int64")
+                    return converted
+
+        return values
+
+
+def iter_sheet_frames(
+    file_path: Path,
+    sheet_name: Union[str, int] = 0,
+    chunk_rows: Optional[int] = None,
+    skip_blank_rows: bool = False,
+    match_read_excel: bool = True
+) -> Iterator[pd.DataFrame]:
+    """
+    Parse a worksheet with the streaming XML engine
+
+    The worksheet XML is streamed out of the zip and parsed incrementally,
+    the shared-strings table is resolved once, and numbers, booleans and
+    Excel serial dates are decoded column by column into numpy arrays.
+    The first non-blank row is the header.
+
+    Args:
+        file_path: Path to .xlsx/.xlsm file
+        sheet_name: Sheet name or zero-based sheet index
+        chunk_rows: Rows per yielded DataFrame (None yields the whole sheet)
+        skip_blank_rows: Drop fully blank rows instead of keeping them as
+            all-missing rows (trailing blank rows are always dropped)
+        match_read_excel: Convert values the way pd.read_excel does (missing-
+            value strings and error cells become NaN, numeric-looking text
+            becomes numbers, booleans mixed with numbers or blanks become
+            floats). False keeps cell values as openpyxl's row iterator
+            returns them, as ExcelLoader.iter_chunks does for both engines.
+
+    Yields:
+        DataFrames with the same columns and dtypes pd.read_excel produces
+        (or, without match_read_excel, pd.DataFrame.from_records on
+        openpyxl's values produces)
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        sheets = read_sheet_manifest(archive)
+        if isinstance(sheet_name, int):
+            if not 0 <= sheet_name < len(sheets):
+                raise ValueError(f"Worksheet index {sheet_name} is invalid, {len(sheets)} worksheets found")
+            sheet = sheets[sheet_name]
+        else:
+            sheet = next((s for s in sheets if s["name"] == sheet_name), None)
+            if sheet is None:
+                raise ValueError(f"Worksheet named '{sheet_name}' not found")
+
+        date_styles, timedelta_styles = read_date_styles(archive)
+        parser = _SheetParser(
+            read_shared_strings(archive),
+            date_styles,
+            timedelta_styles,
+            read_date_epoch(archive),
+            chunk_rows,
+            skip_blank_rows,
+            match_read_excel,
+        )
+
+        yielded = False
+        with archive.open(sheet["path"]) as part:
+            while True:
+                block = part.read(_FEED_BYTES)
+                parser.feed(block, final=not block)
+                while parser.ready:
+                    yielded = True
+                    yield parser.ready.pop(0)
+                if not block:
+                    break
+
+        if not yielded and chunk_rows is None:
+            # Header-only or empty sheet
+            yield parser.flush()
@@ -5,6 +5,8 @@ SQLite Manager - Main Entry Point
 A modern SQLite database manager with Excel upload capabilities.
 Built with CustomTkinter for a clean, shadcn/ui inspired interface.
 """
+import multiprocessing
+
 import customtkinter as ctk
 from ui.main_window import MainWindow
 
@@ -23,4 +25,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Required for the sheet-parsing process pool in frozen executables
+    multiprocessing.freeze_support()
     main()
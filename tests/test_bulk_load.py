@@ -0,0 +1,63 @@
+"""
+Indexes bulk_load drops must come back, even if the load never finishes
+"""
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from core.connection_pool import close_pool
+from core.db_manager import DatabaseManager
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "bulk.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE people (name TEXT, dept TEXT)")
+    conn.execute("CREATE INDEX idx_people_dept ON people (dept)")
+    conn.commit()
+    conn.close()
+    yield path
+    close_pool(path)
+
+
+def indexes(path):
+    with sqlite3.connect(path) as conn:
+        rows = conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'people'")
+        return [row[0] for row in rows]
+
+
+def test_failed_load_recreates_indexes(db_path):
+    db = DatabaseManager(db_path)
+    with pytest.raises(ValueError):
+        with db.bulk_load("people"):
+            assert indexes(db_path) == []
+            db.dataframe_to_table(pd.DataFrame({"name": ["a"], "dept": ["x"]}), "people", if_exists="append")
+            raise ValueError("bad chunk")
+
+    assert indexes(db_path) == ["idx_people_dept"]
+
+
+def test_crashed_load_recreates_indexes_on_open(db_path):
+    crash = (
+        "import os, sys\n"
+        "from core.db_manager import DatabaseManager\n"
+        "db = DatabaseManager(sys.argv[1])\n"
+        "with db.bulk_load('people'):\n"
+        "    os._exit(1)\n"
+    )
+    result = subprocess.run([sys.executable, "-c", crash, str(db_path)], cwd=ROOT)
+    assert result.returncode == 1
+    assert indexes(db_path) == []
+
+    DatabaseManager(db_path).get_connection()
+
+    assert indexes(db_path) == ["idx_people_dept"]
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM _deferred_indexes").fetchone()[0] == 0
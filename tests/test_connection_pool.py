@@ -0,0 +1,76 @@
+"""
+ConnectionPool's shared writer, pooled readers and change versions
+"""
+import sqlite3
+
+import pytest
+
+from core.connection_pool import ConnectionPool
+
+
+@pytest.fixture
+def pool(tmp_path):
+    path = tmp_path / "pool.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE t (x INTEGER)")
+    conn.commit()
+    conn.close()
+    pool = ConnectionPool(path, max_idle_readers=1)
+    yield pool
+    pool.close()
+
+
+def test_writer_is_shared_and_private_writers_are_not(pool):
+    assert pool.writer() is pool.writer()
+    private = pool.open_writer()
+    try:
+        assert private is not pool.writer()
+    finally:
+        private.close()
+
+
+def test_readers_are_read_only_and_reused(pool):
+    with pool.reader() as first:
+        with pytest.raises(sqlite3.OperationalError):
+            first.execute("INSERT INTO t VALUES (1)")
+    with pool.reader() as second:
+        assert second is first
+        # Two at once: the second is opened, then closed beyond max_idle_readers
+        with pool.reader() as third:
+            assert third is not second
+    assert pool.stats()["live"] == 1
+
+
+def test_snapshot_reader_sees_one_state(pool):
+    # Readers only run alongside commits in WAL mode
+    pool.set_wal(True)
+    with pool.reader(snapshot=True) as conn:
+        before = conn.execute("SELECT COUNT(*) FROM t").fetchone()[0]
+        with pool.writer() as writer:
+            writer.execute("INSERT INTO t VALUES (1)")
+        assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == before
+
+
+def test_versions_change_on_commits_but_not_bookkeeping(pool):
+    start = pool.versions()
+    with pool.writer() as writer:
+        writer.execute("INSERT INTO t VALUES (1)")
+    data = pool.versions()
+    assert data[0] == start[0] and data[1] != start[1]
+
+    with pool.bookkeeping_write():
+        with pool.writer() as writer:
+            writer.execute("CREATE TABLE catalog (x INTEGER)")
+    assert pool.versions() == data
+
+    with pool.writer() as writer:
+        writer.execute("INSERT INTO t VALUES (2)")
+    assert pool.versions() != data
+
+
+def test_closed_pool_refuses_connections(pool):
+    pool.close()
+    with pytest.raises(RuntimeError):
+        pool.writer()
+    with pytest.raises(RuntimeError):
+        pool.open_writer()
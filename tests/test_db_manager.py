@@ -0,0 +1,110 @@
+"""
+DatabaseManager's write paths: bulk insert, merge, incremental import and
+date window replacement
+"""
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from core.connection_pool import close_pool
+from core.db_manager import ROW_HASH_COLUMN, DatabaseManager, date_key_index_name, read_stats
+
+
+@pytest.fixture
+def db(tmp_path):
+    path = tmp_path / "manager.db"
+    sqlite3.connect(path).close()
+    yield DatabaseManager(path)
+    close_pool(path)
+
+
+def rows(db, sql):
+    with db.reader() as conn:
+        return conn.execute(sql).fetchall()
+
+
+def test_chunks_are_inserted_in_batches(db):
+    df = pd.DataFrame({"id": range(10), "name": [f"n{i}" if i % 4 else None for i in range(10)]})
+    df["score"] = [i / 2 if i % 3 else None for i in range(10)]
+
+    inserted = db.dataframe_to_table([df.iloc[:7], df.iloc[7:]], "people", chunk_size=3)
+
+    assert inserted == 10
+    assert rows(db, "SELECT id, name, score FROM people WHERE id IN (0, 1, 3)") == [
+        (0, None, None), (1, "n1", 0.5), (3, "n3", None)
+    ]
+    with db.reader() as conn:
+        stats = read_stats(conn, ["people"])["people"]
+    assert stats["row_count"] == 10 and stats["fresh"]
+
+
+def test_failed_chunk_rolls_back_the_whole_insert(db):
+    def chunks():
+        yield pd.DataFrame({"id": [1, 2]})
+        raise ValueError("bad chunk")
+
+    with pytest.raises(ValueError):
+        db.dataframe_to_table(chunks(), "people")
+
+    assert not db.table_exists("people")
+
+
+def test_merge_updates_only_changed_rows(db):
+    db.dataframe_to_table(pd.DataFrame({"id": [1, 2, 3], "name": ["a", "b", None]}), "people")
+
+    counts = db.merge_dataframe(pd.DataFrame({"id": [2, 3, 4], "name": ["b", "c", "d"]}), "people", ["id"])
+
+    assert counts == {"inserted": 1, "updated": 1, "unchanged": 1}
+    assert rows(db, "SELECT id, name FROM people ORDER BY id") == [(1, "a"), (2, "b"), (3, "c"), (4, "d")]
+
+
+def test_merge_needs_key_columns(db):
+    with pytest.raises(ValueError):
+        db.merge_dataframe(pd.DataFrame({"id": [1]}), "people", [])
+
+
+def test_incremental_insert_skips_rows_already_loaded(db):
+    first = pd.DataFrame({"id": [1, 2], "name": ["a", "b"]})
+    assert db.incremental_insert(first, "people") == {"inserted": 2, "skipped": 0}
+
+    again = pd.DataFrame({"id": [1, 2, 3, 3], "name": ["a", "b", "c", "c"]})
+    assert db.incremental_insert(again, "people") == {"inserted": 2, "skipped": 2}
+    assert rows(db, "SELECT id FROM people ORDER BY id") == [(1,), (2,), (3,), (3,)]
+
+
+def test_ensure_row_hash_hashes_rows_written_elsewhere(db):
+    db.dataframe_to_table(pd.DataFrame({"id": [1, 2], "name": ["a", "b"]}), "people")
+
+    db.ensure_row_hash("people")
+    db.get_connection().commit()
+
+    assert rows(db, f"SELECT COUNT(*) FROM people WHERE {ROW_HASH_COLUMN} IS NULL") == [(0,)]
+    assert db.incremental_insert(pd.DataFrame({"id": [2], "name": ["b"]}), "people") == {"inserted": 0, "skipped": 1}
+
+
+def test_replace_date_window_replaces_only_covered_days(db):
+    old = pd.DataFrame({
+        "day": ["2025-01-01", "2025-01-02", "2025-01-02", "2025-01-03", "2025-01-04"],
+        "amount": [1, 2, 3, 4, 5],
+    })
+    db.dataframe_to_table(old, "sales")
+    new = [
+        pd.DataFrame({"day": ["2025-01-03"], "amount": [30]}),
+        pd.DataFrame({"day": ["2025-01-02", "2025-01-02 18:00:00"], "amount": [20, 21]}),
+    ]
+
+    result = db.replace_date_window("sales", "day", new)
+
+    assert result == {"deleted": 3, "inserted": 3, "min_date": "2025-01-02", "max_date": "2025-01-03"}
+    assert rows(db, "SELECT day, amount FROM sales ORDER BY day, amount") == [
+        ("2025-01-01", 1), ("2025-01-02", 20), ("2025-01-02 18:00:00", 21), ("2025-01-03", 30), ("2025-01-04", 5)
+    ]
+    assert rows(db, f"SELECT 1 FROM sqlite_master WHERE name = '{date_key_index_name('sales', 'day')}'") == [(1,)]
+
+
+def test_delete_by_date_range_matches_numbers_and_text(db):
+    db.dataframe_to_table(pd.DataFrame({"day": [20250101, 20250102, 20250103], "amount": [1, 2, 3]}), "sales")
+
+    assert db.delete_by_date_range("sales", "day", "2025-01-02", "20250103") == 2
+    assert rows(db, "SELECT amount FROM sales") == [(1,)]
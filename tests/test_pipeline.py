@@ -0,0 +1,78 @@
+"""
+run_pipelined must bound the items in flight and carry failures across threads
+"""
+import threading
+import time
+
+import pytest
+
+from core.pipeline import PipelineCancelled, run_pipelined
+
+
+def test_queue_bounds_items_ahead_of_the_consumer():
+    produced = []
+    ahead = []
+
+    def items():
+        for i in range(20):
+            produced.append(i)
+            yield i
+
+    def consume(stream):
+        consumed = 0
+        for _ in stream:
+            consumed += 1
+            time.sleep(0.005)
+            ahead.append(len(produced) - consumed)
+        return consumed
+
+    assert run_pipelined(items(), consume, queue_size=2) == 20
+    # At most queue_size items wait, plus the one the producer is putting
+    assert max(ahead) <= 3
+
+
+def test_producer_error_cancels_the_consumer():
+    seen = {}
+
+    def items():
+        yield 1
+        raise ValueError("bad sheet")
+
+    def consume(stream):
+        try:
+            for _ in stream:
+                pass
+        except PipelineCancelled as e:
+            seen["cancelled"] = e
+            raise
+
+    with pytest.raises(ValueError, match="bad sheet"):
+        run_pipelined(items(), consume)
+    assert isinstance(seen["cancelled"].__cause__, ValueError)
+
+
+def test_consumer_error_stops_the_producer():
+    produced = []
+    closed = threading.Event()
+
+    def items():
+        try:
+            for i in range(1000):
+                produced.append(i)
+                yield i
+        finally:
+            closed.set()
+
+    def consume(stream):
+        next(iter(stream))
+        raise RuntimeError("disk full")
+
+    with pytest.raises(RuntimeError, match="disk full"):
+        run_pipelined(items(), consume, queue_size=2)
+    assert len(produced) < 1000
+    assert closed.is_set()
+
+
+def test_queue_size_must_be_positive():
+    with pytest.raises(ValueError):
+        run_pipelined([], list, queue_size=0)
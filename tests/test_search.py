@@ -0,0 +1,73 @@
+"""
+Searches through the FTS5 index must find the same rows as LIKE
+"""
+import sqlite3
+
+import pytest
+
+from core.db_manager import DatabaseManager
+from core.table_query import SearchCache, search_clause, search_uses_index
+
+NAMES = [
+    "Éclair", "éclair", "ÉCLAIR", "eclair",
+    "Ärger", "ärger", "ÄRGER",
+    "Straße", "STRASSE",
+    "Kim Minjun", "KIM", "kimchi",
+    "김민준", "김민서",
+]
+
+
+@pytest.fixture
+def db(tmp_path):
+    path = tmp_path / "search.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE people (name TEXT, city TEXT)")
+    conn.executemany("INSERT INTO people VALUES (?, ?)", [(name, "Seoul") for name in NAMES])
+    conn.commit()
+    conn.close()
+    return DatabaseManager(path)
+
+
+def search(db, text, search_index):
+    where, params = search_clause(["name", "city"], text, "rowid", search_index)
+    with db.reader() as conn:
+        return sorted(row[0] for row in conn.execute(f"SELECT name FROM people WHERE {where}", params))
+
+
+@pytest.mark.parametrize("text", ["écl", "ÉCL", "ärg", "ÄRGER", "ße", "김민", "kim", "KIM", "clair"])
+def test_index_matches_like(db, text):
+    index = db.build_search_index("people")
+    assert search(db, text, index) == search(db, text, None)
+
+
+def test_non_ascii_terms_use_like(db):
+    index = db.build_search_index("people")
+    assert search_uses_index("kim", "rowid", index)
+    assert not search_uses_index("écl", "rowid", index)
+    assert not search_uses_index("김민", "rowid", index)
+    assert search(db, "écl", index) == ["éclair"]
+
+
+def test_search_cache_survives_restarted_versions(db):
+    cache = SearchCache(db.pool)
+    cache.put("people", "kim", (5, 9), [10, 11, 12])
+    assert cache.matches("people", ["name"], "rowid", "kim", (5, 9)) == ("[10,11,12]", 3)
+
+    # A reopened watcher connection counts data_version from 1 again
+    assert cache.matches("people", ["name"], "rowid", "kim", (5, 1)) is None
+    cache.put("people", "kim", (5, 1), [10])
+    assert cache.matches("people", ["name"], "rowid", "kim", (5, 1)) == ("[10]", 1)
+
+    # A late put for versions no longer current isn't kept
+    cache.put("people", "lee", (5, 9), [13])
+    assert cache.matches("people", ["name"], "rowid", "lee", (5, 1)) is None
+
+
+def test_drop_search_index_removes_table_and_triggers(db):
+    db.build_search_index("people")
+    db.drop_search_index("people")
+
+    assert db.search_index("people") is None
+    with db.reader() as conn:
+        assert conn.execute("SELECT name FROM sqlite_master WHERE name LIKE '\\_fts\\_%' ESCAPE '\\'").fetchall() == []
+    assert search(db, "kim", None) == ["KIM", "Kim Minjun", "kimchi"]
@@ -0,0 +1,83 @@
+"""
+Keyset pages must hold the same rows as LIMIT/OFFSET pages
+"""
+import sqlite3
+
+import pytest
+
+from core.table_query import TableQuery, column_kind, filter_clause, plan_index
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE t (name TEXT, score INTEGER)")
+    conn.executemany(
+        "INSERT INTO t VALUES (?, ?)",
+        [(f"n{i}", None if i % 9 == 0 else i % 13) for i in range(300)]
+    )
+    conn.execute("DELETE FROM t WHERE rowid % 5 = 0")
+    yield conn
+    conn.close()
+
+
+def offset_pages(query, conn, size):
+    pages, offset = [], 0
+    while True:
+        page = query.fetch_page(conn, None, "from", size, offset=offset)
+        if not page:
+            return pages
+        pages.append(page)
+        offset += size
+
+
+@pytest.mark.parametrize("sort_column", [None, "score", "name"])
+@pytest.mark.parametrize("descending", [False, True])
+@pytest.mark.parametrize("where", ["", "score IS NULL OR score > 4"])
+def test_keyset_pages_match_offset_pages(conn, sort_column, descending, where):
+    query = TableQuery("t", ["name", "score"], where=where, sort_column=sort_column, descending=descending)
+    expected = offset_pages(query, conn, 17)
+
+    # Forwards from each page's last row
+    pages = [query.fetch_page(conn, None, "from", 17)]
+    while len(pages[-1]) == 17:
+        pages.append(query.fetch_page(conn, query.row_key(pages[-1][-1]), "next", 17))
+    assert [page for page in pages if page] == expected
+
+    # Backwards from each page's first row
+    for before, page in zip(expected, expected[1:]):
+        assert query.fetch_page(conn, query.row_key(page[0]), "prev", 17) == before
+
+
+def test_unsorted_seek_skips_rows_past_key(conn):
+    query = TableQuery("t", ["name", "score"])
+    start = query.fetch_page(conn, None, "from", 10, offset=40)[0]
+
+    rows = query.fetch_page(conn, query.row_key(start), "from", 10, offset=25)
+
+    assert rows == query.fetch_page(conn, None, "from", 10, offset=65)
+
+
+def test_time_filters_match_whole_seconds():
+    shifts = sqlite3.connect(":memory:")
+    shifts.execute("CREATE TABLE shifts (start TIME)")
+    shifts.executemany("INSERT INTO shifts VALUES (?)", [("09:30:00.000000",), ("09:30:00",), ("09:30:01",), ("23:59:59.5",)])
+
+    assert column_kind("TIME") == "time"
+    for operator, value, expected in [
+        ("=", "09:30", 2), (">", "09:30:00", 2), ("between", "09:30, 23:59:59", 4), ("in", "09:30:01, 23:59:59", 2),
+    ]:
+        clause, params = filter_clause("start", "TIME", operator, value)
+        assert shifts.execute(f"SELECT COUNT(*) FROM shifts WHERE {clause}", params).fetchone()[0] == expected
+
+
+def test_in_values_may_quote_commas():
+    clause, params = filter_clause("city", "TEXT", "in", '"Seoul, Korea", Busan,, "Daegu"')
+    assert params == ["Seoul, Korea", "Busan", "Daegu"]
+
+
+def test_plan_index_ignores_lookups_driven_by_a_rowid_list():
+    plan = ["SEARCH t USING INTEGER PRIMARY KEY (rowid=?)", "LIST SUBQUERY 1", "SCAN json_each VIRTUAL TABLE INDEX 1:"]
+    assert plan_index(plan) == plan[0]
+    assert plan_index(plan, rowid_subquery=True) is None
+    assert plan_index(["SEARCH t USING INDEX ix (n=? AND rowid=?)"] + plan[1:], rowid_subquery=True).endswith("(n=? AND rowid=?)")
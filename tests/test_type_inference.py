@@ -0,0 +1,83 @@
+"""
+Every chunk of a sheet must fit the dtype plan made from the first one
+"""
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from core.type_inference import apply_dtype_plan, plan_dtypes
+
+
+def test_plan_is_wide_enough_for_later_chunks():
+    first = pd.DataFrame({
+        "id": [1, 2, None],
+        "amount": [1.5, 2.0, 3.25],
+        "flag": [True, False, None],
+        "when": [datetime(2025, 1, 1), datetime(2025, 1, 2), None],
+        "code": ["001", "002", "003"],
+        "empty": [None, None, None],
+    })
+    plan = plan_dtypes(first)
+    assert plan["id"] == "Int64"
+    assert plan["amount"] == "float64"
+    assert plan["flag"] == "boolean"
+    assert plan["when"].startswith("datetime64")
+    assert plan["code"] == plan["empty"] == "object"
+
+    later = pd.DataFrame({
+        "id": [2 ** 40, None, 7],
+        "amount": [10, None, 11],
+        "flag": [False, None, True],
+        "when": ["2025-03-01", None, "2025-03-02T10:00:00"],
+        "code": [4, None, "005"],
+        "empty": ["x", None, None],
+    })
+    df, fallbacks = apply_dtype_plan(later, plan)
+
+    assert fallbacks == []
+    assert {col: str(df[col].dtype) for col in df.columns} == plan
+    assert df["id"].tolist() == [2 ** 40, pd.NA, 7]
+    assert df["when"].iloc[1] is pd.NaT
+    assert df["code"].tolist() == [4, None, "005"]
+
+
+def test_values_that_dont_fit_the_plan_fall_back_to_text():
+    plan = {"id": "Int64", "amount": "float64", "flag": "boolean", "when": "datetime64[us]"}
+    chunk = pd.DataFrame({
+        "id": [1.5, 2.0],
+        "amount": ["1.5", "n/a"],
+        "flag": [True, "yes"],
+        "when": ["2025-01-01", "soon"],
+    })
+
+    df, fallbacks = apply_dtype_plan(chunk, plan)
+
+    assert fallbacks == ["id", "amount", "flag", "when"]
+    assert df["id"].tolist() == ["1.5", "2.0"]
+    assert df["amount"].tolist() == ["1.5", "n/a"]
+    assert df["flag"].tolist() == ["True", "yes"]
+
+
+@pytest.mark.parametrize("dtype", ["Int64", "float64"])
+def test_datetime_chunk_in_numeric_column_falls_back_to_text(dtype):
+    chunk = pd.DataFrame({"value": pd.to_datetime(["2025-01-01", None])})
+
+    df, fallbacks = apply_dtype_plan(chunk, {"value": dtype})
+
+    assert fallbacks == ["value"]
+    assert df["value"].tolist() == ["2025-01-01 00:00:00", None]
+
+
+def test_non_text_chunks_fall_back_to_text():
+    plan = plan_dtypes(pd.DataFrame({"when": ["2025-01-01", "2025-01-02"], "amount": [1.5, 2.5]}))
+    chunk = pd.DataFrame({
+        "when": pd.Categorical(["x", "y"]),
+        "amount": pd.to_timedelta([1, 2], unit="D"),
+    })
+
+    df, fallbacks = apply_dtype_plan(chunk, plan)
+
+    assert fallbacks == ["when", "amount"]
+    assert df["when"].tolist() == ["x", "y"]
+    assert df["amount"].tolist() == ["1 days 00:00:00", "2 days 00:00:00"]
@@ -0,0 +1,66 @@
+"""
+An aborted upload must leave no rows, even if the UI commits meanwhile
+"""
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from core.connection_pool import close_pool
+from core.db_manager import DatabaseManager
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "upload.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE other (x INTEGER)")
+    conn.commit()
+    conn.close()
+    yield path
+    close_pool(path)
+
+
+def test_aborted_upload_leaves_no_rows(db_path):
+    upload = DatabaseManager(db_path, private_writer=True)
+    ui_errors = []
+
+    def drop_other():
+        # The UI thread commits through the pool's shared writer mid-upload
+        try:
+            DatabaseManager(db_path).drop_table("other")
+        except Exception as e:
+            ui_errors.append(e)
+
+    ui = threading.Thread(target=drop_other)
+
+    def chunks():
+        yield pd.DataFrame({"id": range(1000), "name": [f"row {i}" for i in range(1000)]})
+        ui.start()
+        time.sleep(0.2)
+        raise ValueError("bad sheet")
+
+    with pytest.raises(ValueError, match="bad sheet"):
+        upload.pipelined_insert(chunks(), "sheet", if_exists="replace")
+    upload.close()
+    ui.join()
+
+    assert not ui_errors
+    with sqlite3.connect(db_path) as conn:
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        assert "other" not in tables
+        if "sheet" in tables:
+            assert conn.execute("SELECT COUNT(*) FROM sheet").fetchone()[0] == 0
+
+
+def test_closing_the_pool_keeps_a_private_writer(db_path):
+    upload = DatabaseManager(db_path, private_writer=True)
+    upload.dataframe_to_table(pd.DataFrame({"id": [1, 2]}), "kept")
+    close_pool(db_path)
+    upload.dataframe_to_table(pd.DataFrame({"id": [3]}), "kept", if_exists="append")
+    upload.close()
+
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM kept").fetchone()[0] == 3
@@ -0,0 +1,54 @@
+"""
+The openpyxl and sax engines must stream identical chunks
+"""
+from datetime import datetime
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+from core.excel_loader import ExcelLoader
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    path = tmp_path / "engines.xlsx"
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["id", "code", "missing", "flag", "flag_blank", "flag_number", "when", "amount", "note", "error"])
+    for i in range(25):
+        ws.append([
+            i,
+            f"{i:05d}",                          # leading zeros stay text
+            "n/a" if i % 3 == 0 else f"v{i}",    # NA-looking text stays text
+            i % 2 == 0,
+            (i % 2 == 0) if i % 4 else None,
+            (i % 2 == 0) if i % 5 else i,
+            datetime(2025, 1, 1 + i % 28) if i < 10 else f"2025-02-{1 + i % 28:02d}",
+            i * 1.25 if i % 7 else None,
+            "12" if i == 3 else None,
+            "#DIV/0!" if i == 4 else i,
+        ])
+        if i == 12:
+            ws.append([None] * 10)  # blank rows are skipped by both engines
+    wb.save(path)
+    return path
+
+
+@pytest.mark.parametrize("chunk_rows", [7, 10, 100])
+def test_engines_stream_equal_chunks(workbook, chunk_rows):
+    openpyxl_chunks = list(ExcelLoader(engine="openpyxl").iter_chunks(workbook, chunk_rows=chunk_rows))
+    sax_chunks = list(ExcelLoader(engine="sax").iter_chunks(workbook, chunk_rows=chunk_rows))
+
+    assert [len(chunk) for chunk in openpyxl_chunks] == [len(chunk) for chunk in sax_chunks]
+    for expected, actual in zip(openpyxl_chunks, sax_chunks):
+        pd.testing.assert_frame_equal(actual, expected)
+
+
+def test_chunked_values_are_not_coerced(workbook):
+    for engine in ("openpyxl", "sax"):
+        df = pd.concat(ExcelLoader(engine=engine).iter_chunks(workbook, chunk_rows=10), ignore_index=True)
+        assert df["code"].iloc[1] == "00001"
+        assert df["missing"].iloc[0] == "n/a"
+        assert str(df["flag"].dtype) == "boolean"
+        assert df["error"].iloc[4] == "#DIV/0!"
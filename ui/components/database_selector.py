@@ -11,7 +11,7 @@ from ui.styles import Colors, Styles
 class DatabaseSelector(ctk.CTkFrame):
     """Database information card with quick actions"""
 
-    def __init__(self, parent, on_db_selected_callback=None):
+    def __init__(self, parent, on_db_selected_callback=None, is_busy_callback=None):
         super().__init__(
             parent,
             corner_radius=Styles.CORNER_RADIUS,
@@ -21,6 +21,8 @@ class DatabaseSelector(ctk.CTkFrame):
         )
 
         self.on_db_selected = on_db_selected_callback
+        # Returns True while an upload is running (journal mode can't change)
+        self.is_busy = is_busy_callback
         self.current_db_path = None
 
         self.setup_ui()
@@ -80,6 +82,18 @@ class DatabaseSelector(ctk.CTkFrame):
         )
         self.tables_label.pack(side="left")
 
+        # Opt-in WAL mode: lets tables be browsed while an upload is running
+        self.wal_var = ctk.BooleanVar(value=False)
+        self.wal_switch = ctk.CTkSwitch(
+            self.stats_frame,
+            text="WAL mode",
+            variable=self.wal_var,
+            command=self.toggle_wal,
+            font=(Styles.FONT_FAMILY, Styles.FONT_SIZE_SM),
+            text_color=Colors.TEXT_MUTED
+        )
+        self.wal_switch.pack(side="right")
+
     def load_database(self, db_path):
         """Load and display database information"""
         self.current_db_path = db_path
@@ -103,20 +117,42 @@ class DatabaseSelector(ctk.CTkFrame):
         self.size_label.configure(text=f"Size: {size_str}")
 
         # Get table count
-        from core.db_manager import DatabaseManager
+        from core.db_manager import DatabaseManager, user_tables
         try:
             db = DatabaseManager(db_path)
-            conn = db.get_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type='table'")
-            table_count = cursor.fetchone()[0]
+            with db.reader() as conn:
+                table_count = len(user_tables(conn))
             self.tables_label.configure(text=f"Tables: {table_count}")
+
+            # Reflect the journal mode stored in the file
+            db.get_connection()
+            self.wal_var.set(bool(db.pool.wal))
         except Exception as e:
             self.tables_label.configure(text=f"Error: {str(e)[:30]}")
 
         # Save to recent databases
         self.save_recent_database(db_path)
 
+    def toggle_wal(self):
+        """Switch the current database between WAL and rollback journal mode"""
+        if not self.current_db_path:
+            self.wal_var.set(False)
+            return
+
+        from tkinter import messagebox
+        from core.db_manager import DatabaseManager
+
+        enabled = self.wal_var.get()
+        if self.is_busy and self.is_busy():
+            self.wal_var.set(not enabled)
+            messagebox.showwarning("Upload Running", "The journal mode can't change while an upload is running.")
+            return
+        try:
+            DatabaseManager(self.current_db_path).pool.set_wal(enabled)
+        except Exception as e:
+            self.wal_var.set(not enabled)
+            messagebox.showerror("Error", f"Failed to change journal mode:\n{str(e)}")
+
     def save_recent_database(self, db_path):
         """Save database to recent list"""
         config_dir = Path(__file__).parent.parent.parent / "config"
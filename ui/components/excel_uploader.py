@@ -2,22 +2,36 @@
 Excel Uploader Component
 Upload Excel files to database
 """
+import queue
+import threading
 import customtkinter as ctk
 from tkinter import filedialog, messagebox
 from pathlib import Path
 from ui.styles import Colors, Styles
 
+# Milliseconds between checks for progress from the upload thread
+PROGRESS_POLL_INTERVAL = 100
+
+
+class UploadCancelled(Exception):
+    """Raised when the user cancels an upload in progress"""
+
 
 class ExcelUploader(ctk.CTkToplevel):
     """Excel upload dialog"""
 
-    def __init__(self, parent, db_path, on_complete_callback=None):
+    def __init__(self, parent, db_path, on_complete_callback=None, on_busy_callback=None):
         super().__init__(parent)
 
         self.db_path = db_path
         self.on_complete = on_complete_callback
+        # Called with True when an upload starts and False when it ends
+        self.on_busy = on_busy_callback
         self.excel_file = None
         self.sheet_names = []
+        self.uploading = False
+        self.upload_task = None
+        self.poll_job = None
 
         # Window configuration
         self.title("Upload Excel File")
@@ -27,10 +41,13 @@ class ExcelUploader(ctk.CTkToplevel):
         # Set appearance
         ctk.set_appearance_mode("dark")
 
-        # Make modal
+        # Make modal (the grab is released while a WAL upload runs, see upload)
         self.transient(parent)
         self.grab_set()
 
+        # Closing the window cancels a running upload instead of abandoning it
+        self.protocol("WM_DELETE_WINDOW", self.cancel)
+
         self.setup_ui()
 
     def setup_ui(self):
@@ -150,6 +167,34 @@ class ExcelUploader(ctk.CTkToplevel):
         )
         fail_radio.pack(anchor="w", pady=2)
 
+        incremental_radio = ctk.CTkRadioButton(
+            radio_frame,
+            text="Append new rows only (skip rows already loaded)",
+            variable=self.if_exists_var,
+            value="incremental",
+            font=(Styles.FONT_FAMILY, Styles.FONT_SIZE_SM),
+            text_color=Colors.TEXT_PRIMARY
+        )
+        incremental_radio.pack(anchor="w", pady=2)
+
+        merge_radio = ctk.CTkRadioButton(
+            radio_frame,
+            text="Merge (update changed rows, insert new ones) on key columns:",
+            variable=self.if_exists_var,
+            value="merge",
+            font=(Styles.FONT_FAMILY, Styles.FONT_SIZE_SM),
+            text_color=Colors.TEXT_PRIMARY
+        )
+        merge_radio.pack(anchor="w", pady=2)
+
+        self.key_columns_entry = ctk.CTkEntry(
+            radio_frame,
+            placeholder_text="e.g. emp_id or emp_id, work_date",
+            height=Styles.INPUT_HEIGHT,
+            font=(Styles.FONT_FAMILY, Styles.FONT_SIZE_SM)
+        )
+        self.key_columns_entry.pack(fill="x", padx=(28, 0), pady=(2, 0))
+
         # Progress bar
         self.progress = ctk.CTkProgressBar(
             container,
@@ -212,12 +257,14 @@ class ExcelUploader(ctk.CTkToplevel):
 
     def load_sheets(self):
         """Load sheet names from Excel file"""
-        from core.excel_loader import load_excel_file
+        from core.excel_loader import ExcelLoader, get_parse_cache
 
         try:
-            # Load Excel file to get sheet names
-            sheets_data = load_excel_file(self.excel_file)
-            self.sheet_names = list(sheets_data.keys())
+            # Probe workbook metadata only; sheet data is read during upload
+            info = ExcelLoader(cache=get_parse_cache()).get_excel_info(Path(self.excel_file))
+            if "error" in info:
+                raise ValueError(info["error"])
+            self.sheet_names = info["sheet_names"]
 
             # Show sheet selection
             self.sheet_frame.pack(fill="both", expand=True, pady=(0, 20))
@@ -228,13 +275,19 @@ class ExcelUploader(ctk.CTkToplevel):
 
             # Create checkbox for each sheet
             self.sheet_vars = {}
-            for sheet_name in self.sheet_names:
+            for sheet in info["sheets"]:
+                sheet_name = sheet["name"]
                 var = ctk.BooleanVar(value=True)
                 self.sheet_vars[sheet_name] = var
 
+                label = sheet_name
+                if sheet["row_count"] is not None:
+                    approx = "" if sheet["cached"] else "~"
+                    label += f"  ({approx}{sheet['row_count']:,} rows, {sheet['column_count']} cols)"
+
                 cb = ctk.CTkCheckBox(
                     self.sheet_scroll,
-                    text=sheet_name,
+                    text=label,
                     variable=var,
                     font=(Styles.FONT_FAMILY, Styles.FONT_SIZE_SM),
                     text_color=Colors.TEXT_PRIMARY
@@ -262,60 +315,176 @@ class ExcelUploader(ctk.CTkToplevel):
             messagebox.showwarning("No Sheets", "Please select at least one sheet to import.")
             return
 
+        if_exists = self.if_exists_var.get()
+        key_columns = [col.strip() for col in self.key_columns_entry.get().split(",") if col.strip()]
+        if if_exists == "merge" and not key_columns:
+            messagebox.showwarning("No Key Columns", "Please enter the key column(s) to merge on.")
+            return
+
         # Show progress
         self.progress.pack(fill="x", pady=(0, 5))
         self.progress_label.pack(fill="x")
+        self.progress.set(0.1)
 
         # Disable buttons
         self.upload_btn.configure(state="disabled")
+        self.set_uploading(True)
+
+        # Parsing and inserting run on a worker thread; progress comes back
+        # through the task's queue and cancellation goes out through its event
+        task = {"stop": threading.Event(), "progress": queue.Queue()}
+        self.upload_task = task
+        threading.Thread(
+            target=self._run_upload,
+            args=(task, self.excel_file, selected_sheets, if_exists, key_columns),
+            name="excel-upload",
+            daemon=True
+        ).start()
+        self.poll_job = self.after(PROGRESS_POLL_INTERVAL, lambda: self.poll_upload(task))
+
+        # With WAL, readers aren't blocked by the load, so the rest of the
+        # app stays usable; this dialog still blocks a second upload
+        if self._uses_wal():
+            self.grab_release()
+
+    def set_uploading(self, uploading):
+        """Track whether an upload runs and tell the main window"""
+        self.uploading = uploading
+        if self.on_busy:
+            self.on_busy(uploading)
+
+    def _uses_wal(self) -> bool:
+        """Whether the target database is in WAL mode"""
+        from core.db_manager import DatabaseManager
 
         try:
-            from core.excel_loader import load_excel_file
-            from core.db_manager import DatabaseManager
-
-            # Load Excel data
-            self.progress_label.configure(text="Loading Excel file...")
-            self.progress.set(0.2)
-            self.update()
-
-            sheets_data = load_excel_file(self.excel_file)
-
-            # Upload each selected sheet
             db = DatabaseManager(self.db_path)
-            if_exists = self.if_exists_var.get()
-
-            total = len(selected_sheets)
-            for i, sheet_name in enumerate(selected_sheets):
-                self.progress_label.configure(text=f"Uploading {sheet_name}...")
-                self.progress.set(0.2 + (0.7 * (i / total)))
-                self.update()
+            db.get_connection()
+            return bool(db.pool.wal)
+        except Exception:
+            return False
 
-                df = sheets_data[sheet_name]
-                db.dataframe_to_table(df, sheet_name, if_exists=if_exists)
+    def _run_upload(self, task, excel_file, sheet_names, if_exists, key_columns):
+        """Stream the selected sheets into the database (runs on the upload thread)"""
+        from core.excel_loader import ExcelLoader, get_parse_cache
+        from core.db_manager import DatabaseManager
 
-            # Complete
-            self.progress.set(1.0)
-            self.progress_label.configure(text="Upload complete!")
-            self.update()
-
-            messagebox.showinfo(
-                "Success",
-                f"Successfully uploaded {total} sheet(s) to database."
-            )
-
-            # Call completion callback
-            if self.on_complete:
-                self.on_complete()
-
-            # Close dialog
-            self.destroy()
+        db = None
+        try:
+            loader = ExcelLoader(cache=get_parse_cache())
+            # A connection of its own, so nothing the UI writes meanwhile can
+            # commit (or roll back) the upload's transaction
+            db = DatabaseManager(self.db_path, private_writer=True)
+            totals = {}
+
+            # Stream each selected sheet straight into the database
+            total = len(sheet_names)
+            for i, sheet_name in enumerate(sheet_names):
+                task["progress"].put(("sheet", sheet_name, i / total))
+
+                # Parse on this thread while pipelined_insert's worker inserts finished chunks
+                chunks = self._track_chunks(task, loader.iter_chunks(excel_file, sheet_name), sheet_name)
+                if if_exists in ("merge", "incremental"):
+                    # Both modes look rows up through indexes, so those stay in place
+                    counts = db.pipelined_insert(chunks, sheet_name, if_exists=if_exists, key_columns=key_columns)
+                    for name, value in counts.items():
+                        totals[name] = totals.get(name, 0) + value
+                else:
+                    with db.bulk_load(sheet_name):
+                        db.pipelined_insert(chunks, sheet_name, if_exists=if_exists)
+
+            task["progress"].put(("done", totals, total))
+
+        except UploadCancelled:
+            task["progress"].put(("cancelled", None))
 
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to upload Excel file:\n{str(e)}")
-            self.upload_btn.configure(state="normal")
-            self.progress.pack_forget()
-            self.progress_label.pack_forget()
+            task["progress"].put(("error", e))
+
+        finally:
+            if db is not None:
+                db.close()
+
+    def _track_chunks(self, task, chunks, sheet_name):
+        """Pass chunks through while reporting streamed row counts; stop if cancelled"""
+        rows = 0
+        for chunk in chunks:
+            if task["stop"].is_set():
+                raise UploadCancelled()
+            rows += len(chunk)
+            task["progress"].put(("rows", sheet_name, rows))
+            yield chunk
+
+    def poll_upload(self, task):
+        """Show the upload thread's progress; finish up when it is done"""
+        self.poll_job = None
+        while True:
+            try:
+                kind, *details = task["progress"].get_nowait()
+            except queue.Empty:
+                break
+
+            if kind == "sheet":
+                sheet_name, fraction = details
+                self.progress.set(0.1 + 0.8 * fraction)
+                if not task["stop"].is_set():
+                    self.progress_label.configure(text=f"Uploading {sheet_name}...")
+            elif kind == "rows":
+                sheet_name, rows = details
+                if not task["stop"].is_set():
+                    self.progress_label.configure(text=f"Uploading {sheet_name}... {rows:,} rows")
+            elif kind == "done":
+                self.set_uploading(False)
+                self.finish_upload(*details)
+                return
+            elif kind == "cancelled":
+                self.set_uploading(False)
+                self.destroy()
+                return
+            elif kind == "error":
+                self.set_uploading(False)
+                messagebox.showerror("Error", f"Failed to upload Excel file:\n{str(details[0])}")
+                self.grab_set()
+                self.upload_btn.configure(state="normal")
+                self.progress.pack_forget()
+                self.progress_label.pack_forget()
+                return
+
+        self.poll_job = self.after(PROGRESS_POLL_INTERVAL, lambda: self.poll_upload(task))
+
+    def finish_upload(self, totals, total):
+        """Report a finished upload and close the dialog"""
+        self.progress.set(1.0)
+        self.progress_label.configure(text="Upload complete!")
+
+        message = f"Successfully uploaded {total} sheet(s) to database."
+        if totals:
+            message += "\n\n" + ", ".join(f"{value:,} {name}" for name, value in totals.items())
+        messagebox.showinfo("Success", message)
+
+        # Call completion callback
+        if self.on_complete:
+            self.on_complete()
+
+        # Close dialog
+        self.destroy()
 
     def cancel(self):
         """Cancel and close dialog"""
+        if self.uploading:
+            # Stop the upload at the next chunk; the insert is rolled back
+            self.upload_task["stop"].set()
+            self.progress_label.configure(text="Cancelling...")
+            return
         self.destroy()
+
+    def destroy(self):
+        """Stop polling (and any upload still running) before closing"""
+        if self.poll_job is not None:
+            self.after_cancel(self.poll_job)
+            self.poll_job = None
+        if self.upload_task is not None:
+            self.upload_task["stop"].set()
+        if self.uploading:
+            self.set_uploading(False)
+        super().destroy()
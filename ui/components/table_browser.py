@@ -1,16 +1,54 @@
 """
 Table Browser Component
-View and browse table data with pagination
+View and browse table data in a virtually scrolled grid
 """
+import queue
+import sqlite3
+import threading
+from collections import OrderedDict
 import customtkinter as ctk
 from tkinter import ttk
 from ui.styles import Colors, Styles
 
+# How often the browser checks whether the database changed (ms)
+CHANGE_CHECK_INTERVAL = 2000
+
+# How often a block being fetched in the background is checked for (ms)
+BLOCK_POLL_INTERVAL = 20
+
+# How often a background count's progress is shown (ms)
+COUNT_POLL_INTERVAL = 100
+
+# How often a background search index build is checked on (ms)
+INDEX_POLL_INTERVAL = 200
+
+# Finished counts kept per browser (by table, search and data version)
+COUNT_CACHE_SIZE = 32
+
+# Rows fetched at a time, and blocks kept in the block cache
+BLOCK_SIZE = 200
+BLOCK_CACHE_SIZE = 32
+
+# Treeview items kept beyond the visible rows (covers a partly visible last row)
+OVERSCAN_ROWS = 2
+
+# Height of a grid row (px)
+ROW_HEIGHT = 28
+
 
 class TableBrowser(ctk.CTkFrame):
-    """Table data browser with pagination"""
+    """
+    Table data browser with a virtually scrolled grid
+
+    The scrollbar spans every matching row, but the Treeview only ever holds
+    the visible window plus OVERSCAN_ROWS items, which are refilled in place
+    as the view scrolls. Rows are fetched in blocks of BLOCK_SIZE in the
+    background, so memory use and redraw cost don't grow with the table.
+    """
 
     def __init__(self, parent, db_path, table_name):
+        from core.page_fetcher import PageFetcher
+
         super().__init__(
             parent,
             corner_radius=Styles.CORNER_RADIUS,
@@ -21,19 +59,44 @@ class TableBrowser(ctk.CTkFrame):
 
         self.db_path = db_path
         self.table_name = table_name
-        self.current_page = 0
-        self.rows_per_page = 50
+        self.top_row = 0
+        self.visible_rows = 0
         self.total_rows = 0
+        self.shown_rows = 0
+        self.count_bound = None
+        self.counts = OrderedDict()
+        self.count_task = None
+        self.count_poll_job = None
         self.columns = []
+        self.types = {}
+        self.filters = []
         self.search_text = ""
         self.sort_column = None
         self.sort_order = "ASC"
+        self.rowid = "rowid"
+        self.search_index = None
+        self.match_set = None
+        self.index_build = None
+        self.index_poll_job = None
+        self.query = None
+        self.view_key = None
+        self.block_starts = {}
+        self.dense_start = None
+        self.seen_versions = None
+        self.change_check_job = None
+        self.items = []
+        self.hidden_items = set()
+        self.fetcher = PageFetcher(max_pages=BLOCK_CACHE_SIZE)
+        self.pending_block = None
+        self.block_poll_job = None
 
         self.setup_ui()
         self.load_data()
 
     def setup_ui(self):
         """Setup the UI components"""
+        from core.table_query import FILTER_OPERATORS
+
         # Header
         header = ctk.CTkFrame(self, fg_color="transparent")
         header.pack(fill="x", padx=Styles.PADDING, pady=(Styles.PADDING, 10))
@@ -127,6 +190,84 @@ class TableBrowser(ctk.CTkFrame):
         )
         clear_btn.pack(side="left")
 
+        # Opt-in full-text index (an FTS5 table plus triggers on this table)
+        self.index_btn = ctk.CTkButton(
+            search_frame,
+            text="Build Index",
+            width=100,
+            height=Styles.INPUT_HEIGHT_SM,
+            corner_radius=Styles.CORNER_RADIUS_SM,
+            fg_color=Colors.BG_TERTIARY,
+            hover_color=Colors.BORDER,
+            command=self.toggle_search_index
+        )
+        self.index_btn.pack(side="left", padx=(5, 0))
+
+        # Column filters
+        filter_frame = ctk.CTkFrame(self, fg_color="transparent")
+        filter_frame.pack(fill="x", padx=Styles.PADDING, pady=(0, 10))
+
+        filter_label = ctk.CTkLabel(
+            filter_frame,
+            text="Filter:",
+            font=(Styles.FONT_FAMILY, Styles.FONT_SIZE_SM),
+            text_color=Colors.TEXT_SECONDARY
+        )
+        filter_label.pack(side="left", padx=(0, 10))
+
+        self.filter_column_var = ctk.StringVar(value="")
+        self.filter_column_menu = ctk.CTkOptionMenu(
+            filter_frame,
+            variable=self.filter_column_var,
+            values=[""],
+            width=140,
+            height=Styles.INPUT_HEIGHT_SM
+        )
+        self.filter_column_menu.pack(side="left", padx=(0, 5))
+
+        self.filter_operator_var = ctk.StringVar(value="=")
+        operator_menu = ctk.CTkOptionMenu(
+            filter_frame,
+            variable=self.filter_operator_var,
+            values=list(FILTER_OPERATORS),
+            width=110,
+            height=Styles.INPUT_HEIGHT_SM
+        )
+        operator_menu.pack(side="left", padx=(0, 5))
+
+        self.filter_entry = ctk.CTkEntry(
+            filter_frame,
+            placeholder_text="Value (separate 'between' and 'in' values with commas)",
+            height=Styles.INPUT_HEIGHT_SM,
+            font=(Styles.FONT_FAMILY, Styles.FONT_SIZE_SM)
+        )
+        self.filter_entry.pack(side="left", fill="x", expand=True, padx=(0, 10))
+        self.filter_entry.bind("<Return>", lambda e: self.add_filter())
+
+        add_filter_btn = ctk.CTkButton(
+            filter_frame,
+            text="Add Filter",
+            width=80,
+            height=Styles.INPUT_HEIGHT_SM,
+            corner_radius=Styles.CORNER_RADIUS_SM,
+            fg_color=Colors.ACCENT,
+            hover_color=Colors.ACCENT_HOVER,
+            command=self.add_filter
+        )
+        add_filter_btn.pack(side="left")
+
+        # Active filters and whether the query uses an index
+        self.active_filters_frame = ctk.CTkFrame(self, fg_color="transparent")
+        self.active_filters_frame.pack(fill="x", padx=Styles.PADDING, pady=(0, 10))
+
+        self.plan_label = ctk.CTkLabel(
+            self.active_filters_frame,
+            text="",
+            font=(Styles.FONT_FAMILY, Styles.FONT_SIZE_XS),
+            text_color=Colors.TEXT_MUTED
+        )
+        self.plan_label.pack(side="right")
+
         # TreeView container
         tree_container = ctk.CTkFrame(self, fg_color="transparent")
         tree_container.pack(fill="both", expand=True, padx=Styles.PADDING, pady=(0, 10))
@@ -139,14 +280,22 @@ class TableBrowser(ctk.CTkFrame):
             selectmode="browse"
         )
 
-        # Scrollbars
-        vsb = ctk.CTkScrollbar(tree_container, command=self.tree.yview)
+        # Scrollbars (the vertical one spans all rows, not the Treeview's items)
+        self.vsb = ctk.CTkScrollbar(tree_container, command=self.on_scrollbar)
         hsb = ctk.CTkScrollbar(tree_container, orientation="horizontal", command=self.tree.xview)
-        self.tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
+        self.tree.configure(xscrollcommand=hsb.set)
+
+        # Scrolling moves the window over the rows instead of the Treeview's view
+        self.tree.bind("<Configure>", self.on_resize)
+        self.tree.bind("<MouseWheel>", self.on_mouse_wheel)
+        self.tree.bind("<Button-4>", lambda e: self.scroll_by(-3) or "break")
+        self.tree.bind("<Button-5>", lambda e: self.scroll_by(3) or "break")
+        self.tree.bind("<Prior>", lambda e: self.prev_page() or "break")
+        self.tree.bind("<Next>", lambda e: self.next_page() or "break")
 
         # Pack
         self.tree.grid(row=0, column=0, sticky="nsew")
-        vsb.grid(row=0, column=1, sticky="ns")
+        self.vsb.grid(row=0, column=1, sticky="ns")
         hsb.grid(row=1, column=0, sticky="ew")
 
         tree_container.grid_rowconfigure(0, weight=1)
@@ -158,7 +307,7 @@ class TableBrowser(ctk.CTkFrame):
 
         self.prev_btn = ctk.CTkButton(
             pagination,
-            text="← Previous",
+            text="↑ Page Up",
             width=100,
             height=Styles.BUTTON_HEIGHT_SM,
             corner_radius=Styles.CORNER_RADIUS_SM,
@@ -178,7 +327,7 @@ class TableBrowser(ctk.CTkFrame):
 
         self.next_btn = ctk.CTkButton(
             pagination,
-            text="Next →",
+            text="↓ Page Down",
             width=100,
             height=Styles.BUTTON_HEIGHT_SM,
             corner_radius=Styles.CORNER_RADIUS_SM,
@@ -188,6 +337,15 @@ class TableBrowser(ctk.CTkFrame):
         )
         self.next_btn.pack(side="left")
 
+        # Block cache counters
+        self.cache_label = ctk.CTkLabel(
+            pagination,
+            text="",
+            font=(Styles.FONT_FAMILY, Styles.FONT_SIZE_SM),
+            text_color=Colors.TEXT_SECONDARY
+        )
+        self.cache_label.pack(side="right")
+
         # Setup TreeView style
         self.setup_treeview_style()
 
@@ -203,7 +361,7 @@ class TableBrowser(ctk.CTkFrame):
             fieldbackground=Colors.BG_TERTIARY,
             borderwidth=0,
             font=(Styles.FONT_FAMILY, Styles.FONT_SIZE_SM),
-            rowheight=28
+            rowheight=ROW_HEIGHT
         )
 
         style.configure(
@@ -222,147 +380,630 @@ class TableBrowser(ctk.CTkFrame):
         )
 
     def load_data(self):
-        """Load table data"""
-        from core.db_manager import DatabaseManager
+        """Load table data, staying at the current scroll position"""
+        from core.db_manager import DatabaseManager, read_stats
+        from core.table_query import get_search_cache
 
         try:
             db = DatabaseManager(self.db_path)
-            conn = db.get_connection()
-            cursor = conn.cursor()
+            # Versions first, so a change made while loading is picked up by the next check
+            self.seen_versions = db.versions()
 
-            # Get column names
-            cursor.execute(f"PRAGMA table_info([{self.table_name}])")
-            columns_info = cursor.fetchall()
-            self.columns = [col[1] for col in columns_info]
+            # Get column names (cached until the schema changes)
+            schema = db.table_schema(self.table_name)
+            if schema is None:
+                raise ValueError(f"Table '{self.table_name}' no longer exists")
 
             # Configure TreeView columns
-            self.tree["columns"] = self.columns
-            for col in self.columns:
-                self.tree.heading(
-                    col,
-                    text=col,
-                    command=lambda c=col: self.sort_by_column(c)
+            if schema["columns"] != self.columns:
+                self.columns = schema["columns"]
+                if self.sort_column not in self.columns:
+                    self.sort_column = None
+                self.tree["columns"] = self.columns
+                for col in self.columns:
+                    self.tree.heading(
+                        col,
+                        text=col,
+                        command=lambda c=col: self.sort_by_column(c)
+                    )
+                    self.tree.column(col, width=120, minwidth=80)
+
+                # Filters on columns that are gone no longer apply
+                self.filters = [f for f in self.filters if f[0] in self.columns]
+                self.filter_column_menu.configure(values=self.columns or [""])
+                if self.filter_column_var.get() not in self.columns:
+                    self.filter_column_var.set(self.columns[0] if self.columns else "")
+                self.show_filters()
+            self.types = schema["types"]
+            self.rowid = schema["rowid"]
+            self.search_index = db.search_index(self.table_name)
+            self.update_index_button()
+
+            # A search narrowing a recent one re-checks only that search's matches
+            match_count = None
+            self.match_set = None
+            if self.search_text and self.rowid is not None:
+                found = get_search_cache(db.pool).matches(
+                    self.table_name, self.columns, self.rowid, self.search_text, self.seen_versions
                 )
-                self.tree.column(col, width=120, minwidth=80)
-
-            # Get total row count (with search filter if applied)
-            count_query = f"SELECT COUNT(*) FROM [{self.table_name}]"
-            if self.search_text:
-                where_clauses = [f"[{col}] LIKE ?" for col in self.columns]
-                count_query += f" WHERE {' OR '.join(where_clauses)}"
-                search_params = [f"%{self.search_text}%"] * len(self.columns)
-                cursor.execute(count_query, search_params)
+                if found is not None:
+                    self.match_set, match_count = found
+            self.build_query()
+            self.show_plan()
+
+            # Get total row count (with search and filters if applied): from
+            # the catalog, the match set or an earlier count, otherwise
+            # counted in the background
+            self.stop_count()
+            entry = None
+            if not self.search_text and not self.filters:
+                with db.reader() as conn:
+                    entry = read_stats(conn, [self.table_name]).get(self.table_name)
+            count_key = (self.table_name, self.search_text, tuple(self.filters), self.seen_versions)
+            self.dense_start = None
+            if entry and entry["fresh"]:
+                self.total_rows = entry["row_count"]
+                self.dense_start = self.find_dense_start(db, entry["row_count"])
+            elif match_count is not None and not self.filters:
+                self.total_rows = match_count
+            elif count_key in self.counts:
+                self.counts.move_to_end(count_key)
+                self.total_rows = self.counts[count_key]
             else:
-                cursor.execute(count_query)
-            self.total_rows = cursor.fetchone()[0]
+                self.start_count(count_key)
 
-            # Load first page
-            self.load_page()
+            # Refill the window (clamped if rows were removed)
+            self.render()
 
         except Exception as e:
             self.row_count_label.configure(text=f"Error: {str(e)[:50]}")
 
-    def load_page(self):
-        """Load current page of data"""
+        self.schedule_change_check()
+
+    def build_query(self):
+        """Rebuild the page query from the current filters, search and sort"""
+        from core.table_query import (
+            TableQuery, filters_clause, match_set_clause, search_clause, search_uses_index
+        )
+
+        if self.match_set is not None:
+            search, search_params = match_set_clause(self.rowid, self.match_set)
+            rowid_subquery = True
+        else:
+            search, search_params = search_clause(self.columns, self.search_text, self.rowid, self.search_index)
+            rowid_subquery = bool(search) and search_uses_index(self.search_text, self.rowid, self.search_index)
+        where, params = filters_clause(self.filters, self.types)
+        if search:
+            where = f"{where} AND ({search})" if where else search
+            params = params + search_params
+        self.query = TableQuery(
+            self.table_name,
+            self.columns,
+            rowid=self.rowid,
+            where=where,
+            params=params,
+            sort_column=self.sort_column,
+            descending=self.sort_order == "DESC",
+            rowid_subquery=rowid_subquery
+        )
+        # Blocks are cached under the view they came from
+        view_key = (
+            self.table_name, self.search_text, tuple(self.filters),
+            self.sort_column, self.sort_order, self.seen_versions
+        )
+        if view_key != self.view_key:
+            self.block_starts = {}
+        self.view_key = view_key
+
+    def show_plan(self):
+        """Show whether the filtered query can use an index (EXPLAIN QUERY PLAN)"""
         from core.db_manager import DatabaseManager
+        from core.table_query import plan_index, query_plan
 
-        # Clear existing data
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        if not self.filters:
+            self.plan_label.configure(text="", text_color=Colors.TEXT_MUTED)
+            return
+
+        sql, params = self.query.page_sql(None, "from", BLOCK_SIZE)[0][0]
+        with DatabaseManager(self.db_path).reader() as conn:
+            plan = query_plan(conn, sql, params + [BLOCK_SIZE])
+        index = plan_index(plan, self.query.rowid_subquery)
+        if index is not None:
+            self.plan_label.configure(
+                text=f"Index used: {index.split(' USING ', 1)[-1]}",
+                text_color=Colors.SUCCESS
+            )
+        elif self.query.rowid_subquery:
+            self.plan_label.configure(
+                text="No index used: filters are checked on the search's matches",
+                text_color=Colors.TEXT_MUTED
+            )
+        else:
+            self.plan_label.configure(text="No index used: scans the table", text_color=Colors.WARNING)
+
+    def add_filter(self):
+        """Add a filter from the filter bar"""
+        from core.table_query import filter_clause
 
+        column = self.filter_column_var.get()
+        operator = self.filter_operator_var.get()
+        value = self.filter_entry.get()
+        if column not in self.columns:
+            return
         try:
-            db = DatabaseManager(self.db_path)
-            conn = db.get_connection()
-            cursor = conn.cursor()
-
-            # Calculate offset
-            offset = self.current_page * self.rows_per_page
-
-            # Build query with search and sort
-            query = f"SELECT * FROM [{self.table_name}]"
-            params = []
-
-            # Add WHERE clause for search
-            if self.search_text:
-                where_clauses = [f"[{col}] LIKE ?" for col in self.columns]
-                query += f" WHERE {' OR '.join(where_clauses)}"
-                params = [f"%{self.search_text}%"] * len(self.columns)
-
-            # Add ORDER BY clause for sorting
-            if self.sort_column:
-                query += f" ORDER BY [{self.sort_column}] {self.sort_order}"
-
-            # Add LIMIT and OFFSET
-            query += " LIMIT ? OFFSET ?"
-            params.extend([self.rows_per_page, offset])
-
-            # Fetch data for current page
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
-
-            # Insert data into tree
-            for row in rows:
-                # Convert None to empty string and limit length
-                display_row = []
-                for value in row:
-                    if value is None:
-                        display_row.append("NULL")
-                    else:
-                        str_value = str(value)
-                        # Truncate long values
-                        if len(str_value) > 100:
-                            display_row.append(str_value[:97] + "...")
-                        else:
-                            display_row.append(str_value)
-
-                self.tree.insert("", "end", values=display_row)
-
-            # Update pagination controls
-            self.update_pagination()
+            # Check the value suits the column before applying it
+            filter_clause(column, self.types.get(column), operator, value)
+        except ValueError as e:
+            self.plan_label.configure(text=str(e), text_color=Colors.ERROR)
+            return
+
+        self.filters.append((column, operator, value.strip()))
+        self.filter_entry.delete(0, 'end')
+        self.show_filters()
+        self.top_row = 0
+        self.load_data()
+
+    def remove_filter(self, index):
+        """Remove an active filter"""
+        del self.filters[index]
+        self.show_filters()
+        self.top_row = 0
+        self.load_data()
+
+    def show_filters(self):
+        """Show the active filters, each with a button removing it"""
+        for child in self.active_filters_frame.winfo_children():
+            if child is not self.plan_label:
+                child.destroy()
+
+        for index, (column, operator, value) in enumerate(self.filters):
+            text = f"{column} {operator}" + (f" {value}" if operator != "is null" else "")
+            chip = ctk.CTkButton(
+                self.active_filters_frame,
+                text=f"{text}  ✕",
+                height=Styles.BUTTON_HEIGHT_SM,
+                corner_radius=Styles.CORNER_RADIUS_SM,
+                fg_color=Colors.BG_TERTIARY,
+                hover_color=Colors.BORDER,
+                font=(Styles.FONT_FAMILY, Styles.FONT_SIZE_XS),
+                command=lambda i=index: self.remove_filter(i)
+            )
+            chip.pack(side="left", padx=(0, 5))
+
+    def start_count(self, count_key):
+        """
+        Count the matching rows in the background, showing a running lower bound
+
+        The count reads one snapshot a rowid range at a time
+        (TableQuery.count_progressively) and is cancelled by stop_count.
+        A search's matching rowids are collected on the way for the search
+        cache, so narrowing the search later doesn't scan the table again.
+        """
+        from core.db_manager import DatabaseManager
+        from core.table_query import get_search_cache
+
+        query = self.query
+        # Only a plain search's matches are reusable
+        rowids = [] if self.search_text and not self.filters and self.rowid is not None else None
+        task = {"stop": threading.Event(), "lock": threading.Lock(), "conn": None, "progress": queue.Queue()}
+
+        def count():
+            try:
+                db = DatabaseManager(self.db_path)
+                with db.reader(snapshot=True) as conn:
+                    with task["lock"]:
+                        if task["stop"].is_set():
+                            return
+                        task["conn"] = conn
+                    try:
+                        for total, finished in query.count_progressively(conn, rowids):
+                            if task["stop"].is_set():
+                                return
+                            if finished and rowids is not None and len(rowids) == total:
+                                table_name, text, _, versions = count_key
+                                get_search_cache(db.pool).put(table_name, text, versions, rowids)
+                            task["progress"].put((total, finished))
+                    finally:
+                        # Not interruptible once back in the pool
+                        with task["lock"]:
+                            task["conn"] = None
+            except sqlite3.Error as e:
+                if not task["stop"].is_set():
+                    print(f"Could not count rows: {e}")
+                    task["progress"].put((None, True))
+
+        self.count_task = task
+        self.count_bound = 0
+        threading.Thread(target=count, name="row-count", daemon=True).start()
+        self.count_poll_job = self.after(COUNT_POLL_INTERVAL, lambda: self.poll_count(task, count_key))
+
+    def poll_count(self, task, count_key):
+        """Show a background count's progress; cache and show the total when it finishes"""
+        self.count_poll_job = None
+        if task is not self.count_task:
+            return
+
+        total, finished = None, False
+        while True:
+            try:
+                total, finished = task["progress"].get_nowait()
+            except queue.Empty:
+                break
+
+        if finished:
+            self.count_task = None
+            self.count_bound = None
+            if total is not None:
+                self.total_rows = total
+                self.counts[count_key] = total
+                while len(self.counts) > COUNT_CACHE_SIZE:
+                    self.counts.popitem(last=False)
+        else:
+            self.count_poll_job = self.after(COUNT_POLL_INTERVAL, lambda: self.poll_count(task, count_key))
+            if total is None:
+                return  # no progress since the last poll
+            self.count_bound = total
+        self.render()
+
+    def stop_count(self):
+        """Cancel a background count"""
+        task, self.count_task = self.count_task, None
+        self.count_bound = None
+        if self.count_poll_job is not None:
+            self.after_cancel(self.count_poll_job)
+            self.count_poll_job = None
+        if task is not None:
+            with task["lock"]:
+                task["stop"].set()
+                if task["conn"] is not None:
+                    task["conn"].interrupt()
+
+    def update_index_button(self):
+        """Show whether the table has a search index, or one is being built"""
+        if self.index_build is not None:
+            self.index_btn.configure(text="Indexing...", state="disabled")
+        elif self.rowid is None:
+            self.index_btn.configure(text="Build Index", state="disabled")
+        else:
+            self.index_btn.configure(text="Drop Index" if self.search_index else "Build Index", state="normal")
 
+    def toggle_search_index(self):
+        """Build the table's search index, or drop it if it has one"""
+        from tkinter import messagebox
+        from core.db_manager import DatabaseManager
+
+        if self.index_build is not None or self.rowid is None:
+            return
+        if not self.search_index:
+            self.start_index_build()
+            return
+
+        if not messagebox.askyesno(
+            "Drop Search Index",
+            f"Drop the search index of '{self.table_name}'?\n\nSearches will scan the table again."
+        ):
+            return
+        try:
+            DatabaseManager(self.db_path).drop_search_index(self.table_name)
         except Exception as e:
-            print(f"Error loading page: {e}")
+            messagebox.showerror("Error", f"Failed to drop search index:\n{str(e)}")
+            return
+        self.load_data()
+
+    def start_index_build(self):
+        """Build the table's full-text search index in the background (searches use LIKE meanwhile)"""
+        from core.db_manager import DatabaseManager
+
+        task = {"thread": None, "error": queue.Queue()}
 
-    def update_pagination(self):
-        """Update pagination controls"""
-        total_pages = (self.total_rows + self.rows_per_page - 1) // self.rows_per_page
+        def build():
+            try:
+                DatabaseManager(self.db_path).build_search_index(self.table_name)
+            except Exception as e:
+                task["error"].put(e)
+
+        task["thread"] = threading.Thread(target=build, name="search-index", daemon=True)
+        self.index_build = task
+        self.update_index_button()
+        task["thread"].start()
+        self.index_poll_job = self.after(INDEX_POLL_INTERVAL, self.poll_index_build)
+
+    def poll_index_build(self):
+        """Pick up a finished search index (or report why it failed)"""
+        from tkinter import messagebox
+
+        self.index_poll_job = None
+        task = self.index_build
+        if task["thread"].is_alive():
+            self.index_poll_job = self.after(INDEX_POLL_INTERVAL, self.poll_index_build)
+            return
+
+        self.index_build = None
+        try:
+            error = task["error"].get_nowait()
+        except queue.Empty:
+            error = None
+        if error is not None:
+            messagebox.showerror("Error", f"Could not build search index:\n{str(error)}")
+        self.load_data()
+
+    def schedule_change_check(self):
+        """Check for changes to the database after CHANGE_CHECK_INTERVAL"""
+        if self.change_check_job is not None:
+            self.after_cancel(self.change_check_job)
+        self.change_check_job = self.after(CHANGE_CHECK_INTERVAL, self.check_for_changes)
+
+    def check_for_changes(self):
+        """Reload the current page if the schema or data changed (e.g. another program wrote to the file)"""
+        from core.db_manager import DatabaseManager
+
+        self.change_check_job = None
+        try:
+            versions = DatabaseManager(self.db_path).versions()
+        except Exception:
+            return  # database closed or gone; stop checking
+
+        if versions != self.seen_versions:
+            self.load_data()
+        else:
+            self.schedule_change_check()
+
+    def find_dense_start(self, db, row_count):
+        """
+        First rowid of the table if its rowids have no gaps, else None
+
+        Then row n of the unsorted, unfiltered view has rowid start + n, so
+        any block is found by an index seek.
+        """
+        from core.db_manager import quote_identifier
+
+        if self.rowid is None or not row_count:
+            return None
+        with db.reader() as conn:
+            low, high = conn.execute(
+                f"SELECT MIN({self.rowid}), MAX({self.rowid}) FROM {quote_identifier(self.table_name)}"
+            ).fetchone()
+        return low if low is not None and high - low + 1 == row_count else None
+
+    def fetch_block(self, query, view_key, block, block_starts, dense_start):
+        """
+        Fetch a block's rows (runs on the fetcher's worker thread)
+
+        Seeks from a neighbouring block that is already cached, so scrolling
+        reads rows by key. A jump in an unsorted view seeks by rowid: straight
+        to the block's first rowid when the table's rowids have no gaps,
+        otherwise to the nearest earlier block fetched so far (block_starts)
+        and skips the rows in between. Only a jump in a sorted view counts
+        rows from the start with OFFSET.
+
+        Returns:
+            List of (rowid, *columns) rows
+        """
+        from core.db_manager import DatabaseManager
+
+        unsorted = query.rowid is not None and query.sort_column is None
+        with DatabaseManager(self.db_path).reader() as conn:
+            rows = None
+            if query.rowid is not None:
+                before = self.fetcher.peek(view_key + (block - 1,)) if block > 0 else None
+                after = self.fetcher.peek(view_key + (block + 1,))
+                if before and len(before) == BLOCK_SIZE:
+                    rows = query.fetch_page(conn, query.row_key(before[-1]), "next", BLOCK_SIZE)
+                elif after:
+                    rows = query.fetch_page(conn, query.row_key(after[0]), "prev", BLOCK_SIZE)
+                    if len(rows) < BLOCK_SIZE:
+                        rows = None  # rows were added or removed before this block
+            if rows is None and unsorted:
+                if dense_start is not None and not query.where:
+                    rows = query.fetch_page(conn, (dense_start + block * BLOCK_SIZE,), "from", BLOCK_SIZE)
+                else:
+                    start = max((known for known in list(block_starts) if known <= block), default=None)
+                    if start is not None:
+                        rows = query.fetch_page(
+                            conn, (block_starts[start],), "from", BLOCK_SIZE,
+                            offset=(block - start) * BLOCK_SIZE
+                        )
+            if rows is None:
+                rows = query.fetch_page(conn, None, "from", BLOCK_SIZE, offset=block * BLOCK_SIZE)
+        if unsorted and rows:
+            block_starts[block] = rows[0][0]
+        return rows
+
+    def render(self):
+        """Fill the visible window from the block cache, fetching a missing block first"""
+        if self.count_bound is not None:
+            # Still counting: allow at least the first window
+            self.total_rows = max(self.count_bound, len(self.items))
+        self.top_row = max(0, min(self.top_row, self.total_rows - self.visible_rows))
+        count = max(0, min(len(self.items), self.total_rows - self.top_row))
+        first_block = self.top_row // BLOCK_SIZE
+        last_block = (self.top_row + count - 1) // BLOCK_SIZE if count else first_block
+
+        rows = []
+        for block in range(first_block, last_block + 1):
+            block_rows = self.fetcher.get(self.view_key + (block,))
+            if block_rows is None:
+                # Keep showing the old rows until the block arrives
+                self.request_block(block)
+                self.update_position(loading=True)
+                return
+            rows.extend(block_rows)
+
+        start = self.top_row - first_block * BLOCK_SIZE
+        window = rows[start:start + count]
+        self.shown_rows = min(len(window), self.visible_rows)
+
+        # Refill the existing items in place
+        self.tree.selection_remove(self.tree.selection())
+        for index, (item, row) in enumerate(zip(self.items, window)):
+            self.tree.item(item, values=self.format_row(row))
+            if item in self.hidden_items:
+                self.tree.move(item, "", index)
+                self.hidden_items.discard(item)
+        for item in self.items[len(window):]:
+            if item not in self.hidden_items:
+                self.tree.detach(item)
+                self.hidden_items.add(item)
+        self.tree.yview_moveto(0)
+
+        self.update_position()
+        self.prefetch_blocks(first_block - 1, last_block + 1)
+
+    def format_row(self, row):
+        """Display values for a row (the first value is the rowid)"""
+        display_row = []
+        for value in row[1:]:
+            if value is None:
+                display_row.append("NULL")
+            else:
+                str_value = str(value)
+                # Truncate long values
+                if len(str_value) > 100:
+                    display_row.append(str_value[:97] + "...")
+                else:
+                    display_row.append(str_value)
+        return display_row
+
+    def request_block(self, block):
+        """Fetch a block the window is waiting for"""
+        key = self.view_key + (block,)
+        if key == self.pending_block:
+            return
+        query, view_key, block_starts, dense_start = self.query, self.view_key, self.block_starts, self.dense_start
+        self.pending_block = key
+        self.fetcher.request(key, lambda: self.fetch_block(query, view_key, block, block_starts, dense_start))
+        if self.block_poll_job is None:
+            self.block_poll_job = self.after(BLOCK_POLL_INTERVAL, self.poll_blocks)
+
+    def poll_blocks(self):
+        """Refill the window once the block it waits for arrives"""
+        self.block_poll_job = None
+        for key, rows, error in self.fetcher.results():
+            if key != self.pending_block:
+                continue  # the window has moved on
+            self.pending_block = None
+            if error is not None:
+                print(f"Error loading rows: {error}")
+                self.update_position()
+            else:
+                self.render()
+
+        if self.pending_block is not None and self.block_poll_job is None:
+            self.block_poll_job = self.after(BLOCK_POLL_INTERVAL, self.poll_blocks)
+
+    def prefetch_blocks(self, *blocks):
+        """Fetch blocks next to the window into the block cache"""
+        query, view_key, block_starts, dense_start = self.query, self.view_key, self.block_starts, self.dense_start
+        for block in blocks:
+            if 0 <= block * BLOCK_SIZE < self.total_rows:
+                self.fetcher.prefetch(
+                    view_key + (block,),
+                    lambda block=block: self.fetch_block(query, view_key, block, block_starts, dense_start)
+                )
+
+    def update_position(self, loading=False):
+        """Update the scrollbar, row range and navigation controls"""
+        total = self.total_rows
+        shown = self.shown_rows
+        if total:
+            self.vsb.set(self.top_row / total, (self.top_row + shown) / total)
+        else:
+            self.vsb.set(0, 1)
 
         # Update labels
-        self.row_count_label.configure(text=f"{self.total_rows:,} rows")
-        self.page_label.configure(
-            text=f"Page {self.current_page + 1} of {total_pages}"
-        )
+        if self.count_bound is None:
+            self.row_count_label.configure(text=f"{total:,} rows")
+            of_total = f"{total:,}"
+        else:
+            # Rows already on screen count towards the bound too
+            bound = max(self.count_bound, self.top_row + shown)
+            self.row_count_label.configure(text="Counting...")
+            of_total = f"≥ {bound:,} {'matches' if self.search_text else 'rows'}..."
+        if loading:
+            self.page_label.configure(text=f"Loading rows from {self.top_row + 1:,}...")
+        elif shown:
+            self.page_label.configure(
+                text=f"Rows {self.top_row + 1:,}-{self.top_row + shown:,} of {of_total}"
+            )
+        elif self.count_bound is not None:
+            self.page_label.configure(text=f"Searching... {of_total}")
+        else:
+            self.page_label.configure(text="No rows")
 
         # Enable/disable buttons
-        self.prev_btn.configure(state="normal" if self.current_page > 0 else "disabled")
+        self.prev_btn.configure(state="normal" if self.top_row > 0 else "disabled")
         self.next_btn.configure(
-            state="normal" if self.current_page < total_pages - 1 else "disabled"
+            state="normal" if self.top_row + shown < total else "disabled"
         )
 
+        stats = self.fetcher.stats()
+        self.cache_label.configure(
+            text=f"Block cache: {stats['hits']} hits, {stats['misses']} misses, {stats['prefetched']} prefetched"
+        )
+
+    def on_resize(self, event):
+        """Keep one Treeview item per visible row (plus overscan) as the grid resizes"""
+        # One row's worth of height goes to the headings
+        visible_rows = max(1, event.height // ROW_HEIGHT - 1)
+        if visible_rows == self.visible_rows:
+            return
+        self.visible_rows = visible_rows
+
+        wanted = visible_rows + OVERSCAN_ROWS
+        while len(self.items) < wanted:
+            item = self.tree.insert("", "end", values=())
+            self.tree.detach(item)
+            self.items.append(item)
+            self.hidden_items.add(item)
+        while len(self.items) > wanted:
+            item = self.items.pop()
+            self.hidden_items.discard(item)
+            self.tree.delete(item)
+
+        if self.query is not None:
+            self.render()
+
+    def on_scrollbar(self, *args):
+        """Handle scrollbar drags and clicks ('moveto', fraction) or ('scroll', n, units)"""
+        if args[0] == "moveto":
+            self.top_row = int(float(args[1]) * self.total_rows)
+            self.render()
+        elif args[0] == "scroll":
+            pages = len(args) > 2 and args[2].startswith("page")
+            self.scroll_by(int(float(args[1])) * (self.visible_rows if pages else 1))
+
+    def on_mouse_wheel(self, event):
+        """Scroll three rows per wheel notch"""
+        notches = event.delta // 120 if abs(event.delta) >= 120 else (1 if event.delta > 0 else -1)
+        self.scroll_by(-3 * notches)
+        return "break"
+
+    def scroll_by(self, rows):
+        """Move the window by a number of rows"""
+        top_row = self.top_row
+        self.top_row = max(0, self.top_row + rows)
+        if self.top_row != top_row:
+            self.render()
+
     def prev_page(self):
-        """Go to previous page"""
-        if self.current_page > 0:
-            self.current_page -= 1
-            self.load_page()
+        """Scroll up by one window of rows"""
+        self.scroll_by(-max(self.visible_rows - 1, 1))
 
     def next_page(self):
-        """Go to next page"""
-        total_pages = (self.total_rows + self.rows_per_page - 1) // self.rows_per_page
-        if self.current_page < total_pages - 1:
-            self.current_page += 1
-            self.load_page()
+        """Scroll down by one window of rows"""
+        self.scroll_by(max(self.visible_rows - 1, 1))
 
     def apply_search(self):
         """Apply search filter"""
         self.search_text = self.search_entry.get().strip()
-        self.current_page = 0  # Reset to first page
+        self.top_row = 0  # Back to the top
         self.load_data()  # Reload with new search
 
     def clear_search(self):
         """Clear search filter"""
         self.search_entry.delete(0, 'end')
         self.search_text = ""
-        self.current_page = 0
+        self.top_row = 0
         self.load_data()
 
     def sort_by_column(self, column):
@@ -382,8 +1023,10 @@ class TableBrowser(ctk.CTkFrame):
             else:
                 self.tree.heading(col, text=col)
 
-        self.current_page = 0
-        self.load_page()
+        self.build_query()
+        self.show_plan()
+        self.top_row = 0
+        self.render()
 
     def export_data(self):
         """Export table data to Excel or CSV"""
@@ -401,12 +1044,13 @@ class TableBrowser(ctk.CTkFrame):
             return
 
         try:
-            from core.db_manager import DatabaseManager
+            from core.db_manager import DatabaseManager, HIDDEN_COLUMNS
 
             # Read all table data (not just current page)
             db = DatabaseManager(self.db_path)
-            conn = db.get_connection()
-            df = pd.read_sql_query(f"SELECT * FROM [{self.table_name}]", conn)
+            with db.reader() as conn:
+                df = pd.read_sql_query(f"SELECT * FROM [{self.table_name}]", conn)
+            df = df.drop(columns=list(HIDDEN_COLUMNS), errors="ignore")
 
             # Export based on file extension
             if filename.endswith('.csv'):
@@ -419,6 +1063,21 @@ class TableBrowser(ctk.CTkFrame):
         except Exception as e:
             messagebox.showerror("Error", f"Failed to export data:\n{str(e)}")
 
+    def destroy(self):
+        """Stop checking for changes, fetching and counting rows when the view is left"""
+        if self.change_check_job is not None:
+            self.after_cancel(self.change_check_job)
+            self.change_check_job = None
+        if self.block_poll_job is not None:
+            self.after_cancel(self.block_poll_job)
+            self.block_poll_job = None
+        if self.index_poll_job is not None:
+            self.after_cancel(self.index_poll_job)
+            self.index_poll_job = None
+        self.stop_count()
+        self.fetcher.close()
+        super().destroy()
+
     def on_back(self):
         """Handle back button"""
         # Will be set by parent
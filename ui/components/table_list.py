@@ -2,15 +2,20 @@
 Table List Component
 TreeView displaying all tables in the database
 """
+import queue
+import threading
 import customtkinter as ctk
 from tkinter import ttk
 from ui.styles import Colors, Styles
 
+# How often the list checks whether the database changed (ms)
+CHANGE_CHECK_INTERVAL = 2000
+
 
 class TableList(ctk.CTkFrame):
     """Table list with TreeView"""
 
-    def __init__(self, parent, on_table_selected_callback=None):
+    def __init__(self, parent, on_table_selected_callback=None, is_busy_callback=None):
         super().__init__(
             parent,
             corner_radius=Styles.CORNER_RADIUS,
@@ -20,7 +25,16 @@ class TableList(ctk.CTkFrame):
         )
 
         self.on_table_selected = on_table_selected_callback
+        # Returns True while an upload is running (tables can't be deleted)
+        self.is_busy = is_busy_callback
         self.db_path = None
+        self.table_items = {}
+        self.load_generation = 0
+        self.recount_stop = None
+        self.recount_db = None
+        self.recount_job = None
+        self.seen_versions = None
+        self.change_check_job = None
 
         self.setup_ui()
         self.setup_treeview_style()
@@ -141,61 +155,79 @@ class TableList(ctk.CTkFrame):
         self.tree.tag_configure("empty", foreground=Colors.TEXT_MUTED)
 
     def load_tables(self, db_path):
-        """Load tables from database"""
+        """
+        Load tables from database
+
+        Names and column counts come from the schema and row counts from the
+        statistics catalog or an estimate, so the list appears at once; exact
+        counts for stale tables are filled in by a background worker.
+        """
+        self.stop_recount()
         self.db_path = db_path
+        self.load_generation += 1
+        selected = [self.tree.item(item)["text"].strip() for item in self.tree.selection()]
+        self.table_items = {}
 
         # Clear existing
         self.tree.delete(*self.tree.get_children())
 
         try:
-            from core.db_manager import DatabaseManager
+            from core.db_manager import DatabaseManager, estimate_row_counts, read_stats, table_overview
 
             db = DatabaseManager(db_path)
-            conn = db.get_connection()
-            cursor = conn.cursor()
-
-            # Get all tables
-            cursor.execute("""
-                SELECT name FROM sqlite_master
-                WHERE type='table' AND name NOT LIKE 'sqlite_%'
-                ORDER BY name
-            """)
-
-            tables = cursor.fetchall()
-
-            if not tables:
-                self.tree.insert(
-                    "",
-                    "end",
-                    text="  No tables found",
-                    values=("", ""),
-                    tags=("empty",)
+            self.seen_versions = db.versions()
+            self.schedule_change_check()
+            with db.reader(snapshot=True) as conn:
+                # Get all tables with their column counts
+                tables = table_overview(conn)
+
+                if not tables:
+                    self.tree.insert(
+                        "",
+                        "end",
+                        text="  No tables found",
+                        values=("", ""),
+                        tags=("empty",)
+                    )
+                    self.tree.tag_configure("empty", foreground=Colors.TEXT_MUTED)
+                    return
+
+                catalog = read_stats(conn, [name for name, _ in tables])
+                stale = [name for name, _ in tables if not catalog.get(name, {}).get("fresh")]
+                estimates = estimate_row_counts(
+                    conn, [name for name in stale if catalog.get(name, {}).get("row_count") is None]
                 )
-                self.tree.tag_configure("empty", foreground=Colors.TEXT_MUTED)
-                return
 
             # Add each table
-            for (table_name,) in tables:
-                # Get column count
-                cursor.execute(f"PRAGMA table_info([{table_name}])")
-                column_count = len(cursor.fetchall())
-
-                # Get row count
-                try:
-                    cursor.execute(f"SELECT COUNT(*) FROM [{table_name}]")
-                    row_count = cursor.fetchone()[0]
-                    row_str = f"{row_count:,}"
-                except:
-                    row_str = "N/A"
+            for table_name, column_count in tables:
+                entry = catalog.get(table_name)
+                if table_name not in stale:
+                    row_str = f"{entry['row_count']:,}"
+                elif entry and entry["row_count"] is not None:
+                    row_str = f"~{entry['row_count']:,}"
+                elif table_name in estimates:
+                    row_str = f"~{estimates[table_name]:,}"
+                else:
+                    row_str = "…"
 
                 # Insert into tree
-                self.tree.insert(
+                self.table_items[table_name] = self.tree.insert(
                     "",
                     "end",
                     text=f"  {table_name}",
                     values=(column_count, row_str)
                 )
 
+            # Keep the selection across refreshes
+            for table_name in selected:
+                if table_name in self.table_items:
+                    self.tree.selection_set(self.table_items[table_name])
+
+            if stale:
+                # Small tables first so most exact counts show up quickly
+                stale.sort(key=lambda name: estimates.get(name, catalog.get(name, {}).get("row_count") or 0))
+                self.start_recount(db, stale)
+
         except Exception as e:
             self.tree.insert(
                 "",
@@ -206,6 +238,83 @@ class TableList(ctk.CTkFrame):
             )
             self.tree.tag_configure("error", foreground=Colors.ERROR)
 
+    def start_recount(self, db, table_names):
+        """Count tables with stale statistics on a background thread"""
+        results = queue.Queue()
+        stop = self.recount_stop = threading.Event()
+        self.recount_db = db
+
+        def recount():
+            for table_name in table_names:
+                try:
+                    counts = db.recount_tables([table_name], should_stop=stop.is_set)
+                except Exception:
+                    counts = {table_name: None}
+                if stop.is_set():
+                    return
+                results.put((table_name, counts[table_name]))
+
+        threading.Thread(target=recount, name="table-recount", daemon=True).start()
+        self.recount_job = self.after(100, self.poll_recount, results, self.load_generation, len(table_names))
+
+    def poll_recount(self, results, generation, remaining):
+        """Show finished background counts (on the Tk thread)"""
+        self.recount_job = None
+        if generation != self.load_generation:
+            return  # the list was reloaded
+
+        while True:
+            try:
+                table_name, row_count = results.get_nowait()
+            except queue.Empty:
+                break
+            remaining -= 1
+            item = self.table_items.get(table_name)
+            if item and self.tree.exists(item):
+                self.tree.set(item, "rows", "N/A" if row_count is None else f"{row_count:,}")
+
+        if remaining:
+            self.recount_job = self.after(100, self.poll_recount, results, generation, remaining)
+
+    def stop_recount(self):
+        """Stop the background count worker and its polling"""
+        if self.recount_stop is not None:
+            self.recount_stop.set()
+            self.recount_db.interrupt_recount()
+            self.recount_stop = self.recount_db = None
+        if self.recount_job is not None:
+            self.after_cancel(self.recount_job)
+            self.recount_job = None
+
+    def schedule_change_check(self):
+        """Check for changes to the database after CHANGE_CHECK_INTERVAL"""
+        if self.change_check_job is not None:
+            self.after_cancel(self.change_check_job)
+        self.change_check_job = self.after(CHANGE_CHECK_INTERVAL, self.check_for_changes)
+
+    def check_for_changes(self):
+        """Reload the list if the schema or data changed (e.g. another program wrote to the file)"""
+        from core.db_manager import DatabaseManager
+
+        self.change_check_job = None
+        try:
+            versions = DatabaseManager(self.db_path).versions()
+        except Exception:
+            return  # database closed or gone; stop checking
+
+        if versions != self.seen_versions:
+            self.load_tables(self.db_path)
+        else:
+            self.schedule_change_check()
+
+    def destroy(self):
+        """Stop background work when the view is left"""
+        self.stop_recount()
+        if self.change_check_job is not None:
+            self.after_cancel(self.change_check_job)
+            self.change_check_job = None
+        super().destroy()
+
     def refresh_tables(self):
         """Refresh table list"""
         if self.db_path:
@@ -242,7 +351,11 @@ class TableList(ctk.CTkFrame):
             menu.add_command(label="Open Table", command=lambda: self.on_tree_double_click(None))
             menu.add_command(label="Export to Excel", command=self.export_table)
             menu.add_separator()
-            menu.add_command(label="Delete Table", command=self.delete_table)
+            menu.add_command(
+                label="Delete Table",
+                command=self.delete_table,
+                state="disabled" if self.is_busy and self.is_busy() else "normal"
+            )
 
             menu.post(event.x_root, event.y_root)
 
@@ -255,7 +368,7 @@ class TableList(ctk.CTkFrame):
         table_name = self.tree.item(selection[0])["text"].strip()
 
         from tkinter import filedialog, messagebox
-        from core.db_manager import DatabaseManager
+        from core.db_manager import DatabaseManager, HIDDEN_COLUMNS
         import pandas as pd
 
         # Ask for save location
@@ -271,8 +384,9 @@ class TableList(ctk.CTkFrame):
         try:
             # Read table data
             db = DatabaseManager(self.db_path)
-            conn = db.get_connection()
-            df = pd.read_sql_query(f"SELECT * FROM [{table_name}]", conn)
+            with db.reader() as conn:
+                df = pd.read_sql_query(f"SELECT * FROM [{table_name}]", conn)
+            df = df.drop(columns=list(HIDDEN_COLUMNS), errors="ignore")
 
             # Export based on file extension
             if filename.endswith('.csv'):
@@ -296,6 +410,10 @@ class TableList(ctk.CTkFrame):
         from tkinter import messagebox
         from core.db_manager import DatabaseManager
 
+        if self.is_busy and self.is_busy():
+            messagebox.showwarning("Upload Running", "Tables can't be deleted while an upload is running.")
+            return
+
         # Confirm deletion
         result = messagebox.askyesno(
             "Confirm Deletion",
@@ -309,10 +427,7 @@ class TableList(ctk.CTkFrame):
         try:
             # Delete table
             db = DatabaseManager(self.db_path)
-            conn = db.get_connection()
-            cursor = conn.cursor()
-            cursor.execute(f"DROP TABLE [{table_name}]")
-            conn.commit()
+            db.drop_table(table_name)
 
             messagebox.showinfo("Success", f"Table '{table_name}' deleted successfully!")
 
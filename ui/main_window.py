@@ -22,9 +22,17 @@ class MainWindow(ctk.CTk):
         # Current database
         self.current_db_path = None
 
+        # Open upload dialog, if any (only one upload runs at a time)
+        self.uploader = None
+
+        # Sidebar buttons disabled while an upload is running
+        self.upload_blocked_buttons = []
+
         # Setup UI
         self.setup_ui()
 
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+
     def setup_ui(self):
         """Setup the main UI layout"""
         # Configure grid
@@ -117,6 +125,7 @@ class MainWindow(ctk.CTk):
                 text_color=("gray10", "gray90")
             )
             btn.pack(padx=Styles.PADDING, pady=5, fill="x")
+            self.upload_blocked_buttons.append(btn)
 
         # Section: Actions
         section_label2 = ctk.CTkLabel(
@@ -147,6 +156,8 @@ class MainWindow(ctk.CTk):
                 text_color=("gray10", "gray90")
             )
             btn.pack(padx=Styles.PADDING, pady=5, fill="x")
+            if command == self.create_table_ui:
+                self.upload_blocked_buttons.append(btn)
 
         return sidebar
 
@@ -227,6 +238,9 @@ class MainWindow(ctk.CTk):
 
     def open_database(self):
         """Open existing database"""
+        if self.refuse_during_upload():
+            return
+
         from tkinter import filedialog
 
         filename = filedialog.askopenfilename(
@@ -244,6 +258,9 @@ class MainWindow(ctk.CTk):
 
     def create_database(self):
         """Create new database"""
+        if self.refuse_during_upload():
+            return
+
         from tkinter import filedialog
 
         filename = filedialog.asksaveasfilename(
@@ -259,6 +276,13 @@ class MainWindow(ctk.CTk):
 
     def load_database(self, db_path):
         """Load database and show table list"""
+        # Release pooled connections to the database being switched away from
+        if self.current_db_path and Path(self.current_db_path).resolve() != Path(db_path).resolve():
+            if self.refuse_during_upload():
+                return
+            from core.connection_pool import close_pool
+            close_pool(self.current_db_path)
+
         self.current_db_path = db_path
         self.title(f"SQLite Manager - {Path(db_path).name}")
 
@@ -276,14 +300,15 @@ class MainWindow(ctk.CTk):
         from ui.components.table_list import TableList
 
         # Database info card
-        self.db_selector = DatabaseSelector(self.main_content)
+        self.db_selector = DatabaseSelector(self.main_content, is_busy_callback=self.upload_running)
         self.db_selector.pack(fill="x", pady=(0, 20))
         self.db_selector.load_database(db_path)
 
         # Table list
         self.table_list = TableList(
             self.main_content,
-            on_table_selected_callback=self.on_table_selected
+            on_table_selected_callback=self.on_table_selected,
+            is_busy_callback=self.upload_running
         )
         self.table_list.pack(fill="both", expand=True)
         self.table_list.load_tables(db_path)
@@ -314,15 +339,39 @@ class MainWindow(ctk.CTk):
             self.show_error("Please open or create a database first")
             return
 
+        # An upload dialog left open (e.g. non-modal during a WAL upload) is reused
+        if self.uploader is not None and self.uploader.winfo_exists():
+            self.uploader.lift()
+            self.uploader.focus()
+            return
+
         # Open Excel uploader dialog
         from ui.components.excel_uploader import ExcelUploader
 
-        uploader = ExcelUploader(
+        self.uploader = ExcelUploader(
             self,
             self.current_db_path,
-            on_complete_callback=self.on_upload_complete
+            on_complete_callback=self.on_upload_complete,
+            on_busy_callback=self.on_upload_busy
         )
 
+    def upload_running(self):
+        """Whether an upload is in progress"""
+        return self.uploader is not None and self.uploader.winfo_exists() and self.uploader.uploading
+
+    def refuse_during_upload(self):
+        """Show an error and return True if an upload is in progress"""
+        if not self.upload_running():
+            return False
+        self.show_error("An upload is still running. Cancel it or wait for it to finish first.")
+        self.uploader.lift()
+        return True
+
+    def on_upload_busy(self, busy):
+        """Disable actions that would conflict with a running upload"""
+        for btn in self.upload_blocked_buttons:
+            btn.configure(state="disabled" if busy else "normal")
+
     def on_upload_complete(self):
         """Handle upload completion"""
         # Refresh the database view
@@ -334,6 +383,8 @@ class MainWindow(ctk.CTk):
         if not self.current_db_path:
             self.show_error("Please open or create a database first")
             return
+        if self.refuse_during_upload():
+            return
 
         from ui.components.table_creator import TableCreator
 
@@ -371,6 +422,12 @@ class MainWindow(ctk.CTk):
         # Show database view (which includes table list)
         self.show_database_view(self.current_db_path)
 
+    def on_close(self):
+        """Close the application, unless an upload is still running"""
+        if self.refuse_during_upload():
+            return
+        self.destroy()
+
     def show_error(self, message):
         """Show error message (simple for now)"""
         from tkinter import messagebox